@@ -1,7 +1,33 @@
-from flask import Flask
-from app.api.routes import create_api_routes
+import time
 
 def create_app():
+    # Flask and the routes (which pull in the collection stack) are only imported when an
+    # app is built, so the CLI and the Quart viewer don't load them by importing `app`
+    from flask import Flask, g, request
+
+    from app.api.routes import create_api_routes
+    from app.services.metrics import observe_request, render_metrics
+    from app.services.refresh_scheduler import get_refresh_scheduler
+    from config import active_config as Config
+
     app = Flask(__name__)
     create_api_routes(app)
-    return app
\ No newline at end of file
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_latency(response):
+        if "request_started" in g:
+            observe_request(request.url_rule.rule if request.url_rule else None, request.method, response.status_code, g.request_started)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return render_metrics()
+
+    if Config.REFRESH_INTERVAL > 0:
+        # Collection runs on the scheduler's own thread, never inside a request
+        get_refresh_scheduler().start()
+    return app
@@ -1,65 +1,119 @@
 from flask import Blueprint, jsonify, request
 
-from app.services.data_collection import JobDataCollector
+from app.services.datatables import datatables_echo, datatables_response, stream_records
+from app.services.job_store import get_job_store
+from app.services.payload_cache import get_payload_cache
+from app.services.refresh_scheduler import get_refresh_scheduler
+from app.services.salary import SALARY_DIMENSIONS, get_salary_analytics
+from app.services.search import search_response
+from app.services.serialization import NDJSON_MIMETYPE, iter_ndjson, wants_ndjson
+from app.services.trends import TREND_DIMENSIONS, get_trend_store
 from config import Config
 
 api = Blueprint("api", __name__)
 
 @api.route("/jobs")
 def get_jobs():
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
-    jobs = collector.search_jobs(Config.DEFAULT_JOB_TITLES)
-    
     # Get title filters from the request
     title_filters = request.args.getlist("titles[]")
-    
-    # Apply title filters if any
-    if title_filters:
-        jobs = [job for job in jobs if job.job_title in title_filters]
-    
-    # Limit the number of records
-    jobs = jobs[:1000]  # Limit to 1000 records
-    
-    # Convert jobs to dictionaries
-    job_dicts = [job.__dict__ for job in jobs]
-    
-    # Format salaries
-    for job in job_dicts:
-        job["salary_range"] = format_salary_range(job["salary_low"], job["salary_high"])
-    
-    return jsonify({"data": job_dicts})
+    max_experience = request.args.get("max_experience", type=float)
+
+    if wants_ndjson(request):
+        # Every matching row, one JSON object per line, streamed as it is read from the store
+        chunks = stream_records(get_job_store(), request.args, job_title=title_filters or None, max_experience=max_experience)
+        return iter_ndjson(chunks), 200, {"Content-Type": NDJSON_MIMETYPE}
+
+    # Paging, ordering and searching are done server-side against the store's indexes;
+    # the serialized page, minus its draw counter, is reused until the store's revision changes
+    job_store = get_job_store()
+    return get_payload_cache().response(request, "jobs", job_store, lambda: datatables_response(
+        job_store, request.args, job_title=title_filters or None, max_experience=max_experience
+    ), echo=datatables_echo(request.args))
 
 @api.route("/job_titles")
 def get_job_titles():
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
-    jobs = collector.search_jobs(Config.DEFAULT_JOB_TITLES)
-    titles = sorted(set(job.job_title for job in jobs))
-    return jsonify({"titles": titles})
+    job_store = get_job_store()
+    return get_payload_cache().response(
+        request, "job_titles", job_store, lambda: {"titles": job_store.distinct("job_title")}
+    )
 
 @api.route("/job_categories")
 def get_job_categories():
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
-    jobs = collector.search_jobs(Config.DEFAULT_JOB_TITLES)
-    categories = sorted(set(job.job_category for job in jobs))
-    return jsonify({"categories": categories})
+    job_store = get_job_store()
+    return get_payload_cache().response(
+        request, "job_categories", job_store, lambda: {"categories": job_store.distinct("job_category")}
+    )
 
 @api.route("/category_stats")
 def get_category_stats():
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
-    jobs = collector.search_jobs(Config.DEFAULT_JOB_TITLES)
-    category_counts = {}
-    for job in jobs:
-        category_counts[job.job_category] = category_counts.get(job.job_category, 0) + 1
-    stats = [{"category": cat, "count": count} for cat, count in category_counts.items()]
-    return jsonify({"stats": stats})
+    job_store = get_job_store()
+    return get_payload_cache().response(request, "category_stats", job_store, lambda: {"stats": [
+        {"category": cat, "count": count} for cat, count in job_store.value_counts("job_category")
+    ]})
+
+@api.route("/search")
+def search_jobs():
+    # Ranked full-text search over titles, companies and descriptions, e.g. ?q=kubernetes
+    job_store = get_job_store()
+    filters = {"source": request.args.get("source"), "job_category": request.args.get("category")}
+    return get_payload_cache().response(
+        request, "search", job_store, lambda: search_response(job_store, request.args, **filters)
+    )
+
+@api.route("/salaries")
+def get_salaries():
+    # Yearly salary p10/p50/p90 and histograms per group, recomputed only when the store changes
+    dimension = request.args.get("dimension", "category")
+    if dimension not in SALARY_DIMENSIONS:
+        return jsonify({"error": f"dimension must be one of {sorted(SALARY_DIMENSIONS)}"}), 400
+    limit = request.args.get("limit", Config.TOP_N_RESULTS, type=int)
+    min_count = request.args.get("min_count", 1, type=int)
+    return get_payload_cache().response(
+        request, "salaries", get_job_store(),
+        lambda: get_salary_analytics().breakdown(dimension).to_dict(limit, min_count),
+    )
+
+@api.route("/trends/postings")
+def get_posting_trends():
+    dimension = request.args.get("dimension", "category")
+    if dimension not in TREND_DIMENSIONS:
+        return jsonify({"error": f"dimension must be one of {sorted(TREND_DIMENSIONS)}"}), 400
+    trend_store = get_trend_store()
+    trend_store.update_from_directory(Config.OUTPUT_DIR)
+    return jsonify({"postings": trend_store.postings(
+        dimension, request.args.getlist("values[]") or None, request.args.get("start"), request.args.get("end")
+    )})
+
+@api.route("/trends/salary")
+def get_salary_trends():
+    trend_store = get_trend_store()
+    trend_store.update_from_directory(Config.OUTPUT_DIR)
+    return jsonify({"salary_drift": trend_store.salary_drift(
+        request.args.get("category"), request.args.get("start"), request.args.get("end")
+    )})
+
+@api.route("/trends/velocity")
+def get_hiring_velocity():
+    trend_store = get_trend_store()
+    trend_store.update_from_directory(Config.OUTPUT_DIR)
+    return jsonify({"hiring_velocity": trend_store.hiring_velocity(
+        request.args.get("window", Config.TREND_VELOCITY_WINDOW_DAYS, type=int),
+        request.args.get("limit", Config.TOP_N_RESULTS, type=int),
+    )})
 
 @api.route("/fetch_all_jobs")
 async def fetch_all_jobs():
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
-    jobs = await collector.async_search_jobs(Config.DEFAULT_JOB_TITLES, Config.DEFAULT_LOCATIONS)
-    return jsonify({"adzuna": [job.__dict__ for job in jobs if job.source == "Adzuna"],
-                    "usa_jobs": [job.__dict__ for job in jobs if job.source == "USA Jobs"],
-                    "job_count": len(jobs)})
+    # Served from the scheduler's last collection run; a stale result triggers a background refresh
+    scheduler = get_refresh_scheduler()
+    jobs = (await scheduler.get()).jobs
+    if wants_ndjson(request):
+        headers = {"Content-Type": NDJSON_MIMETYPE, "X-Job-Count": str(len(jobs))}
+        return iter_ndjson(jobs.iter_records(Config.NDJSON_CHUNK_ROWS)), 200, headers
+    records = jobs.to_records()
+    return jsonify({"adzuna": [record for record in records if record["source"] == "Adzuna"],
+                    "usa_jobs": [record for record in records if record["source"] == "USA Jobs"],
+                    "job_count": len(jobs),
+                    **scheduler.status()})
 
 def format_salary_range(low: float | None, high: float | None) -> str:
     if low is None and high is None:
@@ -2,15 +2,24 @@ import logging
 from datetime import datetime
 import asyncio
 
+from app import services
 from app.services.data_collection import JobDataCollector
-from app.services.data_analysis import analyze_data
-from app.services.data_visualization import generate_visualizations
+from app.services.http_session import get_session_pool
+from app.services.job_store import get_job_store
+from app.services.metrics import stage_summary, time_stage
+from app.services.snapshot_io import SnapshotWriter
 from config import Config
 from app.services.api_clients import AdzunaAPIClient, USAJobsAPIClient
 
 logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
+def log_timing_summary():
+    logger.info("Timing summary (fetch times add up concurrent requests):")
+    for row in stage_summary():
+        listings = f", {row['listings_in']} -> {row['listings_out']} listings" if row["listings_in"] is not None else ""
+        logger.info(f"{row['stage']:<14} {row['source']:<9} {row['seconds']:>9.3f}s over {row['calls']} calls{listings}")
+
 def get_user_input(prompt, default_values):
     user_input = input(f"{prompt} (default: {', '.join(default_values)}): ").strip()
     if user_input:
@@ -21,31 +30,58 @@ async def async_main():
     Config.ADZUNA_CLIENT = AdzunaAPIClient()
     Config.USA_JOBS_CLIENT = USAJobsAPIClient()
 
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
+    session_pool = get_session_pool()
+    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT, get_job_store(), session_pool)
 
     job_titles = get_user_input("Enter job titles (comma-separated)", Config.DEFAULT_JOB_TITLES)
     locations = get_user_input("Enter locations (comma-separated)", Config.DEFAULT_LOCATIONS)
 
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{Config.OUTPUT_DIR}/job_listings_{timestamp}"
+    # Listings are written in chunks as they arrive instead of after the whole crawl
+    sinks = []
+    if Config.SNAPSHOT_FORMAT == "parquet":
+        sinks.append(SnapshotWriter(f"{filename}.parquet"))
+    if Config.EXPORT_CSV or Config.SNAPSHOT_FORMAT == "csv":
+        sinks.append(SnapshotWriter(f"{filename}.csv"))
+
+    await session_pool.start()
     try:
-        all_jobs = await collector.async_search_jobs(job_titles, locations)
+        try:
+            with time_stage("collect"):
+                all_jobs = await collector.async_search_jobs(job_titles, locations, sinks)
+        except BaseException:
+            # A failed collection leaves no snapshot behind rather than a truncated one
+            for sink in sinks:
+                sink.abort()
+            raise
+        else:
+            for sink in sinks:
+                sink.close()
+        finally:
+            await session_pool.close()
 
         if not all_jobs:
             logger.warning("No jobs were found. Check your search criteria and API keys.")
         else:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{Config.OUTPUT_DIR}/job_listings_{timestamp}.csv"
-            collector.save_to_csv(all_jobs, filename)
             logger.info(f"Saved {len(all_jobs)} jobs to {filename}")
 
-            analysis = analyze_data(all_jobs)
+            # One frame and one set of aggregates feed both the log summary and the charts.
+            # The analysis and plotting stacks are only loaded here, after collection.
+            with time_stage("analyze"):
+                analysis = services.build_analysis(all_jobs)
             logger.info("Data Analysis Results:")
-            for key, value in analysis.items():
+            for key, value in analysis.summary().items():
                 logger.info(f"{key}: {value}")
 
-            generate_visualizations(all_jobs)
+            with time_stage("charts"):
+                services.generate_visualizations(analysis)
 
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
+    finally:
+        if Config.TIMING_SUMMARY:
+            log_timing_summary()
 
 def main():
     asyncio.run(async_main())
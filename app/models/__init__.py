@@ -1 +1,2 @@
-from .job_listing import JobListing
\ No newline at end of file
+from .job_listing import JobListing
+from .job_batch import JobBatch
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .job_listing import JOB_FIELDS, JobListing, normalize_salary_range
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TEXT_COLUMNS = ("job_title", "job_description", "application_url")
+CATEGORY_COLUMNS = ("company_name", "job_location", "source", "job_category", "job_category_code")
+FLOAT_COLUMNS = ("salary_low", "salary_high", "experience_min", "experience_max")
+
+def _to_float(value) -> float:
+    return math.nan if value is None else float(value)
+
+def _from_float(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+class _CategoryColumn:
+    __slots__ = ("codes", "categories", "_index")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.categories: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        value = "N/A" if value is None else str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(sys.intern(value))
+        return code
+
+    def append(self, value: str) -> None:
+        self.codes.append(self.code(value))
+
+class JobBatch:
+    # Column-oriented listings: free text as lists, repeated strings (companies, locations,
+    # sources, categories) as int codes into one interned copy each, numbers as float arrays
+    # with NaN for missing. Clients append parsed JSON straight into it, and to_frame()
+    # hands pandas ready-made columns instead of a list of per-listing dicts.
+    __slots__ = ("_text", "_categories", "_floats")
+
+    def __init__(self):
+        self._text = {column: [] for column in TEXT_COLUMNS}
+        self._categories = {column: _CategoryColumn() for column in CATEGORY_COLUMNS}
+        self._floats = {column: array("d") for column in FLOAT_COLUMNS}
+
+    def append(
+        self,
+        job_title: str,
+        company_name: str,
+        job_location: str,
+        job_description: str,
+        salary_low: float | None,
+        salary_high: float | None,
+        source: str,
+        application_url: str,
+        job_category: str = "N/A",
+        job_category_code: str = "N/A",
+        experience_min: float | None = None,
+        experience_max: float | None = None,
+    ) -> None:
+        salary_low, salary_high = normalize_salary_range(salary_low, salary_high)
+        self._text["job_title"].append(job_title)
+        self._text["job_description"].append(job_description)
+        self._text["application_url"].append(application_url)
+        self._categories["company_name"].append(company_name)
+        self._categories["job_location"].append(job_location)
+        self._categories["source"].append(source)
+        self._categories["job_category"].append(job_category)
+        self._categories["job_category_code"].append(job_category_code)
+        self._floats["salary_low"].append(_to_float(salary_low))
+        self._floats["salary_high"].append(_to_float(salary_high))
+        self._floats["experience_min"].append(_to_float(experience_min))
+        self._floats["experience_max"].append(_to_float(experience_max))
+
+    def append_listing(self, job: JobListing) -> None:
+        self.append(*(getattr(job, name) for name in JOB_FIELDS))
+
+    @classmethod
+    def from_listings(cls, jobs: Iterable[JobListing]) -> "JobBatch":
+        batch = cls()
+        for job in jobs:
+            batch.append_listing(job)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Iterable["JobBatch"]) -> "JobBatch":
+        result = cls()
+        for batch in batches:
+            result.extend(batch)
+        return result
+
+    def extend(self, other: "JobBatch") -> None:
+        for column in TEXT_COLUMNS:
+            self._text[column].extend(other._text[column])
+        for column in CATEGORY_COLUMNS:
+            target, source = self._categories[column], other._categories[column]
+            # Codes are local to a batch, so the other batch's codes are remapped once per category
+            remap = np.array([target.code(value) for value in source.categories], dtype=np.int32)
+            if len(source.codes):
+                target.codes.frombytes(remap[np.frombuffer(source.codes, dtype=np.int32)].tobytes())
+        for column in FLOAT_COLUMNS:
+            self._floats[column].extend(other._floats[column])
+
+    def take(self, indices: Iterable[int]) -> "JobBatch":
+        indices = np.asarray(list(indices), dtype=np.intp)
+        result = JobBatch()
+        for column in TEXT_COLUMNS:
+            values = self._text[column]
+            result._text[column] = [values[i] for i in indices]
+        for column in CATEGORY_COLUMNS:
+            source, target = self._categories[column], result._categories[column]
+            target.categories = list(source.categories)
+            target._index = dict(source._index)
+            target.codes = array("i", np.frombuffer(source.codes, dtype=np.int32)[indices].tobytes()) if len(indices) else array("i")
+        for column in FLOAT_COLUMNS:
+            result._floats[column] = array("d", np.frombuffer(self._floats[column], dtype=np.float64)[indices].tobytes()) if len(indices) else array("d")
+        return result
+
+    def __len__(self) -> int:
+        return len(self._text["job_title"])
+
+    def column(self, name: str) -> list | np.ndarray:
+        if name in TEXT_COLUMNS:
+            return self._text[name]
+        if name in CATEGORY_COLUMNS:
+            categories = self._categories[name]
+            return [categories.categories[code] for code in categories.codes]
+        if name in FLOAT_COLUMNS:
+            return np.frombuffer(self._floats[name], dtype=np.float64) if len(self) else np.empty(0)
+        raise KeyError(name)
+
+    def _row(self, index: int) -> dict:
+        row = {column: self._text[column][index] for column in TEXT_COLUMNS}
+        for column in CATEGORY_COLUMNS:
+            categories = self._categories[column]
+            row[column] = categories.categories[categories.codes[index]]
+        for column in FLOAT_COLUMNS:
+            row[column] = _from_float(self._floats[column][index])
+        return {name: row[name] for name in JOB_FIELDS}
+
+    def __getitem__(self, index: int) -> JobListing:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("JobBatch index out of range")
+        return JobListing(**self._row(index))
+
+    def __iter__(self) -> Iterator[JobListing]:
+        for index in range(len(self)):
+            yield JobListing(**self._row(index))
+
+    def _column_values(self, name: str, start: int, stop: int) -> list:
+        # Plain Python values for rows [start, stop); NaN becomes None for the whole slice at once
+        if name in TEXT_COLUMNS:
+            return self._text[name][start:stop]
+        if name in CATEGORY_COLUMNS:
+            categories = self._categories[name]
+            return [categories.categories[code] for code in categories.codes[start:stop]]
+        values = np.frombuffer(self._floats[name], dtype=np.float64)[start:stop]
+        missing = np.isnan(values)
+        if not missing.any():
+            return values.tolist()
+        objects = values.astype(object)
+        objects[missing] = None
+        return objects.tolist()
+
+    def iter_records(self, chunk_rows: int = 1000) -> Iterator[list[dict]]:
+        # Records built column by column, chunk_rows at a time, so a caller streaming them out
+        # never holds more than one chunk of dicts
+        for start in range(0, len(self), chunk_rows):
+            stop = min(start + chunk_rows, len(self))
+            columns = [self._column_values(name, start, stop) for name in JOB_FIELDS]
+            yield [dict(zip(JOB_FIELDS, values)) for values in zip(*columns)]
+
+    def to_records(self) -> list[dict]:
+        return [record for chunk in self.iter_records(max(len(self), 1)) for record in chunk]
+
+    def to_frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        data = {}
+        for name in JOB_FIELDS:
+            if name in TEXT_COLUMNS:
+                data[name] = pd.Series(self._text[name], dtype=object)
+            elif name in CATEGORY_COLUMNS:
+                categories = self._categories[name]
+                codes = np.frombuffer(categories.codes, dtype=np.int32) if len(self) else np.empty(0, dtype=np.int32)
+                data[name] = pd.Categorical.from_codes(codes, categories=categories.categories).remove_unused_categories()
+            else:
+                data[name] = self.column(name).copy()
+        return pd.DataFrame(data)
+
+def as_job_batch(jobs: "JobBatch | Iterable[JobListing]") -> JobBatch:
+    return jobs if isinstance(jobs, JobBatch) else JobBatch.from_listings(jobs)
@@ -1,6 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
-@dataclass
+def normalize_salary_range(low: float | None, high: float | None) -> tuple[float | None, float | None]:
+    if low is not None and high is not None:
+        if low > high:
+            return high, low
+    elif low is not None and high is None:
+        return low, low
+    elif high is not None and low is None:
+        return high, high
+    return low, high
+
+@dataclass(slots=True)
 class JobListing:
     job_title: str
     company_name: str
@@ -12,12 +22,13 @@ class JobListing:
     application_url: str
     job_category: str = "N/A"
     job_category_code: str = "N/A"
+    experience_min: float | None = None  # years, parsed from the description
+    experience_max: float | None = None
 
     def __post_init__(self):
-        if self.salary_low is not None and self.salary_high is not None:
-            if self.salary_low > self.salary_high:
-                self.salary_low, self.salary_high = self.salary_high, self.salary_low
-        elif self.salary_low is not None and self.salary_high is None:
-            self.salary_high = self.salary_low
-        elif self.salary_high is not None and self.salary_low is None:
-            self.salary_low = self.salary_high
\ No newline at end of file
+        self.salary_low, self.salary_high = normalize_salary_range(self.salary_low, self.salary_high)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in JOB_FIELDS}
+
+JOB_FIELDS = tuple(f.name for f in fields(JobListing))
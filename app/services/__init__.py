@@ -1,3 +1,25 @@
-from .data_collection import JobDataCollector
-from .data_analysis import analyze_data
-from .data_visualization import generate_visualizations
\ No newline at end of file
+import importlib
+
+# Public names and the submodule defining each. Submodules, and the pandas/matplotlib
+# stacks behind them, are only imported when one of these is first accessed (PEP 562).
+_EXPORTS = {
+    "JobDataCollector": "data_collection",
+    "AnalysisResult": "data_analysis",
+    "analyze_data": "data_analysis",
+    "analyze_trends": "data_analysis",
+    "build_analysis": "data_analysis",
+    "generate_visualizations": "data_visualization",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,219 +1,375 @@
 import asyncio
 import logging
-import json
-import random
+import math
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
 from functools import lru_cache
 
 import aiohttp
 
-from app.models.job_listing import JobListing
+from app.models.job_batch import JobBatch
+from app.utils import merge_async_iterators
+from app.services.experience import extract_experience, meets_experience
+from app.services.metrics import FETCH_DURATION, FETCH_REQUESTS, FETCH_RETRIES, record_listings, time_stage
+from app.services import serialization
+from app.services.rate_limiter import THROTTLE_STATUSES, AdaptiveRateLimiter, get_rate_limiter, parse_retry_after
+from app.services.response_cache import OfflineCacheMiss, ResponseCache, get_response_cache
+from app.services.salary import annualize_range
+from app.services.title_filter import TitleFilter, get_title_filter
 from config import active_config as Config
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class ResultPage:
+    # Listings that passed the experience check, with their upstream job ids row by row
+    batch: JobBatch = field(default_factory=JobBatch)
+    listing_ids: list[str] = field(default_factory=list)
+    # Every job id the page returned, used for short-page and no-new-results checks
+    job_ids: list[str] = field(default_factory=list)
+    total: int | None = None
+
 class JobAPIClient(ABC):
-    @abstractmethod
-    async def async_fetch_jobs_batch(self, session, queries: list[dict]) -> list[JobListing]:
-        pass
+    source = None
+    # Request params that carry credentials and must never reach the response cache key
+    credential_params = frozenset()
+
+    def __init__(
+        self,
+        response_cache: ResponseCache | None = None,
+        title_filter: TitleFilter | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.title_filter = title_filter if title_filter is not None else get_title_filter()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter(self.source)
 
     @abstractmethod
-    def _create_job_listing(self, job: dict) -> JobListing:
+    def _iter_query_pages(self, session, query: dict) -> AsyncIterator[JobBatch]:
         pass
 
+    def _iter_queries(self, session, queries: list[dict]) -> AsyncIterator[JobBatch]:
+        return merge_async_iterators(
+            [self._iter_query_pages(session, query) for query in queries], Config.STREAM_QUEUE_SIZE
+        )
+
+    async def async_iter_jobs(self, session, queries: list[dict]) -> AsyncIterator[JobBatch]:
+        # Yields filtered listings page by page, in the order pages arrive across all queries
+        async for batch in self._iter_queries(session, queries):
+            with time_stage("filter", self.source):
+                filtered_batch = self.title_filter.filter_batch(batch)
+            record_listings("filter", len(batch), len(filtered_batch), self.source)
+            if len(filtered_batch):
+                yield filtered_batch
+
+    async def async_fetch_jobs_batch(self, session, queries: list[dict]) -> JobBatch:
+        all_jobs = JobBatch.concat([batch async for batch in self._iter_queries(session, queries)])
+
+        logger.info(f"Total {self.source} jobs before filtering: {len(all_jobs)}")
+        filtered_jobs = self.filter_jobs(all_jobs)
+        logger.info(f"Total {self.source} jobs after filtering: {len(filtered_jobs)}")
+        return filtered_jobs
+
     @abstractmethod
-    def _check_experience(self, job: dict, max_experience: int) -> bool:
+    def _append_job(self, batch: JobBatch, job: dict, max_experience: int) -> bool:
+        # Parses one upstream job straight into the batch; False if it fails the experience check
         pass
 
-    def filter_jobs(self, job_listings: list[JobListing]) -> list[JobListing]:
-        senior_title_indicators = [
-            "senior", "sr", "lead", "2", "3", "4", "5",
-            "ii", "iii", "iv", "manager", "expert", "director", "principal"
-        ]
-        relevant_categories = {"2210", "0854", "1530", "1550", "N/A"}
-
-        filtered_jobs = [
-            job for job in job_listings
-            if job.job_category_code in relevant_categories
-            and not any(word in job.job_title.lower() for word in senior_title_indicators)
-        ]
+    def _parse_jobs(self, jobs_data: list[dict], max_experience: int) -> tuple[JobBatch, list[str]]:
+        batch, listing_ids, seen_ids = JobBatch(), [], set()
+        with time_stage("parse", self.source):
+            for job in jobs_data:
+                job_id = self._job_id(job)
+                if job_id in seen_ids:
+                    continue
+                seen_ids.add(job_id)
+                if self._append_job(batch, job, max_experience):
+                    listing_ids.append(job_id)
+        record_listings("parse", len(jobs_data), len(batch), self.source)
+        return batch, listing_ids
+
+    def filter_jobs(self, job_listings: JobBatch) -> JobBatch:
+        with time_stage("filter", self.source):
+            filtered_jobs = self.title_filter.filter_batch(job_listings)
+        record_listings("filter", len(job_listings), len(filtered_jobs), self.source)
         
         logger.info(f"Filtered {len(job_listings) - len(filtered_jobs)} jobs")
         logger.info(f"Remaining jobs: {len(filtered_jobs)}")
         
         return filtered_jobs
 
+    async def _get_json(self, session, url: str, params: dict, headers: dict | None = None) -> dict:
+        params = {k: v for k, v in params.items() if v is not None}
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(
+                url, {k: v for k, v in params.items() if k not in self.credential_params}
+            )
+            data = self.response_cache.get(cache_key, self.source)
+            if data is not None:
+                return data
+            if self.response_cache.offline:
+                raise OfflineCacheMiss(f"No cached {self.source} response for {url}")
+
+        data = await self._request_json(session, url, params, headers)
+        if cache_key is not None:
+            self.response_cache.set(cache_key, self.source, data)
+        return data
+
+    async def _request_json(self, session, url: str, params: dict, headers: dict | None) -> dict:
+        # Every source goes through the same policy: throttles and dropped connections are
+        # retried with backoff (or the server's Retry-After), other HTTP errors are raised.
+        max_attempts = Config.RETRY_MAX_ATTEMPTS
+        for attempt in range(max_attempts):
+            last_attempt = attempt == max_attempts - 1
+            try:
+                async with self.rate_limiter.slot():
+                    # Latency is measured from when the request gets its slot, so limiter waits don't count
+                    with FETCH_DURATION.time(source=self.source):
+                        async with session.get(url, headers=headers, params=params) as response:
+                            FETCH_REQUESTS.inc(source=self.source, status=response.status)
+                            if response.status in THROTTLE_STATUSES:
+                                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                                self.rate_limiter.record_throttle(retry_after)
+                                if last_attempt:
+                                    response.raise_for_status()
+                                reason = "throttled"
+                            else:
+                                response.raise_for_status()
+                                data = serialization.loads(await response.read())
+                                self.rate_limiter.record_success()
+                                return data
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                FETCH_REQUESTS.inc(source=self.source, status="error")
+                if last_attempt:
+                    raise
+                retry_after = None
+                reason = "connection"
+                logger.warning(f"{self.source} request failed ({e!r})")
+
+            FETCH_RETRIES.inc(source=self.source, reason=reason)
+            wait_time = self.rate_limiter.backoff(attempt, retry_after)
+            logger.warning(f"Retrying {self.source} request in {wait_time:.2f} seconds ({attempt + 1}/{max_attempts})")
+            await self._wait_before_retry(wait_time)
+
+    async def _wait_before_retry(self, seconds: float) -> None:
+        # Separate from the limiter's own waits, so tests can skip the backoff alone
+        await asyncio.sleep(seconds)
+
+    async def _fetch_all_pages(self, fetch_page: Callable[[int], Awaitable[ResultPage]], per_page: int, merged_queries: int = 1) -> JobBatch:
+        return JobBatch.concat([batch async for batch in self._iter_all_pages(fetch_page, per_page, merged_queries)])
+
+    async def _iter_all_pages(
+        self, fetch_page: Callable[[int], Awaitable[ResultPage]], per_page: int, merged_queries: int = 1
+    ) -> AsyncIterator[JobBatch]:
+        # A planned query standing in for several title/location pairs gets their combined page budget
+        max_pages = max(1, min(Config.MAX_PAGES_PER_QUERY, math.ceil(Config.MAX_RESULTS_PER_QUERY / per_page))) * merged_queries
+
+        first_page = await fetch_page(1)
+        seen_ids = set(first_page.job_ids)
+        yield first_page.batch
+        if len(first_page.job_ids) < per_page:
+            return
+        if first_page.total is not None:
+            max_pages = min(max_pages, math.ceil(first_page.total / per_page))
+
+        # Remaining pages are requested concurrently in waves so we can stop early
+        # without firing off the whole budget for a query that has run dry.
+        next_page = 2
+        while next_page <= max_pages:
+            wave = range(next_page, min(next_page + Config.PAGE_FETCH_CONCURRENCY, max_pages + 1))
+            pages = await asyncio.gather(*(fetch_page(page) for page in wave))
+            next_page = wave.stop
+            for page in pages:
+                new_ids = set(page.job_ids) - seen_ids
+                if not new_ids:
+                    return
+                seen_ids.update(new_ids)
+                yield page.batch.take(i for i, job_id in enumerate(page.listing_ids) if job_id in new_ids)
+                if len(page.job_ids) < per_page:
+                    return
+
 class AdzunaAPIClient(JobAPIClient):
-    def __init__(self):
+    source = "Adzuna"
+    credential_params = frozenset({"app_id", "app_key"})
+
+    def __init__(
+        self,
+        response_cache: ResponseCache | None = None,
+        title_filter: TitleFilter | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        super().__init__(response_cache, title_filter, rate_limiter)
         self.app_id = Config.ADZUNA_APP_ID
         self.api_key = Config.ADZUNA_API_KEY
         self.base_url = Config.ADZUNA_BASE_URL
-        self.semaphore = asyncio.Semaphore(2)  # Reduced to 2 concurrent requests
         self.last_response = {}
 
-    async def async_fetch_jobs_batch(self, session, queries: list[dict]) -> list[JobListing]:
-        all_jobs = []
-        tasks = []
-
-        for query in queries:
-            task = asyncio.create_task(self._fetch_single_query_with_retry(session, json.dumps(query)))
-            tasks.append(task)
-
-        results = await asyncio.gather(*tasks)
-        for job_listings in results:
-            all_jobs.extend(job_listings)
-
-        logger.info(f"Total Adzuna jobs before filtering: {len(all_jobs)}")
-        filtered_jobs = self.filter_jobs(all_jobs)
-        logger.info(f"Total Adzuna jobs after filtering: {len(filtered_jobs)}")
-        return filtered_jobs
+    def _iter_query_pages(self, session, query: dict) -> AsyncIterator[JobBatch]:
+        return self._iter_all_pages(
+            lambda page: self._fetch_single_query(session, query, page),
+            query.get('limit', 100),
+            query.get('merged_queries', 1),
+        )
 
-    async def _fetch_single_query_with_retry(self, session, query_json, max_retries=3):
-        query = json.loads(query_json)
-        for attempt in range(max_retries):
-            try:
-                async with self.semaphore:
-                    return await self._fetch_single_query(session, query)
-            except aiohttp.ClientResponseError as e:
-                if e.status == 429:
-                    wait_time = 2 ** attempt + random.uniform(0, 1)
-                    logger.warning(f"Rate limit exceeded. Retrying in {wait_time:.2f} seconds...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"Error fetching jobs from Adzuna: {e}")
-                    return []
-            except Exception as e:
-                logger.error(f"Unexpected error when fetching jobs from Adzuna: {e}")
-                return []
-        logger.error(f"Max retries reached for query: {query}")
-        return []
-
-    async def _fetch_single_query(self, session, query):
+    async def _fetch_single_query(self, session, query, page=1) -> ResultPage:
         params = {
             "app_id": self.app_id,
             "app_key": self.api_key,
             "results_per_page": query.get('limit', 100),
             "what": query['query'],
+            # Any of these words, for queries the planner merged across titles
+            "what_or": " ".join(query['query_any']) if query.get('query_any') else None,
             "where": query['location'] if query.get('location') else "remote",
             "content-type": "application/json"
         }
         if query.get('distance') is not None:
             params["distance"] = query['distance']
 
-        async with session.get(self.base_url, params={k: v for k, v in params.items() if v is not None}) as response:
-            response.raise_for_status()
-            data = await response.json()
-            self.last_response = data  # Store the last response
-            jobs_data = data.get("results", [])
-            logger.info(f"Adzuna query for {params['what']} in {params['where']} returned {len(jobs_data)} jobs")
-            job_listings = [
-                self._create_job_listing(job)
-                for job in jobs_data
-                if self._check_experience(job, query.get('max_experience', 5))
-            ]
-            logger.info(f"After experience check: {len(job_listings)} jobs")
-            return job_listings
-
-    def _create_job_listing(self, job: dict) -> JobListing:
-        return JobListing(
+        try:
+            data = await self._get_json(session, f"{self.base_url}/{page}", params)
+        except OfflineCacheMiss as e:
+            logger.info(f"{e}; skipping in offline mode")
+            return ResultPage()
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"Error fetching jobs from Adzuna: {e}")
+            return ResultPage()
+        except Exception as e:
+            logger.error(f"Unexpected error when fetching jobs from Adzuna: {e}")
+            return ResultPage()
+
+        self.last_response = data  # Store the last response
+        jobs_data = data.get("results", [])
+        what = " + ".join(filter(None, [params['what'], params['what_or'] and f"any of {params['what_or']}"]))
+        logger.info(f"Adzuna query for {what} in {params['where']} (page {page}) returned {len(jobs_data)} jobs")
+        batch, listing_ids = self._parse_jobs(jobs_data, query.get('max_experience', 5))
+        result_page = ResultPage(
+            batch=batch,
+            listing_ids=listing_ids,
+            job_ids=[self._job_id(job) for job in jobs_data],
+            total=data.get("count"),
+        )
+        logger.info(f"After experience check: {len(result_page.batch)} jobs")
+        return result_page
+
+    def _job_id(self, job: dict) -> str:
+        return str(job.get("id") or job.get("redirect_url", ""))
+
+    def _append_job(self, batch: JobBatch, job: dict, max_experience: int) -> bool:
+        experience_min, experience_max = extract_experience(job.get("description"))
+        if not meets_experience(experience_min, max_experience):
+            return False
+        # Adzuna states no pay period; hourly rates are recognized by their size
+        salary_low, salary_high = annualize_range(job.get("salary_min"), job.get("salary_max"))
+        batch.append(
             job_title=job.get("title", "N/A"),
             company_name=job.get("company", {}).get("display_name", "N/A"),
             job_location=job.get("location", {}).get("display_name", "N/A"),
             job_description=job.get("description", "N/A"),
-            salary_low=job.get("salary_min"),
-            salary_high=job.get("salary_max"),
+            salary_low=salary_low,
+            salary_high=salary_high,
             source="Adzuna",
             application_url=job.get("redirect_url", "N/A"),
             job_category="N/A",
-            job_category_code="N/A"
+            job_category_code="N/A",
+            experience_min=experience_min,
+            experience_max=experience_max
         )
-
-    def _check_experience(self, job: dict, max_experience: int) -> bool:
-        return "experience" not in job["description"].lower() or f"{max_experience} years" in job["description"].lower()
+        return True
 
 class USAJobsAPIClient(JobAPIClient):
-    def __init__(self):
+    source = "USA Jobs"
+
+    def __init__(
+        self,
+        response_cache: ResponseCache | None = None,
+        title_filter: TitleFilter | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        super().__init__(response_cache, title_filter, rate_limiter)
         self.auth_key = Config.USA_JOBS_API_KEY
         self.email = Config.USA_JOBS_EMAIL
         self.base_url = Config.USA_JOBS_BASE_URL
         self.last_response = {}
 
-    async def async_fetch_jobs_batch(self, session, queries: list[dict]) -> list[JobListing]:
-        all_jobs = []
-        tasks = []
-
-        for query in queries:
-            headers = {
-                "Authorization-Key": self.auth_key,
-                "User-Agent": self.email,
-                "Host": "data.usajobs.gov"
-            }
-            params = {
-                "PositionTitle": query['query'],
-                "ResultsPerPage": query.get('limit', 100),
-                "SecurityClearance": "Not Required",
-            }
-
-            if query.get('remote'):
-                params["RemoteIndicator"] = "True"
-            elif query['location']:
-                params["LocationName"] = query['location']
-                if query.get('distance'):
-                    params["Radius"] = query['distance']
-
-            tasks.append(self._fetch_single_query(session, headers, params, query.get('max_experience', 5)))
-
-        results = await asyncio.gather(*tasks)
-        for job_listings in results:
-            all_jobs.extend(job_listings)
-
-        logger.info(f"Total USA Jobs before filtering: {len(all_jobs)}")
-        filtered_jobs = self.filter_jobs(all_jobs)
-        logger.info(f"Total USA Jobs after filtering: {len(filtered_jobs)}")
-        return filtered_jobs
+    def _iter_query_pages(self, session, query: dict) -> AsyncIterator[JobBatch]:
+        headers = {
+            "Authorization-Key": self.auth_key,
+            "User-Agent": self.email,
+            "Host": "data.usajobs.gov"
+        }
+        params = {
+            "PositionTitle": query['query'],
+            "ResultsPerPage": query.get('limit', 100),
+            "SecurityClearance": "Not Required",
+        }
 
-    async def _fetch_single_query(self, session, headers, params, max_experience):
+        if query.get('remote'):
+            params["RemoteIndicator"] = "True"
+        elif query['location']:
+            params["LocationName"] = query['location']
+            if query.get('distance'):
+                params["Radius"] = query['distance']
+
+        max_experience = query.get('max_experience', 5)
+        return self._iter_all_pages(
+            lambda page: self._fetch_single_query(session, headers, params, max_experience, page),
+            params["ResultsPerPage"],
+            query.get('merged_queries', 1),
+        )
+
+    async def _fetch_single_query(self, session, headers, params, max_experience, page=1) -> ResultPage:
+        params = {**params, "Page": page}
         try:
-            async with session.get(self.base_url, headers=headers, params={k: v for k, v in params.items() if v is not None}) as response:
-                response.raise_for_status()
-                data = await response.json()
-                self.last_response = data  # Store the last response
-                jobs_data = data.get("SearchResult", {}).get("SearchResultItems", [])
-                return [
-                    self._create_job_listing(job)
-                    for job in jobs_data
-                    if self._check_experience(job, max_experience)
-                ]
+            data = await self._get_json(session, self.base_url, params, headers=headers)
+            self.last_response = data  # Store the last response
+            search_result = data.get("SearchResult", {})
+            jobs_data = search_result.get("SearchResultItems", [])
+            total = search_result.get("SearchResultCountAll")
+            batch, listing_ids = self._parse_jobs(jobs_data, max_experience)
+            return ResultPage(
+                batch=batch,
+                listing_ids=listing_ids,
+                job_ids=[self._job_id(job) for job in jobs_data],
+                total=int(total) if total is not None else None,
+            )
+        except OfflineCacheMiss as e:
+            logger.info(f"{e}; skipping in offline mode")
         except aiohttp.ClientResponseError as e:
             logger.error(f"Error fetching jobs from USA Jobs: {e}")
         except Exception as e:
             logger.error(f"Unexpected error when fetching jobs from USA Jobs: {e}")
-        return []
+        return ResultPage()
+
+    def _job_id(self, job: dict) -> str:
+        return str(job.get("MatchedObjectId") or job["MatchedObjectDescriptor"].get("ApplyURI", [""])[0])
 
-    def _create_job_listing(self, job: dict) -> JobListing:
+    def _append_job(self, batch: JobBatch, job: dict, max_experience: int) -> bool:
         job_data = job["MatchedObjectDescriptor"]
+        experience_min, experience_max = extract_experience(job_data.get("QualificationSummary"))
+        if not meets_experience(experience_min, max_experience):
+            return False
         job_categories = job_data.get("JobCategory", [])
         job_category = job_categories[0]["Name"] if job_categories else "N/A"
         job_category_code = job_categories[0]["Code"] if job_categories else "N/A"
+        remuneration = job_data.get("PositionRemuneration")
+        salary_low, salary_high = annualize_range(
+            float(remuneration[0]["MinimumRange"]), float(remuneration[0]["MaximumRange"]), remuneration[0].get("RateIntervalCode")
+        ) if remuneration else (None, None)
 
-        return JobListing(
+        batch.append(
             job_title=job_data.get("PositionTitle", "N/A"),
             company_name=job_data.get("OrganizationName", "N/A"),
             job_location=job_data.get("PositionLocationDisplay", "N/A"),
             job_description=job_data.get("QualificationSummary", "N/A"),
-            salary_low=float(job_data["PositionRemuneration"][0]["MinimumRange"]) if job_data.get("PositionRemuneration") else None,
-            salary_high=float(job_data["PositionRemuneration"][0]["MaximumRange"]) if job_data.get("PositionRemuneration") else None,
+            salary_low=salary_low,
+            salary_high=salary_high,
             source="USA Jobs",
             application_url=job_data.get("ApplyURI", ["N/A"])[0],
             job_category=job_category,
-            job_category_code=job_category_code
+            job_category_code=job_category_code,
+            experience_min=experience_min,
+            experience_max=experience_max
         )
-
-    def _check_experience(self, job: dict, max_experience: int) -> bool:
-        qualifications = job["MatchedObjectDescriptor"].get("QualificationSummary", "").lower()
-        if "experience" not in qualifications:
-            return True
-        for i in range(max_experience + 1):
-            if f"{i} year" in qualifications:
-                return True
-        return False
\ No newline at end of file
+        return True
@@ -1,23 +1,74 @@
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
 
+from app.models.job_batch import JobBatch, as_job_batch
 from app.models.job_listing import JobListing
+from app.services.salary import salary_midpoints
 from config import Config
 
-def analyze_data(jobs: list[JobListing]) -> dict[str, any]:
-    df = pd.DataFrame([job.__dict__ for job in jobs])
+@dataclass(frozen=True)
+class AnalysisResult:
+    # One typed frame per run with the aggregates every post-collection stage shares
+    frame: pd.DataFrame
+    source_counts: pd.Series
+    company_counts: pd.Series
+    location_counts: pd.Series
+    category_counts: pd.Series
+    salary_data: pd.DataFrame  # rows with both salary bounds
 
-    analysis = {
-        "total_jobs": len(df),
-        "jobs_by_source": df["source"].value_counts().to_dict(),
-        "top_companies": df["company_name"].value_counts().head(Config.DEFAULT_LIMIT).to_dict(),
-        "top_locations": df["job_location"].value_counts().head(Config.DEFAULT_LIMIT).to_dict(),
-        "top_categories": df["job_category"].value_counts().head(Config.DEFAULT_LIMIT).to_dict(),
-    }
+    @property
+    def total_jobs(self) -> int:
+        return len(self.frame)
+
+    def summary(self) -> dict[str, any]:
+        analysis = {
+            "total_jobs": self.total_jobs,
+            "jobs_by_source": self.source_counts.to_dict(),
+            "top_companies": self.company_counts.head(Config.DEFAULT_LIMIT).to_dict(),
+            "top_locations": self.location_counts.head(Config.DEFAULT_LIMIT).to_dict(),
+            "top_categories": self.category_counts.head(Config.DEFAULT_LIMIT).to_dict(),
+        }
+
+        # Calculate average salary where available
+        if not self.salary_data.empty:
+            analysis["avg_salary_low"] = self.salary_data["salary_low"].mean()
+            analysis["avg_salary_high"] = self.salary_data["salary_high"].mean()
+            midpoints = salary_midpoints(self.salary_data["salary_low"], self.salary_data["salary_high"])
+            analysis["salary_percentiles"] = {
+                f"p{round(q * 100)}": value for q, value in zip(Config.SALARY_QUANTILES, np.quantile(midpoints, Config.SALARY_QUANTILES).tolist())
+            }
 
-    # Calculate average salary where available
-    salary_data = df[df["salary_low"].notna() & df["salary_high"].notna()]
-    if not salary_data.empty:
-        analysis["avg_salary_low"] = salary_data["salary_low"].mean()
-        analysis["avg_salary_high"] = salary_data["salary_high"].mean()
+        return analysis
 
-    return analysis
\ No newline at end of file
+def build_analysis(jobs: JobBatch | list[JobListing]) -> AnalysisResult:
+    df = as_job_batch(jobs).to_frame()
+    return AnalysisResult(
+        frame=df,
+        source_counts=df["source"].value_counts(),
+        company_counts=df["company_name"].value_counts(),
+        location_counts=df["job_location"].value_counts(),
+        category_counts=df["job_category"].value_counts(),
+        salary_data=df[df["salary_low"].notna() & df["salary_high"].notna()],
+    )
+
+def analyze_data(jobs: JobBatch | list[JobListing] | AnalysisResult) -> dict[str, any]:
+    analysis = jobs if isinstance(jobs, AnalysisResult) else build_analysis(jobs)
+    return analysis.summary()
+
+def analyze_trends(directory: str | None = None, trend_store=None) -> dict[str, any]:
+    # Folds any snapshots not seen yet into the stored aggregates, then reads the trends back
+    from app.services.trends import get_trend_store
+
+    trend_store = trend_store if trend_store is not None else get_trend_store()
+    trend_store.update_from_directory(directory or Config.OUTPUT_DIR)
+    days = trend_store.days()
+    return {
+        "days": len(days),
+        "first_day": days[0] if days else None,
+        "last_day": days[-1] if days else None,
+        "postings_by_category": trend_store.postings("category"),
+        "salary_drift": trend_store.salary_drift(),
+        "hiring_velocity": trend_store.hiring_velocity(Config.TREND_VELOCITY_WINDOW_DAYS),
+    }
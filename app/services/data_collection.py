@@ -1,68 +1,141 @@
-import asyncio
 import logging
 import os
+from collections import Counter
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-import pandas as pd
-import aiohttp
-
+from app.models.job_batch import JobBatch, as_job_batch
 from app.models.job_listing import JobListing
+from app.services.http_session import SessionPool, get_session_pool
+from app.services.job_store import JOB_KEY_COLUMNS, job_key, job_keys
+from app.services.metrics import record_listings, time_stage
+from app.services.near_duplicates import NearDuplicateDetector
+from app.services.query_planner import QueryPlanner
+from app.services.snapshot_io import write_snapshot
+from app.utils import merge_async_iterators
 from config import active_config as Config
 
 logger = logging.getLogger(__name__)
 
 class JobDataCollector:
-    def __init__(self, adzuna_client, usa_jobs_client):
+    def __init__(self, adzuna_client, usa_jobs_client, job_store=None, session_pool: SessionPool | None = None):
         self.adzuna_client = adzuna_client
         self.usa_jobs_client = usa_jobs_client
+        self.job_store = job_store
+        self.session_pool = session_pool if session_pool is not None else get_session_pool()
+        self.query_planner = QueryPlanner(job_store)
+        self.duplicate_clusters = []  # clusters from the last deduplication that merged listings
+        self.superseded_jobs = JobBatch()  # listings the last stream emitted and later replaced
+
+    def _build_queries(self, client, job_titles: list[str], locations: list[str]) -> list[dict]:
+        # Each source gets its own plan: what it can merge into one request differs
+        with time_stage("plan"):
+            return self.query_planner.plan(client.source, job_titles, locations)
+
+    async def async_stream_jobs(self, job_titles: list[str], locations: list[str], sinks=()) -> AsyncIterator[JobBatch]:
+        # fetch -> parse -> filter happens per page inside the clients; here each page is
+        # deduplicated against everything seen so far and handed to the sinks right away.
+        # When a preferred duplicate (USA Jobs over Adzuna) arrives after the listing it
+        # replaces went out, it is emitted too and the earlier one is deleted from the store,
+        # discarded by the sinks and listed in self.superseded_jobs.
+        detector = NearDuplicateDetector()
+        source_counts, live_keys = Counter(), Counter()
+        self.superseded_jobs = JobBatch()
+
+        async with self.session_pool.session() as session:
+            sources = [
+                self.adzuna_client.async_iter_jobs(session, self._build_queries(self.adzuna_client, job_titles, locations)),
+                self.usa_jobs_client.async_iter_jobs(session, self._build_queries(self.usa_jobs_client, job_titles, locations)),
+            ]
+            async for batch in merge_async_iterators(sources, Config.STREAM_QUEUE_SIZE):
+                source_counts.update(batch.column("source"))
+                with time_stage("dedupe"):
+                    unique_jobs, superseded = self._deduplicate_page(detector, batch, live_keys)
+                record_listings("dedupe", len(batch), len(unique_jobs))
+                if not len(unique_jobs):
+                    continue
+                if self.job_store is not None:
+                    with time_stage("store"):
+                        self.job_store.upsert(unique_jobs)
+                        if len(superseded):
+                            self.job_store.delete(superseded)
+                    record_listings("store", len(unique_jobs), len(unique_jobs))
+                if sinks:
+                    with time_stage("snapshot_write"):
+                        for sink in sinks:
+                            sink.write(unique_jobs)
+                            if len(superseded):
+                                sink.discard(superseded)
+                self.superseded_jobs.extend(superseded)
+                yield unique_jobs
+
+        self.duplicate_clusters = [cluster for cluster in detector.clusters if cluster.duplicates]
+        for source, count in source_counts.items():
+            logger.info(f"{source} jobs: {count}")
+        logger.info(f"Merged {source_counts.total() - len(detector.clusters)} near-duplicate jobs")
 
-    async def async_search_jobs(self, job_titles: list[str], locations: list[str]) -> list[JobListing]:
-        queries = [
-            {
-                'query': job_title,
-                'location': location,
-                'remote': location.lower() == "remote",
-                'distance': Config.DEFAULT_DISTANCE if location.lower() != "remote" else None,
-                'max_experience': Config.DEFAULT_MAX_EXPERIENCE,
-                'limit': Config.DEFAULT_LIMIT,
-            }
-            for job_title in job_titles
-            for location in locations
-        ]
+    @staticmethod
+    def _deduplicate_page(detector: NearDuplicateDetector, batch: JobBatch, live_keys: Counter) -> tuple[JobBatch, JobBatch]:
+        # The page's listings to emit, and earlier pages' listings they replace as canonical.
+        # A listing replaced by a later one on the same page is simply not emitted. live_keys
+        # counts emitted listings per store key, so a replaced listing whose key is still
+        # held by another one (say the same posting with a fuller description) stays stored.
+        kept, replaced_jobs = {}, []
+        for index, job in enumerate(batch):
+            cluster_id, score = detector.add(job)
+            cluster = detector.clusters[cluster_id]
+            if score is not None and cluster.canonical is not job:
+                continue
+            kept[id(job)] = index
+            if score is not None:
+                replaced = cluster.duplicates[-1][0]
+                if kept.pop(id(replaced), None) is None:
+                    replaced_jobs.append(replaced)
 
-        timeout = aiohttp.ClientTimeout(total=120)  # 2 minutes timeout
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            adzuna_task = self.adzuna_client.async_fetch_jobs_batch(session, queries)
-            usajobs_task = self.usa_jobs_client.async_fetch_jobs_batch(session, queries)
-            
-            adzuna_jobs, usajobs_jobs = await asyncio.gather(adzuna_task, usajobs_task)
-            
-            logger.info(f"Adzuna jobs: {len(adzuna_jobs)}")
-            logger.info(f"USA Jobs: {len(usajobs_jobs)}")
-            
-            all_jobs = adzuna_jobs + usajobs_jobs
+        unique_jobs = batch.take(kept.values())
+        live_keys.update(job_keys({column: unique_jobs.column(column) for column in JOB_KEY_COLUMNS}))
+        superseded = []
+        for job in replaced_jobs:
+            key = job_key(job.to_dict())
+            live_keys[key] -= 1
+            if not live_keys[key]:
+                superseded.append(job)
+        return unique_jobs, JobBatch.from_listings(superseded)
+
+    async def async_search_jobs(self, job_titles: list[str], locations: list[str], sinks=()) -> JobBatch:
+        unique_jobs = JobBatch.concat([batch async for batch in self.async_stream_jobs(job_titles, locations, sinks)])
+        if len(self.superseded_jobs):
+            superseded = set(job_keys({column: self.superseded_jobs.column(column) for column in JOB_KEY_COLUMNS}))
+            keys = job_keys({column: unique_jobs.column(column) for column in JOB_KEY_COLUMNS})
+            unique_jobs = unique_jobs.take(index for index, key in enumerate(keys) if key not in superseded)
 
-        unique_jobs = self._deduplicate_jobs(all_jobs)
-        
         logger.info(f"Total unique jobs found: {len(unique_jobs)}")
         return unique_jobs
 
     def _deduplicate_jobs(self, jobs: list[JobListing]) -> list[JobListing]:
-        job_dict = {}
-        for job in jobs:
-            key = (job.job_title, job.company_name, job.job_location, job.source)
-            if key not in job_dict:
-                job_dict[key] = job
-            elif job.source == "USA Jobs":  # Prioritize USA Jobs listings
-                job_dict[key] = job
-        return list(job_dict.values())
+        # Near-duplicates are merged across sources; USA Jobs listings are kept as canonical
+        with time_stage("dedupe"):
+            clusters = NearDuplicateDetector().deduplicate(jobs)
+        record_listings("dedupe", len(jobs), len(clusters))
+        self.duplicate_clusters = [cluster for cluster in clusters if cluster.duplicates]
+        logger.info(f"Merged {len(jobs) - len(clusters)} near-duplicate jobs into {len(self.duplicate_clusters)} listings")
+        return [cluster.canonical for cluster in clusters]
 
     def save_to_csv(self, jobs, filename):
         try:
             os.makedirs(os.path.dirname(filename), exist_ok=True)
-            df = pd.DataFrame([job.__dict__ for job in jobs])
+            df = as_job_batch(jobs).to_frame()
             df["timestamp"] = datetime.now()
             df.to_csv(filename, index=False)
             logger.info(f"Data saved to {filename}")
         except Exception as e:
-            logger.error(f"Error saving data to CSV: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error saving data to CSV: {str(e)}")
+
+    def save_snapshot(self, jobs, filename):
+        try:
+            df = as_job_batch(jobs).to_frame()
+            df["timestamp"] = datetime.now()
+            write_snapshot(df, filename)
+            logger.info(f"Snapshot saved to {filename}")
+        except Exception as e:
+            logger.error(f"Error saving snapshot: {str(e)}")
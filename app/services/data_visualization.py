@@ -1,49 +1,127 @@
+import hashlib
+import json
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
+from app.models.job_batch import JobBatch
 from app.models.job_listing import JobListing
+from app.services.data_analysis import AnalysisResult, build_analysis
 from config import active_config as Config
 
-def generate_visualizations(jobs: list[JobListing]) -> None:
-    df = pd.DataFrame([job.__dict__ for job in jobs])
+logger = logging.getLogger(__name__)
+
+# Bump when the rendering code changes, so cached charts are redrawn once
+CHART_RENDER_VERSION = 1
+
+@dataclass(frozen=True)
+class ChartSpec:
+    # Everything a worker process needs to draw one chart; also what the cache key hashes
+    filename: str
+    kind: str  # "bar" or "histogram"
+    title: str
+    values: tuple
+    labels: tuple = ()
+    figsize: tuple = (10, 6)
+    rotate_labels: bool = False
+
+    def content_hash(self) -> str:
+        payload = json.dumps(
+            [CHART_RENDER_VERSION, self.kind, self.title, self.labels, self.values, self.figsize, self.rotate_labels],
+            default=float,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _bar_spec(filename: str, title: str, counts, figsize=(12, 6), rotate_labels=True) -> ChartSpec:
+    return ChartSpec(
+        filename=filename,
+        kind="bar",
+        title=title,
+        # Plain strings, so seaborn doesn't draw an empty slot for every other category
+        labels=tuple(str(label) for label in counts.index),
+        values=tuple(int(value) for value in counts.values),
+        figsize=figsize,
+        rotate_labels=rotate_labels,
+    )
+
+def build_chart_specs(analysis: AnalysisResult) -> list[ChartSpec]:
+    return [
+        _bar_spec("job_count_by_source.png", "Job Count by Source", analysis.source_counts, figsize=(10, 6), rotate_labels=False),
+        _bar_spec("top_companies.png", "Top 10 Companies by Job Listings", analysis.company_counts.head(10)),
+        ChartSpec(
+            filename="salary_distribution.png",
+            kind="histogram",
+            title="Distribution of Minimum Salaries",
+            values=tuple(np.asarray(analysis.salary_data["salary_low"], dtype=np.float64).tolist()),
+        ),
+        _bar_spec("top_job_categories.png", "Top 10 Job Categories", analysis.category_counts.head(10)),
+    ]
+
+def render_chart(spec: ChartSpec, path: str) -> str:
+    # Runs in a worker process: an explicit Agg canvas and a standalone Figure,
+    # so nothing touches pyplot's global state or needs a display.
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    if spec.kind == "bar":
+        sns.barplot(x=list(spec.labels), y=list(spec.values), ax=ax)
+    else:
+        sns.histplot(x=np.asarray(spec.values, dtype=np.float64), kde=len(spec.values) > 1, ax=ax)
+        ax.set_xlabel("salary_low")
+    ax.set_title(spec.title)
+    if spec.rotate_labels:
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment("right")
+        fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+def _load_manifest(path: str) -> dict[str, str]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def generate_visualizations(jobs: JobBatch | list[JobListing] | AnalysisResult) -> list[str]:
+    # Charts reuse the aggregates computed for the analysis instead of recounting them
+    analysis = jobs if isinstance(jobs, AnalysisResult) else build_analysis(jobs)
 
     # Ensure output directory exists
     os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
 
-    # Job count by source
-    plt.figure(figsize=(10, 6))
-    sns.countplot(x="source", data=df)
-    plt.title("Job Count by Source")
-    plt.savefig(os.path.join(Config.OUTPUT_DIR, "job_count_by_source.png"))
-    plt.close()
-
-    # Top companies
-    plt.figure(figsize=(12, 6))
-    top_companies = df["company_name"].value_counts().head(10)
-    sns.barplot(x=top_companies.index, y=top_companies.values)
-    plt.title("Top 10 Companies by Job Listings")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.savefig(os.path.join(Config.OUTPUT_DIR, "top_companies.png"))
-    plt.close()
-
-    # Salary distribution
-    plt.figure(figsize=(10, 6))
-    salary_data = df[df["salary_low"].notna() & df["salary_high"].notna()]
-    sns.histplot(data=salary_data, x="salary_low", kde=True)
-    plt.title("Distribution of Minimum Salaries")
-    plt.savefig(os.path.join(Config.OUTPUT_DIR, "salary_distribution.png"))
-    plt.close()
-
-    # Job categories
-    plt.figure(figsize=(12, 6))
-    top_categories = df["job_category"].value_counts().head(10)
-    sns.barplot(x=top_categories.index, y=top_categories.values)
-    plt.title("Top 10 Job Categories")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.savefig(os.path.join(Config.OUTPUT_DIR, "top_job_categories.png"))
-    plt.close()
\ No newline at end of file
+    # A chart is only redrawn when the hash of its input aggregate changed (or the file is gone)
+    manifest_path = os.path.join(Config.OUTPUT_DIR, Config.CHART_CACHE_MANIFEST)
+    manifest = _load_manifest(manifest_path)
+    specs = build_chart_specs(analysis)
+    stale = []
+    for spec in specs:
+        path = os.path.join(Config.OUTPUT_DIR, spec.filename)
+        content_hash = spec.content_hash()
+        if manifest.get(spec.filename) == content_hash and os.path.exists(path):
+            continue
+        stale.append((spec, path, content_hash))
+
+    if not stale:
+        logger.info("All charts are up to date")
+        return []
+
+    workers = min(Config.CHART_WORKERS, len(stale))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render_chart, [spec for spec, _, _ in stale], [path for _, path, _ in stale]))
+    else:
+        rendered = [render_chart(spec, path) for spec, path, _ in stale]
+
+    manifest.update({spec.filename: content_hash for spec, _, content_hash in stale})
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Rendered {len(rendered)} of {len(specs)} charts")
+    return rendered
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+
+from app.services.job_store import JobStore
+from app.utils import format_salary_range
+from config import active_config as Config
+
+# DataTables column "data" names mapped to the store column they sort and search on
+COLUMN_MAP = {
+    "job_title": "job_title",
+    "company_name": "company_name",
+    "job_location": "job_location",
+    "salary_range": "salary_low",
+    "source": "source",
+}
+
+@dataclass
+class DataTablesRequest:
+    draw: int = 0
+    start: int = 0
+    length: int = Config.DATATABLES_DEFAULT_LENGTH
+    order: list[tuple[str, str]] = field(default_factory=list)
+    search: str = ""
+    column_search: dict[str, str] = field(default_factory=dict)
+
+def _to_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def parse_datatables_request(args) -> DataTablesRequest:
+    length = _to_int(args.get("length"), Config.DATATABLES_DEFAULT_LENGTH)
+    if length < 0 or length > Config.DATATABLES_MAX_LENGTH:  # -1 means "all" to DataTables
+        length = Config.DATATABLES_MAX_LENGTH
+
+    columns = {}
+    column_search = {}
+    i = 0
+    while f"columns[{i}][data]" in args:
+        name = args.get(f"columns[{i}][data]")
+        columns[i] = name
+        value = args.get(f"columns[{i}][search][value]", "").strip()
+        if value and name in COLUMN_MAP and args.get(f"columns[{i}][searchable]", "true") == "true":
+            column_search[COLUMN_MAP[name]] = value
+        i += 1
+
+    order = []
+    i = 0
+    while f"order[{i}][column]" in args:
+        name = columns.get(_to_int(args.get(f"order[{i}][column]"), -1))
+        direction = "desc" if args.get(f"order[{i}][dir]") == "desc" else "asc"
+        if name in COLUMN_MAP:
+            order.append((COLUMN_MAP[name], direction))
+        i += 1
+
+    return DataTablesRequest(
+        draw=_to_int(args.get("draw"), 0),
+        start=max(_to_int(args.get("start"), 0), 0),
+        length=length,
+        order=order,
+        search=args.get("search[value]", "").strip(),
+        column_search=column_search,
+    )
+
+def datatables_echo(args) -> dict:
+    # The per-request draw counter DataTables expects back; kept out of cached pages
+    return {"draw": _to_int(args.get("draw"), 0)}
+
+def stream_records(job_store: JobStore, args, chunk_rows: int = Config.NDJSON_CHUNK_ROWS, **filters):
+    # Every row matching the request's search and filters, chunk by chunk in insertion order;
+    # the NDJSON mode of /api/jobs, where paging and ordering don't apply
+    dt_request = parse_datatables_request(args)
+    for chunk in job_store.iter_chunks(chunk_rows, search=dt_request.search, column_search=dt_request.column_search, **filters):
+        for record in chunk:
+            record["salary_range"] = format_salary_range(record["salary_low"], record["salary_high"])
+        yield chunk
+
+def datatables_response(job_store: JobStore, args, **filters) -> dict:
+    dt_request = parse_datatables_request(args)
+    data, records_filtered = job_store.search_page(
+        start=dt_request.start,
+        length=dt_request.length,
+        order=dt_request.order,
+        search=dt_request.search,
+        column_search=dt_request.column_search,
+        **filters,
+    )
+    for record in data:
+        record["salary_range"] = format_salary_range(record["salary_low"], record["salary_high"])
+
+    return {
+        "draw": dt_request.draw,
+        "recordsTotal": job_store.count(),
+        "recordsFiltered": records_filtered,
+        "data": data,
+    }
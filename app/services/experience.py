@@ -0,0 +1,92 @@
+import re
+from collections.abc import Iterable
+
+import numpy as np
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+}
+_NUMBER = r"(?:\d{1,2}(?:\.\d+)?|" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r")"
+_MAX_PLAUSIBLE_YEARS = 40
+# How far from a year mention, within its sentence, "experience" has to be for the mention to
+# count: "Experience: minimum of 3 yrs", "2 years relevant experience", or further after an
+# "of"/"in" ("5 years of relevant work experience") but not "a 4 year degree and experience"
+_WORDS_BEFORE = 6
+_WORDS_AFTER = 2
+_WORDS_AFTER_OF = 4
+_CONTEXT_CHARS = 160  # enough text either side to hold those words
+_SENTENCE_END = re.compile(r"[.;!?\n](?:\s|$)")
+_WORD = re.compile(r"\w+")
+
+# One pass finds every "N years" mention together with an optional qualifier, range or "+".
+# "for (over) N years" and "N years ago" describe a duration or a date, not a requirement.
+_EXPERIENCE_PATTERN = re.compile(
+    rf"""
+    (?P<duration>\bfor\s+)?
+    (?:(?P<at_least>at\s+least|a\s+minimum\s+of|minimum\s+of|minimum|min\.?|over|more\s+than)
+      |(?P<at_most>up\s+to|no\s+more\s+than|maximum\s+of|a\s+maximum\s+of|less\s+than))?
+    \s*\b(?P<low>{_NUMBER})
+    (?:\s*(?:-|–|—|to)\s*(?P<high>{_NUMBER}))?
+    \s*(?P<plus>\+)?
+    \s*(?:full[\s-]+time\s+)?(?:years?|yrs?)\b
+    (?P<ago>\s+ago\b)?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+def _to_years(token: str) -> float:
+    token = token.lower()
+    return float(_NUMBER_WORDS[token]) if token in _NUMBER_WORDS else float(token)
+
+def _mentions_experience(words: list[str]) -> bool:
+    return any(word.lower().startswith("experience") for word in words)
+
+def _about_experience(text: str, start: int, end: int) -> bool:
+    before = _SENTENCE_END.split(text[max(start - _CONTEXT_CHARS, 0):start])[-1]
+    after = _SENTENCE_END.split(text[end:end + _CONTEXT_CHARS], maxsplit=1)[0]
+    words_after = _WORD.findall(after)
+    if words_after and words_after[0].lower() in ("of", "in"):
+        words_after = words_after[:_WORDS_AFTER_OF]
+    else:
+        words_after = words_after[:_WORDS_AFTER]
+    return _mentions_experience(_WORD.findall(before)[-_WORDS_BEFORE:]) or _mentions_experience(words_after)
+
+def extract_experience(text: str | None) -> tuple[float | None, float | None]:
+    if not text or "experience" not in text.lower():
+        return None, None
+
+    minimums, maximums = [], []
+    for match in _EXPERIENCE_PATTERN.finditer(text):
+        if match.group("duration") or match.group("ago") or not _about_experience(text, match.start(), match.end()):
+            continue
+        low = _to_years(match.group("low"))
+        high = _to_years(match.group("high")) if match.group("high") else None
+        if low > _MAX_PLAUSIBLE_YEARS or (high is not None and high > _MAX_PLAUSIBLE_YEARS):
+            continue
+        if match.group("at_most"):
+            minimums.append(0.0)
+            maximums.append(low)
+            continue
+        minimums.append(min(low, high) if high is not None else low)
+        if high is not None:
+            maximums.append(max(low, high))
+
+    if not minimums:
+        return None, None
+    # The loosest stated requirement decides whether a candidate can apply at all
+    return min(minimums), (max(maximums) if maximums else None)
+
+def extract_experience_batch(texts: Iterable[str | None]) -> tuple[np.ndarray, np.ndarray]:
+    pairs = [extract_experience(text) for text in texts]
+    minimums = np.array([np.nan if low is None else low for low, _ in pairs], dtype=np.float64)
+    maximums = np.array([np.nan if high is None else high for _, high in pairs], dtype=np.float64)
+    return minimums, maximums
+
+def meets_experience(experience_min: float | None, max_experience: float) -> bool:
+    return experience_min is None or experience_min <= max_experience
+
+def experience_mask(experience_min, max_experience: float) -> np.ndarray:
+    # Listings with no stated requirement (NaN) always pass
+    experience_min = np.asarray(experience_min, dtype=np.float64)
+    return np.isnan(experience_min) | (experience_min <= max_experience)
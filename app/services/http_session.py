@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from config import active_config as Config
+
+logger = logging.getLogger(__name__)
+
+class SessionPool:
+    # One keep-alive ClientSession per process, opened when the app starts serving and
+    # closed when it stops. An aiohttp session belongs to the event loop that created it,
+    # so callers on any other loop (or before start()) get a short-lived session instead.
+    def __init__(
+        self,
+        limit: int = Config.HTTP_CONNECTION_LIMIT,
+        limit_per_host: int = Config.HTTP_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout: float = Config.HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = Config.HTTP_DNS_CACHE_TTL,
+        timeout: float = Config.HTTP_TIMEOUT,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self._session = None
+        self._loop = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    async def start(self) -> None:
+        if self.started:
+            return
+        self._session = self._create_session()
+        self._loop = asyncio.get_running_loop()
+        logger.info(f"Opened shared HTTP session (limit={self.limit}, per host={self.limit_per_host})")
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            logger.info("Closed shared HTTP session")
+        self._session = None
+        self._loop = None
+
+    def _shared_session(self) -> aiohttp.ClientSession | None:
+        if self.started and self._loop is asyncio.get_running_loop():
+            return self._session
+        return None
+
+    @asynccontextmanager
+    async def session(self):
+        shared = self._shared_session()
+        if shared is not None:
+            yield shared
+            return
+        async with self._create_session() as session:
+            yield session
+
+_session_pool = None
+
+def get_session_pool() -> SessionPool:
+    global _session_pool
+    if _session_pool is None:
+        _session_pool = SessionPool()
+    return _session_pool
@@ -0,0 +1,450 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Iterator
+from dataclasses import fields
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from app.models.job_batch import JobBatch, as_job_batch
+from app.models.job_listing import JobListing
+from config import active_config as Config
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = [f.name for f in fields(JobListing)]
+INDEXED_COLUMNS = [
+    "job_title", "job_category", "job_category_code", "source", "company_name", "job_location",
+    "salary_low", "experience_min", "first_seen", "last_seen",
+]
+# DataTables' search columns; each also gets a case-insensitive index, so "starts with"
+# searches on it are range scans rather than table scans
+SEARCHABLE_COLUMNS = ["job_title", "company_name", "job_location", "source"]
+# Columns in the full-text index, with their BM25 weights: a skill in the title counts for
+# more than the same word somewhere in a long description
+FULL_TEXT_COLUMNS = {"job_title": 10.0, "company_name": 5.0, "job_description": 1.0}
+_SEARCH_WORD = re.compile(r"\w+")
+# The parts of an FTS5 expression the LIKE fallback understands: "phrases"(*) and OR/NOT
+_MATCH_TOKEN = re.compile(r'"([^"]*)"\*?|\b(OR|NOT)\b')
+
+def _column_type(field_type) -> str:
+    return "REAL" if "float" in str(field_type) else "TEXT"
+
+JOB_KEY_COLUMNS = ("job_title", "company_name", "job_location", "source")
+
+def job_key(record: dict) -> str:
+    # Exact identity of a listing; near-duplicates are merged before they reach the store
+    key = "\x1f".join(str(record.get(column)) for column in JOB_KEY_COLUMNS)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def job_keys(columns) -> list[str]:
+    # job_key of every row, from anything that maps the key columns to sequences (a frame, a dict)
+    return [job_key(dict(zip(JOB_KEY_COLUMNS, values))) for values in zip(*(columns[column] for column in JOB_KEY_COLUMNS))]
+
+class JobStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self.full_text = None  # whether FTS5 is available, known once connected
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(self._conn)
+        return self._conn
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        column_defs = ", ".join(f"{f.name} {_column_type(f.type)}" for f in fields(JobListing))
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS jobs (job_key TEXT PRIMARY KEY, {column_defs}, first_seen TEXT NOT NULL, last_seen TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+        # Columns added to JobListing after the database was created
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for f in fields(JobListing):
+            if f.name not in existing:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {f.name} {_column_type(f.type)}")
+
+        for column in INDEXED_COLUMNS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_{column} ON jobs ({column})")
+        for column in SEARCHABLE_COLUMNS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_{column}_nocase ON jobs ({column} COLLATE NOCASE)")
+        self._create_full_text_index(conn)
+        conn.commit()
+
+    def _create_full_text_index(self, conn: sqlite3.Connection) -> None:
+        # An external-content FTS5 table over jobs, in the store's own file so it survives
+        # restarts. upsert_records and delete keep it in sync.
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'").fetchone()
+        try:
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5({', '.join(FULL_TEXT_COLUMNS)}, "
+                f"content='jobs', content_rowid='rowid', tokenize='porter unicode61')"
+            )
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5; full-text search falls back to a LIKE scan
+            logger.warning(f"Full-text index unavailable, search will scan: {e}")
+            self.full_text = False
+            return
+        if not exists:
+            # A store created before the index existed is indexed once, here
+            conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+        self.full_text = True
+
+    @staticmethod
+    def _upsert_indexed(conn: sqlite3.Connection, sql: str, rows: list[list]) -> None:
+        # Triggers could keep the index in sync, but any trigger on jobs nearly doubles the
+        # cost of an upsert. Instead the indexed text of the listings about to be written is
+        # set aside, and afterwards only new listings and those whose text changed are
+        # re-indexed, in two bulk statements.
+        columns = ", ".join(FULL_TEXT_COLUMNS)
+        changed = " OR ".join(f"old.{column} IS NOT jobs.{column}" for column in FULL_TEXT_COLUMNS)
+        conn.execute("CREATE TEMP TABLE upsert_keys (job_key TEXT PRIMARY KEY)")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO upsert_keys VALUES (?)", ([row[0]] for row in rows))
+            conn.execute(
+                f"CREATE TEMP TABLE indexed_text AS SELECT jobs.rowid AS job_rowid, {columns} "
+                f"FROM upsert_keys JOIN jobs USING (job_key)"
+            )
+            conn.executemany(sql, rows)
+            conn.execute(
+                f"INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) "
+                f"SELECT 'delete', old.job_rowid, {', '.join(f'old.{c}' for c in FULL_TEXT_COLUMNS)} "
+                f"FROM indexed_text AS old JOIN jobs ON jobs.rowid = old.job_rowid WHERE {changed}"
+            )
+            conn.execute(
+                f"INSERT INTO jobs_fts (rowid, {columns}) "
+                f"SELECT jobs.rowid, {', '.join(f'jobs.{c}' for c in FULL_TEXT_COLUMNS)} "
+                f"FROM upsert_keys JOIN jobs USING (job_key) LEFT JOIN indexed_text AS old ON old.job_rowid = jobs.rowid "
+                f"WHERE old.job_rowid IS NULL OR {changed}"
+            )
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.upsert_keys")
+            conn.execute("DROP TABLE IF EXISTS temp.indexed_text")
+
+    @property
+    def revision(self) -> int:
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return row["value"] if row else 0
+
+    def upsert(self, jobs: JobBatch | list[JobListing], seen_at: datetime | None = None) -> int:
+        return self.upsert_records(as_job_batch(jobs).to_records(), seen_at)
+
+    def upsert_frame(self, df: pd.DataFrame, seen_at: datetime | None = None) -> int:
+        df = df.astype(object).where(df.notna(), None)
+        return self.upsert_records(df.to_dict('records'), seen_at)
+
+    def upsert_records(self, records: list[dict], seen_at: datetime | None = None) -> int:
+        import pandas as pd
+
+        if not records:
+            return 0
+        default_seen = (seen_at or datetime.now()).isoformat(timespec="seconds")
+        rows = []
+        for record in records:
+            seen = record.get("timestamp")
+            seen = pd.Timestamp(seen).isoformat(timespec="seconds") if seen is not None else default_seen
+            rows.append([job_key(record)] + [record.get(column) for column in JOB_COLUMNS] + [seen, seen])
+
+        columns = ["job_key"] + JOB_COLUMNS + ["first_seen", "last_seen"]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in JOB_COLUMNS)
+        sql = (
+            f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(job_key) DO UPDATE SET {updates}, "
+            f"last_seen = MAX(jobs.last_seen, excluded.last_seen), first_seen = MIN(jobs.first_seen, excluded.first_seen)"
+        )
+        with self._lock:
+            conn = self._connect()
+            if self.full_text:
+                self._upsert_indexed(conn, sql, rows)
+            else:
+                conn.executemany(sql, rows)
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('revision', 1) ON CONFLICT(key) DO UPDATE SET value = value + 1"
+            )
+            conn.commit()
+        logger.info(f"Upserted {len(rows)} jobs into {self.path}")
+        return len(rows)
+
+    def delete(self, jobs: JobBatch | list[JobListing]) -> int:
+        # Listings that a preferred near-duplicate replaced after they were stored
+        keys = [[job_key(record)] for record in as_job_batch(jobs).to_records()]
+        if not keys:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            if self.full_text:
+                columns = ", ".join(FULL_TEXT_COLUMNS)
+                conn.executemany(
+                    f"INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) SELECT 'delete', rowid, {columns} FROM jobs WHERE job_key = ?",
+                    keys,
+                )
+            deleted = conn.executemany("DELETE FROM jobs WHERE job_key = ?", keys).rowcount
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('revision', 1) ON CONFLICT(key) DO UPDATE SET value = value + 1"
+            )
+            conn.commit()
+        logger.info(f"Deleted {deleted} jobs from {self.path}")
+        return deleted
+
+    @staticmethod
+    def _check_column(column: str) -> None:
+        if column not in JOB_COLUMNS and column not in ("first_seen", "last_seen"):
+            raise ValueError(f"Unknown job column: {column}")
+
+    @classmethod
+    def _filter_clauses(cls, filters: dict) -> tuple[list[str], list]:
+        clauses, params = [], []
+        for column, value in filters.items():
+            if value is None or value == []:
+                continue
+            if column == "max_experience":
+                # Re-applies the experience cap at query time; listings without a stated requirement pass
+                clauses.append("(experience_min IS NULL OR experience_min <= ?)")
+                params.append(value)
+                continue
+            cls._check_column(column)
+            if isinstance(value, (list, tuple, set)):
+                clauses.append(f"{column} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return clauses, params
+
+    @classmethod
+    def _where(cls, filters: dict) -> tuple[str, list]:
+        clauses, params = cls._filter_clauses(filters)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    @staticmethod
+    def _like_pattern(value: str, anywhere: bool = True) -> str:
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%" if anywhere else f"{escaped}%"
+
+    def _search_clauses(self, search: str | None, column_search: dict[str, str] | None, filters: dict) -> tuple[list[str], list]:
+        # DataTables search, all of it served by indexes: the global search matches word
+        # prefixes through the full-text index (title, company, description) and the start
+        # of the other searchable columns; a column search matches the start of its column.
+        clauses, params = self._filter_clauses(filters)
+        if search:
+            if self.full_text is None:
+                with self._lock:
+                    self._connect()
+            words = _SEARCH_WORD.findall(search)
+            full_text = set(FULL_TEXT_COLUMNS) if self.full_text and words else set()
+            alternatives = []
+            if full_text:
+                alternatives.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+                params.append(" ".join(f'"{word}"*' for word in words))
+            for column in SEARCHABLE_COLUMNS:
+                if column not in full_text:
+                    alternatives.append(f"{column} LIKE ? ESCAPE '\\'")
+                    params.append(self._like_pattern(search, anywhere=False))
+            clauses.append("(" + " OR ".join(alternatives) + ")")
+        for column, value in (column_search or {}).items():
+            self._check_column(column)
+            clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+            params.append(self._like_pattern(value, anywhere=False))
+        return clauses, params
+
+    def search_page(
+        self,
+        start: int = 0,
+        length: int = 25,
+        order: list[tuple[str, str]] | None = None,
+        search: str | None = None,
+        column_search: dict[str, str] | None = None,
+        **filters,
+    ) -> tuple[list[dict], int]:
+        clauses, params = self._search_clauses(search, column_search, filters)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        # Ordering on indexed columns lets SQLite walk the index instead of sorting the table
+        order_terms = []
+        for column, direction in order or []:
+            self._check_column(column)
+            order_terms.append(f"{column} {'DESC' if direction == 'desc' else 'ASC'}")
+        order_by = ", ".join(order_terms + ["rowid"])
+
+        with self._lock:
+            conn = self._connect()
+            records_filtered = conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM jobs{where} ORDER BY {order_by} LIMIT ? OFFSET ?", params + [length, start]
+            ).fetchall()
+        return [dict(row) for row in rows], records_filtered
+
+    def iter_chunks(
+        self,
+        chunk_rows: int = 1000,
+        search: str | None = None,
+        column_search: dict[str, str] | None = None,
+        **filters,
+    ) -> Iterator[list[dict]]:
+        # Every matching row in rowid order, chunk_rows at a time. Each chunk is a separate
+        # keyset query, so the lock is never held between chunks and memory stays flat.
+        clauses, params = self._search_clauses(search, column_search, filters)
+        last_rowid = 0
+        while True:
+            where = " AND ".join(clauses + ["rowid > ?"])
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT rowid AS _rowid, * FROM jobs WHERE {where} ORDER BY rowid LIMIT ?",
+                    params + [last_rowid, chunk_rows],
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1]["_rowid"]
+            chunk = [dict(row) for row in rows]
+            for record in chunk:
+                del record["_rowid"]
+            yield chunk
+            if len(rows) < chunk_rows:
+                return
+
+    def full_text_search(self, match: str, start: int = 0, length: int = 25, **filters) -> tuple[list[dict], int]:
+        # match is an FTS5 query expression (see app.services.search.fts_query). Results are
+        # ranked by BM25 and carry it as "score", higher is better.
+        with self._lock:
+            self._connect()
+        if not self.full_text:
+            return self._scan_search(match, start, length, **filters)
+
+        clauses, params = self._filter_clauses(filters)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        weights = ", ".join(str(weight) for weight in FULL_TEXT_COLUMNS.values())
+        matches = (
+            f"WITH matches AS (SELECT rowid AS match_rowid, bm25(jobs_fts, {weights}) AS rank "
+            f"FROM jobs_fts WHERE jobs_fts MATCH ?) "
+        )
+        joined = f"FROM matches JOIN jobs ON jobs.rowid = matches.match_rowid{where}"
+        try:
+            with self._lock:
+                conn = self._connect()
+                total = conn.execute(f"{matches}SELECT COUNT(*) {joined}", [match] + params).fetchone()[0]
+                rows = conn.execute(
+                    f"{matches}SELECT jobs.*, -matches.rank AS score {joined} ORDER BY matches.rank, jobs.rowid LIMIT ? OFFSET ?",
+                    [match] + params + [length, start],
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {match!r}: {e}") from e
+        return [dict(row) for row in rows], total
+
+    @classmethod
+    def _term_clause(cls, words: list[str]) -> tuple[str, list]:
+        # Every word of a term (a phrase's words need not be adjacent) in some indexed column
+        any_column = "(" + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in FULL_TEXT_COLUMNS) + ")"
+        return " AND ".join([any_column] * len(words)), [cls._like_pattern(word) for word in words for _ in FULL_TEXT_COLUMNS]
+
+    def _scan_search(self, match: str, start: int, length: int, **filters) -> tuple[list[dict], int]:
+        # Without FTS5, the expressions fts_query builds are evaluated with LIKE, unranked:
+        # adjacent terms must all appear, OR separates alternatives and NOT terms must not appear
+        groups, excluded, negate = [[]], [], False
+        for phrase, operator in _MATCH_TOKEN.findall(match):
+            if operator == "OR":
+                groups.append([])
+            elif operator == "NOT":
+                negate = True
+            elif phrase.split():
+                (excluded if negate else groups[-1]).append(phrase.split())
+                negate = False
+
+        clauses, params = self._filter_clauses(filters)
+        alternatives = []
+        for group in filter(None, groups):
+            terms = [self._term_clause(words) for words in group]
+            alternatives.append("(" + " AND ".join(sql for sql, _ in terms) + ")")
+            params.extend(param for _, term_params in terms for param in term_params)
+        if alternatives:
+            clauses.append("(" + " OR ".join(alternatives) + ")")
+        for words in excluded:
+            sql, term_params = self._term_clause(words)
+            clauses.append(f"NOT ({sql})")
+            params.extend(term_params)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            conn = self._connect()
+            total = conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT *, 0.0 AS score FROM jobs{where} ORDER BY rowid LIMIT ? OFFSET ?", params + [length, start]
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def query(self, limit: int | None = None, offset: int = 0, **filters) -> list[dict]:
+        where, params = self._where(filters)
+        sql = f"SELECT * FROM jobs{where} ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def columns(self, names: list[str], **filters) -> dict[str, list]:
+        # Whole columns of the matching rows, for vectorized aggregation without per-row dicts
+        for name in names:
+            self._check_column(name)
+        where, params = self._where(filters)
+        with self._lock:
+            cursor = self._connect().execute(f"SELECT {', '.join(names)} FROM jobs{where} ORDER BY rowid", params)
+            cursor.row_factory = None
+            rows = cursor.fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: list(column) for name, column in zip(names, values)}
+
+    def count(self, **filters) -> int:
+        where, params = self._where(filters)
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+    def distinct(self, column: str, **filters) -> list:
+        if column not in JOB_COLUMNS:
+            raise ValueError(f"Unknown job column: {column}")
+        where, params = self._where(filters)
+        where = f"{where} AND" if where else " WHERE"
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT DISTINCT {column} FROM jobs{where} {column} IS NOT NULL ORDER BY {column}", params
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def value_counts(self, column: str, **filters) -> list[tuple]:
+        if column not in JOB_COLUMNS:
+            raise ValueError(f"Unknown job column: {column}")
+        where, params = self._where(filters)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {column}, COUNT(*) AS count FROM jobs{where} GROUP BY {column} ORDER BY count DESC", params
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_job_store = None
+
+def get_job_store() -> JobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore(Config.JOB_STORE_PATH)
+    return _job_store
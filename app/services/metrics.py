@@ -0,0 +1,220 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Served by the /metrics routes; Prometheus' plain-text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond parse/filter steps up to slow upstream pages
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric(ABC):
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    @abstractmethod
+    def _samples(self) -> list[tuple[str, dict, float]]:
+        pass
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in self._samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def items(self) -> list[tuple[dict, float]]:
+        with self._lock:
+            return [(self._labels(key), value) for key, value in self._values.items()]
+
+    def _samples(self):
+        return [(self.name, labels, value) for labels, value in self.items()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts = {}  # label key -> per-bucket (non-cumulative) counts
+        self._sums = defaultdict(float)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def items(self) -> list[tuple[dict, int, float]]:
+        # (labels, observation count, sum of observations)
+        with self._lock:
+            return [(self._labels(key), sum(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            snapshot = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        for key, counts, total in snapshot:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+REGISTRY = MetricsRegistry()
+
+FETCH_DURATION = REGISTRY.histogram(
+    "job_listings_fetch_duration_seconds", "Upstream API request latency.", ("source",)
+)
+FETCH_REQUESTS = REGISTRY.counter(
+    "job_listings_fetch_requests_total", "Upstream API requests by response status (or error).", ("source", "status")
+)
+FETCH_RETRIES = REGISTRY.counter(
+    "job_listings_fetch_retries_total", "Upstream API requests retried, by reason.", ("source", "reason")
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "job_listings_stage_duration_seconds", "Time spent in each pipeline stage.", ("stage", "source")
+)
+STAGE_LISTINGS = REGISTRY.counter(
+    "job_listings_stage_listings_total", "Listings entering and leaving each pipeline stage.", ("stage", "source", "direction")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "job_listings_http_request_duration_seconds", "Latency of the app's own HTTP endpoints.",
+    ("endpoint", "method", "status"),
+)
+
+def time_stage(stage: str, source: str = "all"):
+    return STAGE_DURATION.time(stage=stage, source=source)
+
+def record_listings(stage: str, listings_in: int, listings_out: int, source: str = "all") -> None:
+    STAGE_LISTINGS.inc(listings_in, stage=stage, source=source, direction="in")
+    STAGE_LISTINGS.inc(listings_out, stage=stage, source=source, direction="out")
+
+def observe_request(endpoint: str | None, method: str, status: int, started: float) -> None:
+    # Endpoints are labelled by route rule, not raw path, so query strings and ids can't blow up cardinality
+    HTTP_REQUEST_DURATION.observe(
+        time.perf_counter() - started, endpoint=endpoint or "unmatched", method=method, status=status
+    )
+
+def render_metrics() -> tuple[str, int, dict]:
+    # Returned as-is from a Flask or Quart view
+    return REGISTRY.render(), 200, {"Content-Type": CONTENT_TYPE}
+
+def stage_summary() -> list[dict]:
+    # Totals per stage and source since the process started (or the registry was reset)
+    listings = defaultdict(dict)
+    for labels, value in STAGE_LISTINGS.items():
+        listings[(labels["stage"], labels["source"])][labels["direction"]] = int(value)
+    summary = []
+    for labels, count, total in STAGE_DURATION.items():
+        counts = listings.get((labels["stage"], labels["source"]), {})
+        summary.append({
+            "stage": labels["stage"],
+            "source": labels["source"],
+            "calls": count,
+            "seconds": total,
+            "listings_in": counts.get("in"),
+            "listings_out": counts.get("out"),
+        })
+    for labels, count, total in FETCH_DURATION.items():
+        summary.append({
+            "stage": "fetch", "source": labels["source"], "calls": count, "seconds": total,
+            "listings_in": None, "listings_out": None,
+        })
+    return sorted(summary, key=lambda row: row["seconds"], reverse=True)
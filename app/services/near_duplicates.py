@@ -0,0 +1,163 @@
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.models.job_listing import JobListing
+from config import active_config as Config
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_EMPTY = np.uint64(np.iinfo(np.uint64).max)  # above any permuted hash; marks "no shingle"
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "the"}
+_LOCATION_NOISE = {"us", "usa", "united", "states", "county"}
+_STATE_ABBREVIATIONS = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca", "colorado": "co",
+    "connecticut": "ct", "delaware": "de", "district of columbia": "dc", "florida": "fl", "georgia": "ga",
+    "hawaii": "hi", "idaho": "id", "illinois": "il", "indiana": "in", "iowa": "ia", "kansas": "ks",
+    "kentucky": "ky", "louisiana": "la", "maine": "me", "maryland": "md", "massachusetts": "ma",
+    "michigan": "mi", "minnesota": "mn", "mississippi": "ms", "missouri": "mo", "montana": "mt",
+    "nebraska": "ne", "nevada": "nv", "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm",
+    "new york": "ny", "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok",
+    "oregon": "or", "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc", "south dakota": "sd",
+    "tennessee": "tn", "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa",
+    "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy",
+}
+
+def normalize_text(text: str | None, drop_tokens: set[str] = frozenset()) -> str:
+    if not text or text == "N/A":
+        return ""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(token for token in _NON_ALNUM.split(text) if token and token not in drop_tokens)
+
+def normalize_location(location: str | None) -> str:
+    # "Washington, District of Columbia" and "Washington, DC" normalize the same; only the
+    # state part after the first comma is abbreviated so a "Washington" city survives.
+    if not location or location == "N/A":
+        return ""
+    city, _, region = str(location).partition(",")
+    region = normalize_text(region, _LOCATION_NOISE)
+    region = _STATE_ABBREVIATIONS.get(region, region)
+    return " ".join(part for part in (normalize_text(city, _LOCATION_NOISE), region) if part)
+
+def _char_grams(value: str, size: int = 4) -> set[str]:
+    if not value:
+        return set()
+    return {value[i:i + size] for i in range(max(len(value) - size + 1, 1))}
+
+@dataclass
+class DuplicateCluster:
+    canonical: JobListing
+    # (duplicate listing, estimated Jaccard similarity to the cluster representative)
+    duplicates: list[tuple[JobListing, float]] = field(default_factory=list)
+
+class NearDuplicateDetector:
+    def __init__(
+        self,
+        field_permutations: dict[str, int] = Config.MINHASH_FIELD_PERMUTATIONS,
+        bands: int = Config.MINHASH_BANDS,
+        threshold: float = Config.NEAR_DUPLICATE_THRESHOLD,
+        seed: int = 1,
+    ):
+        self.field_permutations = field_permutations
+        self.num_perm = sum(field_permutations.values())
+        if self.num_perm % bands:
+            raise ValueError("The total number of permutations must be divisible by bands")
+        self.bands = bands
+        self.rows = self.num_perm // bands
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        # a and b stay below 2**32 so a * hash never overflows uint64
+        self._a = rng.integers(1, int(_MAX_HASH), self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MAX_HASH), self.num_perm, dtype=np.uint64)
+        # Bands are cut from a shuffled signature so every band mixes all fields; otherwise
+        # a band made only of title hashes would put every "Software Engineer" in one bucket.
+        self._band_order = rng.permutation(self.num_perm)
+        self._position_fields = np.repeat(np.arange(len(field_permutations)), list(field_permutations.values()))
+
+        self.clusters: list[DuplicateCluster] = []
+        self._signatures: list[np.ndarray] = []  # one representative signature per cluster
+        self._buckets: dict[tuple[int, bytes], list[int]] = defaultdict(list)
+
+    @staticmethod
+    def field_shingles(job: JobListing) -> dict[str, set[str]]:
+        title = normalize_text(job.job_title)
+        company = normalize_text(job.company_name, _COMPANY_SUFFIXES)
+        location = normalize_location(job.job_location)
+        words = normalize_text(job.job_description).split()[:Config.NEAR_DUPLICATE_DESCRIPTION_WORDS]
+        return {
+            "job_title": _char_grams(title),
+            "company_name": _char_grams(company),
+            "job_location": _char_grams(location),
+            "job_description": {" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 0))},
+        }
+
+    # Each field gets its own slice of the signature, so the share of matching positions
+    # estimates a weighted average of per-field Jaccard similarities.
+    def signature(self, job: JobListing) -> np.ndarray:
+        shingles_by_field = self.field_shingles(job)
+        hashes, owners = [], []
+        for field_index, field_name in enumerate(self.field_permutations):
+            shingles = shingles_by_field.get(field_name, ())
+            hashes.extend(zlib.crc32(shingle.encode("utf-8")) for shingle in shingles)
+            owners.extend([field_index] * len(shingles))
+        if not hashes:
+            return np.full(self.num_perm, _EMPTY, dtype=np.uint64)
+
+        # All fields are hashed in one pass; positions only see their own field's shingles
+        permuted = (np.outer(self._a, np.array(hashes, dtype=np.uint64)) % _MERSENNE_PRIME + self._b[:, None]) % _MERSENNE_PRIME
+        permuted[self._position_fields[:, None] != np.array(owners)[None, :]] = _EMPTY
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray):
+        mixed = signature[self._band_order]
+        for band in range(self.bands):
+            yield band, mixed[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    # Returns the job's cluster id and its similarity score (None when it starts a new cluster)
+    def add(self, job: JobListing) -> tuple[int, float | None]:
+        signature = self.signature(job)
+        band_keys = list(self._band_keys(signature))
+
+        # Buckets only hold cluster representatives, so each lookup stays small no matter
+        # how many duplicates a cluster has accumulated.
+        candidates = {cluster_id for key in band_keys for cluster_id in self._buckets.get(key, ())}
+        best_id, best_score = None, 0.0
+        for cluster_id in candidates:
+            score = float(np.mean(self._signatures[cluster_id] == signature))
+            if score > best_score:
+                best_id, best_score = cluster_id, score
+
+        if best_id is not None and best_score >= self.threshold:
+            cluster = self.clusters[best_id]
+            if _prefer(job, cluster.canonical):
+                cluster.duplicates.append((cluster.canonical, best_score))
+                cluster.canonical = job
+            else:
+                cluster.duplicates.append((job, best_score))
+            return best_id, best_score
+
+        cluster_id = len(self.clusters)
+        self.clusters.append(DuplicateCluster(canonical=job))
+        self._signatures.append(signature)
+        for key in band_keys:
+            self._buckets[key].append(cluster_id)
+        return cluster_id, None
+
+    def deduplicate(self, jobs: list[JobListing]) -> list[DuplicateCluster]:
+        for job in jobs:
+            self.add(job)
+        return self.clusters
+
+def _completeness(job: JobListing) -> int:
+    return sum(value not in (None, "", "N/A") for value in job.to_dict().values())
+
+def _prefer(candidate: JobListing, current: JobListing) -> bool:
+    # USA Jobs listings win ties, as they did in the exact-key deduplication
+    if (candidate.source == "USA Jobs") != (current.source == "USA Jobs"):
+        return candidate.source == "USA Jobs"
+    return _completeness(candidate) > _completeness(current)
@@ -0,0 +1,151 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+try:
+    import brotli
+except ImportError:  # optional; clients then get gzip
+    brotli = None
+
+from app.services import serialization
+from app.services.job_store import JobStore
+from config import active_config as Config
+
+JSON_MIMETYPE = "application/json"
+# Query parameters that never change a payload (jQuery's cache buster)
+IGNORED_ARGS = frozenset({"_"})
+
+def _compress(body: bytes, encoding: str, fast: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=Config.FAST_BROTLI_QUALITY if fast else Config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.FAST_GZIP_LEVEL if fast else Config.GZIP_LEVEL, mtime=0)
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in header.split(","))
+
+def _splice(head: bytes, body: bytes) -> bytes:
+    # The members of two serialized JSON objects as one object, `head`'s first
+    if body == b"{}":
+        return head
+    if head == b"{}":
+        return body
+    return head[:-1] + b"," + body[1:]
+
+class CachedPayload:
+    # One serialized response body plus its compressed variants, each built on first use
+    __slots__ = ("body", "etag", "_encoded", "_lock")
+
+    def __init__(self, body: bytes, revision: int):
+        self.body = body
+        # Weak, because the gzip and brotli variants share it with the identity body
+        self.etag = f'W/"{revision}-{hashlib.sha1(body).hexdigest()[:16]}"'
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._encoded.get(encoding)
+                if body is None:
+                    body = self._encoded[encoding] = _compress(self.body, encoding)
+        return body
+
+class PayloadCache:
+    # Pre-serialized JSON payloads keyed on endpoint, query and store revision. The data
+    # only changes when the revision does, so between upserts a poll costs a dict lookup,
+    # and a client that already has the payload gets a bodiless 304. Every store counts its
+    # revisions from 1, so entries belong to one store (by path) and switching clears them.
+    def __init__(self, max_entries: int = Config.PAYLOAD_CACHE_MAX_ENTRIES, min_compress_bytes: int = Config.COMPRESS_MIN_BYTES):
+        self.max_entries = max_entries
+        self.min_compress_bytes = min_compress_bytes
+        self._entries: OrderedDict[tuple, CachedPayload] = OrderedDict()
+        self._generation = None  # (store path, revision) the entries were built from
+        self._lock = threading.Lock()
+
+    def get(self, name: str, args, job_store: JobStore, build: Callable[[], object], echo=()) -> CachedPayload:
+        # Keys named in `echo` are per-request counters: they stay out of the cache key and
+        # are dropped from the built payload, so every value of them shares one entry
+        key = (name, tuple(sorted((k, v) for k, v in args.items(multi=True) if k not in IGNORED_ARGS and k not in echo)))
+        revision = job_store.revision
+        generation = (job_store.path, revision)
+        with self._lock:
+            if generation != self._generation:
+                # Everything cached for an older revision (or another store) is stale at once
+                self._entries.clear()
+                self._generation = generation
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                return payload
+
+        data = build()
+        for field in echo:
+            data.pop(field, None)
+        payload = CachedPayload(serialization.dumps(data), revision)
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = payload
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def choose_encoding(self, accept_encoding: str, size: int) -> str | None:
+        if size < self.min_compress_bytes:
+            return None
+        accepted = _accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def response(self, request, name: str, job_store: JobStore, build: Callable[[], object], echo: dict | None = None) -> tuple[bytes, int, dict]:
+        # A (body, status, headers) tuple that Flask and Quart views can both return. `echo`
+        # holds values the client expects back verbatim (DataTables' draw counter); they are
+        # spliced into the cached body, and the ETag covers only the shared part.
+        echo = echo or {}
+        payload = self.get(name, request.args, job_store, build, echo)
+        headers = {"ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("If-None-Match", ""), payload.etag):
+            return b"", 304, headers
+
+        headers["Content-Type"] = JSON_MIMETYPE
+        body = _splice(serialization.dumps(echo), payload.body) if echo else payload.body
+        encoding = self.choose_encoding(request.headers.get("Accept-Encoding", ""), len(body))
+        if encoding is None:
+            return body, 200, headers
+        headers["Content-Encoding"] = encoding
+        if echo:
+            # Differs per request, so there is no stored variant; compressed each time, quickly
+            return _compress(body, encoding, fast=True), 200, headers
+        return payload.encoded(encoding), 200, headers
+
+_payload_cache = None
+
+def get_payload_cache() -> PayloadCache:
+    global _payload_cache
+    if _payload_cache is None:
+        _payload_cache = PayloadCache()
+    return _payload_cache
@@ -0,0 +1,137 @@
+import logging
+import re
+from collections.abc import Callable
+
+from app.services.search import fts_query
+from config import active_config as Config
+
+logger = logging.getLogger(__name__)
+
+_WORDS = re.compile(r"\w+")
+
+def normalize_terms(values: list[str]) -> list[str]:
+    # Drops blanks and case/whitespace variants of the same term, keeping the first spelling
+    seen, terms = set(), []
+    for value in values:
+        term = " ".join(value.split())
+        if term and term.lower() not in seen:
+            seen.add(term.lower())
+            terms.append(term)
+    return terms
+
+def _title_words(title: str) -> tuple[str, ...]:
+    return tuple(word.lower() for word in _WORDS.findall(title))
+
+def _query(query: str, location: str, titles: list[str], merged_queries: int, **extra) -> dict:
+    remote = location.lower() == "remote"
+    return {
+        'query': query,
+        'location': location,
+        'remote': remote,
+        'distance': Config.DEFAULT_DISTANCE if not remote else None,
+        'max_experience': Config.DEFAULT_MAX_EXPERIENCE,
+        'limit': Config.DEFAULT_LIMIT,
+        'titles': titles,  # the requested titles this query covers
+        'merged_queries': merged_queries,  # title x location pairs it replaces; scales its page budget
+        **extra,
+    }
+
+def naive_plan(job_titles: list[str], locations: list[str]) -> list[dict]:
+    # One query per title and location, for sources without a planner
+    return [_query(title, location, [title], 1) for title in job_titles for location in locations]
+
+def plan_adzuna(job_titles: list[str], locations: list[str]) -> list[dict]:
+    # Adzuna's `what` requires all of its words, so a title whose words include every word of
+    # another requested title adds nothing ("Senior Software Developer" next to "Software
+    # Developer"). Titles that differ only in their last word are merged into one query with
+    # the shared words in `what` and the differing ones in `what_or`: "Software Developer" and
+    # "Software Engineer" become what=software, what_or=developer engineer, which matches
+    # exactly the union of the two. `where` takes one location, so locations stay separate.
+    words = {title: _title_words(title) for title in job_titles}
+    kept, kept_sets = [], set()
+    for title in job_titles:
+        title_set = frozenset(words[title])
+        if not title_set or title_set in kept_sets:
+            continue  # no searchable words, or the same words as a title already kept
+        if any(words[other] and set(words[other]) < title_set for other in job_titles):
+            continue
+        kept.append(title)
+        kept_sets.add(title_set)
+
+    groups: dict[frozenset, list[str]] = {}
+    for title in kept:
+        groups.setdefault(frozenset(words[title][:-1]), []).append(title)
+
+    queries = []
+    for titles in groups.values():
+        covered = [
+            title for title in job_titles
+            if any(set(words[kept_title]) <= set(words[title]) for kept_title in titles)
+        ]
+        if len(titles) == 1:
+            what, what_or = titles[0], None
+        else:
+            what = " ".join(words[titles[0]][:-1]) or None
+            what_or = normalize_terms([words[title][-1] for title in titles])
+        for location in locations:
+            queries.append(_query(what, location, covered, len(covered), query_any=what_or))
+    return queries
+
+def plan_usajobs(job_titles: list[str], locations: list[str]) -> list[dict]:
+    # USAJobs takes several semicolon-separated LocationName values (sharing one Radius), and
+    # remote listings come from RemoteIndicator rather than a location, so each title gets
+    # one query for its on-site locations and one for remote. Titles are matched as phrases
+    # and stay one per query.
+    remote = [location for location in locations if location.lower() == "remote"]
+    on_site = [location for location in locations if location.lower() != "remote"]
+    per_query = max(1, Config.USAJOBS_LOCATIONS_PER_QUERY)
+    location_groups = [on_site[i:i + per_query] for i in range(0, len(on_site), per_query)]
+
+    queries = []
+    for title in job_titles:
+        for group in location_groups:
+            queries.append(_query(title, ";".join(group), [title], len(group)))
+        if remote:
+            queries.append(_query(title, remote[0], [title], 1))
+    return queries
+
+SOURCE_PLANNERS: dict[str, Callable[[list[str], list[str]], list[dict]]] = {
+    "Adzuna": plan_adzuna,
+    "USA Jobs": plan_usajobs,
+}
+
+class QueryPlanner:
+    # Turns the requested titles x locations into the fewest upstream requests each source
+    # needs for the same coverage, highest expected yield first
+    def __init__(self, job_store=None):
+        self.job_store = job_store
+
+    def plan(self, source: str, job_titles: list[str], locations: list[str]) -> list[dict]:
+        job_titles, locations = normalize_terms(job_titles), normalize_terms(locations)
+        planner = SOURCE_PLANNERS.get(source, naive_plan)
+        queries = planner(job_titles, locations)
+
+        # Expected yield: listings this source returned for the query's titles before, then
+        # the number of naive queries it replaces; sorting is stable, so ties keep plan order
+        history = {}
+        for query in queries:
+            key = tuple(query['titles'])
+            if key not in history:
+                history[key] = self._stored_listings(source, query['titles'])
+        queries.sort(key=lambda query: (history[tuple(query['titles'])], query['merged_queries']), reverse=True)
+
+        naive = len(job_titles) * len(locations)
+        logger.info(f"Planned {len(queries)} {source} requests for {len(job_titles)} titles x {len(locations)} locations ({naive} unplanned)")
+        return queries
+
+    def _stored_listings(self, source: str, titles: list[str]) -> int:
+        if self.job_store is None or self.job_store.full_text is False:
+            return 0
+        match = fts_query(" OR ".join(titles))
+        if not match:
+            return 0
+        try:
+            return self.job_store.full_text_search(f"job_title : ({match})", 0, 0, source=source)[1]
+        except ValueError as e:
+            logger.warning(f"Could not estimate yield for {titles}: {e}")
+            return 0
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import active_config as Config
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses that mean "slow down", as opposed to a request that is simply wrong
+THROTTLE_STATUSES = frozenset({429, 503})
+
+def parse_retry_after(value: str | None) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+class AdaptiveRateLimiter:
+    # A token bucket caps the request rate; concurrency follows AIMD on top of it:
+    # +1 slot after a full window of successes, halved on every throttle response.
+    # Waits are computed and slept rather than parked on asyncio primitives, so one
+    # limiter can be shared by clients running on different event loops.
+    def __init__(
+        self,
+        source: str,
+        rate: float,
+        burst: int = 1,
+        initial_concurrency: int = 2,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_backoff: float = 60.0,
+    ):
+        self.source = source
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency = max(min_concurrency, min(initial_concurrency, max_concurrency))
+        self.max_backoff = max_backoff
+        self.in_flight = 0
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, source: str) -> "AdaptiveRateLimiter":
+        return cls(source, **Config.RATE_LIMITS.get(source, {"rate": 1.0}))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _try_acquire(self) -> float:
+        # Takes a slot and a token and returns 0, or returns how long to wait before trying again
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self.in_flight >= self.concurrency:
+                return 1.0 / max(self.rate, 1.0) / 2
+            self._refill(now)
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+            self.in_flight += 1
+            return 0.0
+
+    async def acquire(self) -> None:
+        while (wait := self._try_acquire()) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._successes = 0
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            self.throttled += 1
+            self._successes = 0
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+            self._tokens = 0.0
+            # The server's hint pauses every request to this source, not just the one that got it
+            if retry_after is not None:
+                pause = min(retry_after, self.max_backoff)
+                self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        logger.warning(f"{self.source} throttled; concurrency lowered to {self.concurrency}")
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return min(Config.RETRY_BASE_DELAY * 2 ** attempt, self.max_backoff) + random.uniform(0, 1)
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(source: str) -> AdaptiveRateLimiter:
+    # Shared per source, so every client talking to the same API draws from one budget
+    with _rate_limiters_lock:
+        if source not in _rate_limiters:
+            _rate_limiters[source] = AdaptiveRateLimiter.from_config(source)
+        return _rate_limiters[source]
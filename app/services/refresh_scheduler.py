@@ -0,0 +1,178 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.models.job_batch import JobBatch
+from app.services.http_session import SessionPool
+from config import active_config as Config
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class RefreshResult:
+    jobs: JobBatch
+    refreshed_at: datetime
+    duration: float  # seconds the collection run took
+
+class RefreshScheduler:
+    # Keeps one materialized collection result and refreshes it every `interval` seconds.
+    # Refreshes run on a background thread with its own event loop (and its own keep-alive
+    # session pool), so request handlers on any loop or thread read the last result right
+    # away and never wait on the upstream APIs, except for the very first run.
+    def __init__(
+        self,
+        collector_factory,
+        job_titles: list[str] | None = None,
+        locations: list[str] | None = None,
+        interval: float = Config.REFRESH_INTERVAL,
+    ):
+        self.collector_factory = collector_factory  # called with the scheduler's SessionPool
+        self.job_titles = job_titles or Config.DEFAULT_JOB_TITLES
+        self.locations = locations or Config.DEFAULT_LOCATIONS
+        self.interval = interval
+        self.result: RefreshResult | None = None
+        self.last_error: BaseException | None = None
+        self.refreshes = 0
+        self._session_pool = SessionPool()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pending: concurrent.futures.Future | None = None
+        self._periodic: concurrent.futures.Future | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def refreshing(self) -> bool:
+        pending = self._pending
+        return pending is not None and not pending.done()
+
+    @property
+    def stale(self) -> bool:
+        if self.result is None:
+            return True
+        if self.interval <= 0:
+            return False
+        return (datetime.now() - self.result.refreshed_at).total_seconds() >= self.interval
+
+    def start(self, periodic: bool = True) -> None:
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run_loop, name="job-refresh", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            asyncio.run_coroutine_threadsafe(self._session_pool.start(), loop).result()
+            if periodic and self.interval > 0:
+                self._periodic = asyncio.run_coroutine_threadsafe(self._run_periodically(), loop)
+        logger.info(f"Started job refresh scheduler (interval={self.interval}s)")
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            futures = (self._periodic, self._pending)
+            self._loop = self._thread = self._pending = self._periodic = None
+        # Outside the lock: the loop thread may be waiting on it inside _submit()
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        asyncio.run_coroutine_threadsafe(self._session_pool.close(), loop).result(timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+        logger.info("Stopped job refresh scheduler")
+
+    def trigger(self) -> concurrent.futures.Future:
+        # At most one refresh runs at a time; callers asking during a run share it
+        if not self.running:
+            self.start(periodic=False)
+        return self._submit()
+
+    def _submit(self) -> concurrent.futures.Future:
+        with self._lock:
+            if self._loop is None:
+                raise RuntimeError("Refresh scheduler is stopped")
+            if self._pending is None or self._pending.done():
+                self._pending = asyncio.run_coroutine_threadsafe(self._refresh(), self._loop)
+            return self._pending
+
+    async def get(self) -> RefreshResult:
+        # Stale-while-revalidate: the last result is returned immediately and a refresh is
+        # started behind it when it is older than the interval. Only a cold start waits.
+        if self.result is None:
+            return await asyncio.wrap_future(self.trigger())
+        if self.stale:
+            self.trigger()
+        return self.result
+
+    async def _refresh(self) -> RefreshResult:
+        started = time.perf_counter()
+        collector = self.collector_factory(self._session_pool)
+        try:
+            jobs = await collector.async_search_jobs(self.job_titles, self.locations)
+        except Exception as e:
+            # Keep serving the previous result; the next interval tries again
+            self.last_error = e
+            logger.error(f"Job refresh failed: {e}")
+            if self.result is None:
+                raise
+            return self.result
+        self.result = RefreshResult(jobs, datetime.now(), time.perf_counter() - started)
+        self.last_error = None
+        self.refreshes += 1
+        logger.info(f"Refreshed {len(jobs)} jobs in {self.result.duration:.1f}s")
+        return self.result
+
+    async def _run_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wrap_future(self._submit())
+            except Exception:
+                pass  # already logged by _refresh
+            await asyncio.sleep(self.interval)
+
+    def status(self) -> dict:
+        result = self.result
+        return {
+            "refreshed_at": result.refreshed_at.isoformat(timespec="seconds") if result else None,
+            "refresh_duration": round(result.duration, 3) if result else None,
+            "refreshing": self.refreshing,
+            "stale": self.stale,
+            "last_error": str(self.last_error) if self.last_error else None,
+        }
+
+def _default_collector(session_pool: SessionPool):
+    from app.services.api_clients import AdzunaAPIClient, USAJobsAPIClient
+    from app.services.data_collection import JobDataCollector
+    from app.services.job_store import get_job_store
+
+    if Config.ADZUNA_CLIENT is None:
+        Config.ADZUNA_CLIENT = AdzunaAPIClient()
+    if Config.USA_JOBS_CLIENT is None:
+        Config.USA_JOBS_CLIENT = USAJobsAPIClient()
+    return JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT, get_job_store(), session_pool)
+
+_refresh_scheduler = None
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    global _refresh_scheduler
+    if _refresh_scheduler is None:
+        _refresh_scheduler = RefreshScheduler(_default_collector)
+    return _refresh_scheduler
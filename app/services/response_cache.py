@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from app.services import serialization
+from config import active_config as Config
+
+logger = logging.getLogger(__name__)
+
+class OfflineCacheMiss(Exception):
+    pass
+
+class ResponseCache:
+    def __init__(self, path: str, ttls: dict[str, int], max_bytes: int, offline: bool = False):
+        self.path = path
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+        return self._conn
+
+    @staticmethod
+    def make_key(url: str, params: dict) -> str:
+        # Credentials must be stripped by the caller; only the normalized request is hashed
+        normalized = json.dumps([url.rstrip("/"), sorted((str(k), str(v)) for k, v in params.items())])
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, source: str) -> dict | None:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT body, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            body, created_at = row
+            # Offline mode serves whatever we have, however old it is
+            if not self.offline and time.time() - created_at > self.ttls.get(source, 0):
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        return serialization.loads(zlib.decompress(body))
+
+    def set(self, key: str, source: str, data: dict) -> None:
+        body = zlib.compress(serialization.dumps(data))
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, source, body, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, source, body, len(body), now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total_size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} cached responses to stay under {self.max_bytes} bytes")
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            removed = 0
+            for source, ttl in self.ttls.items():
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE source = ? AND created_at < ?", (source, now - ttl)
+                ).rowcount
+            conn.commit()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_response_cache = None
+
+def get_response_cache() -> ResponseCache | None:
+    global _response_cache
+    if not Config.RESPONSE_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            Config.RESPONSE_CACHE_PATH,
+            Config.RESPONSE_CACHE_TTLS,
+            Config.RESPONSE_CACHE_MAX_BYTES,
+            offline=Config.RESPONSE_CACHE_OFFLINE,
+        )
+    return _response_cache
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from itertools import compress
+
+import numpy as np
+
+from app.services.job_store import JobStore, get_job_store
+from config import active_config as Config
+
+# USAJobs RateIntervalCode -> multiplier to a yearly figure. 2087 is OPM's paid hours per year.
+PAY_PERIOD_FACTORS = {
+    "PA": 1.0,  # per annum
+    "PH": 2087.0,  # per hour
+    "PD": 260.0,  # per day
+    "PW": 52.0,  # per week
+    "BW": 26.0,  # bi-weekly
+    "SM": 24.0,  # semi-monthly
+    "PM": 12.0,  # per month
+}
+# Rates that don't translate into a salary (without compensation, fee basis, ...)
+UNPAID_PERIODS = {"WC", "FB", "ST"}
+
+SALARY_DIMENSIONS = {"title": "job_title", "category": "job_category", "location": "job_location", "source": "source"}
+
+def annualize_range(low: float | None, high: float | None, period: str | None = None) -> tuple[float | None, float | None]:
+    # One listing's range in dollars per year. Without a stated period (Adzuna), amounts
+    # below Config.HOURLY_SALARY_CEILING can only be hourly rates.
+    if period in UNPAID_PERIODS:
+        return None, None
+    factor = PAY_PERIOD_FACTORS.get(period)
+    if factor is None:
+        reference = high if high is not None else low
+        factor = PAY_PERIOD_FACTORS["PH"] if reference is not None and reference < Config.HOURLY_SALARY_CEILING else 1.0
+    return (
+        low * factor if low is not None else None,
+        high * factor if high is not None else None,
+    )
+
+def annualize(values: np.ndarray) -> np.ndarray:
+    # annualize_range for whole columns of stored salaries, which are already yearly apart
+    # from hourly rates saved before periods were normalized at ingest
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(values < Config.HOURLY_SALARY_CEILING, values * PAY_PERIOD_FACTORS["PH"], values)
+
+def salary_midpoints(low, high) -> np.ndarray:
+    # One yearly figure per listing: the middle of its range, or whichever bound it has; NaN if none
+    low = annualize(low)
+    high = annualize(high)
+    return np.where(np.isnan(low), high, np.where(np.isnan(high), low, (low + high) / 2))
+
+def factorize(values: list) -> tuple[list[str], np.ndarray]:
+    # Distinct values in first-seen order and each value's index into them; missing -> "N/A"
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault("N/A" if value is None else value, len(index)) for value in values), np.int64, len(values)
+    )
+    return list(index), codes
+
+def grouped_quantiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, quantiles) -> np.ndarray:
+    # Exact quantiles (NumPy's default linear interpolation) of every group at once, given
+    # values sorted within contiguous groups. Returns one row per group, one column per quantile.
+    positions = (counts[:, None] - 1) * np.asarray(quantiles, dtype=np.float64)[None, :]
+    below = np.floor(positions).astype(np.int64)
+    above = np.ceil(positions).astype(np.int64)
+    lower = sorted_values[starts[:, None] + below]
+    upper = sorted_values[starts[:, None] + above]
+    return lower + (upper - lower) * (positions - below)
+
+def grouped_histograms(values: np.ndarray, codes: np.ndarray, n_groups: int, bin_width: float, n_bins: int) -> np.ndarray:
+    # Fixed-width bins from zero; everything past the last edge lands in the last bin
+    bins = np.clip((values // bin_width).astype(np.int64), 0, n_bins - 1)
+    return np.bincount(codes * n_bins + bins, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+
+@dataclass(frozen=True)
+class SalaryBreakdown:
+    # Per-group salary distribution along one dimension, groups ordered by listing count
+    dimension: str
+    groups: list[str]
+    counts: np.ndarray
+    means: np.ndarray
+    quantiles: np.ndarray  # groups x Config.SALARY_QUANTILES
+    histograms: np.ndarray  # groups x bins
+    bin_width: float
+
+    def to_dict(self, limit: int | None = None, min_count: int = 1) -> dict:
+        keep = np.flatnonzero(self.counts >= min_count)[:limit]
+        labels = [f"p{round(q * 100)}" for q in Config.SALARY_QUANTILES]
+        return {
+            "dimension": self.dimension,
+            "bin_width": self.bin_width,
+            "bin_edges": (np.arange(self.histograms.shape[1] + 1) * self.bin_width).tolist(),
+            "groups": [
+                {
+                    "value": self.groups[i],
+                    "count": int(self.counts[i]),
+                    "mean": float(self.means[i]),
+                    **dict(zip(labels, self.quantiles[i].tolist())),
+                    "histogram": self.histograms[i].tolist(),
+                }
+                for i in keep
+            ],
+        }
+
+def salary_breakdowns(
+    columns: dict[str, list],
+    dimensions: dict[str, str] = SALARY_DIMENSIONS,
+    bin_width: float = Config.SALARY_BIN_WIDTH,
+    max_salary: float = Config.SALARY_HISTOGRAM_MAX,
+) -> dict[str, SalaryBreakdown]:
+    # Listings without a salary are dropped and the rest sorted by salary once; every
+    # dimension then costs one factorize, one stable integer sort (which keeps each group
+    # in salary order) and a few whole-array operations, whatever the number of groups
+    salaries = salary_midpoints(columns["salary_low"], columns["salary_high"])
+    has_salary = ~np.isnan(salaries)
+    salaries = salaries[has_salary]
+    by_salary = np.argsort(salaries, kind="stable")
+    n_bins = max(int(np.ceil(max_salary / bin_width)), 1)
+
+    breakdowns = {}
+    for dimension, column in dimensions.items():
+        groups, codes = factorize(list(compress(columns[column], has_salary)))
+        groups = np.asarray(groups, dtype=object)
+        counts = np.bincount(codes, minlength=len(groups))
+        order = by_salary[np.argsort(codes[by_salary], kind="stable")]
+        starts = np.cumsum(counts) - counts
+
+        by_size = np.argsort(-counts, kind="stable")
+        quantiles = grouped_quantiles(salaries[order], starts, counts, Config.SALARY_QUANTILES)
+        histograms = grouped_histograms(salaries, codes, len(groups), bin_width, n_bins)
+        means = np.bincount(codes, weights=salaries, minlength=len(groups)) / np.maximum(counts, 1)
+        breakdowns[dimension] = SalaryBreakdown(
+            dimension=dimension,
+            groups=groups[by_size].tolist(),
+            counts=counts[by_size],
+            means=means[by_size],
+            quantiles=quantiles[by_size],
+            histograms=histograms[by_size],
+            bin_width=bin_width,
+        )
+    return breakdowns
+
+class SalaryAnalytics:
+    # Breakdowns of the job store, recomputed only when its revision changes
+    def __init__(self, job_store: JobStore | None = None):
+        self.job_store = job_store or get_job_store()
+        self._revision = None
+        self._breakdowns: dict[str, SalaryBreakdown] = {}
+        self._lock = threading.Lock()
+
+    def breakdowns(self) -> dict[str, SalaryBreakdown]:
+        with self._lock:
+            revision = self.job_store.revision
+            if revision != self._revision:
+                columns = self.job_store.columns(list(SALARY_DIMENSIONS.values()) + ["salary_low", "salary_high"])
+                self._breakdowns = salary_breakdowns(columns)
+                self._revision = revision
+            return self._breakdowns
+
+    def breakdown(self, dimension: str) -> SalaryBreakdown:
+        if dimension not in SALARY_DIMENSIONS:
+            raise ValueError(f"dimension must be one of {sorted(SALARY_DIMENSIONS)}")
+        return self.breakdowns()[dimension]
+
+_salary_analytics = None
+
+def get_salary_analytics() -> SalaryAnalytics:
+    global _salary_analytics
+    if _salary_analytics is None:
+        _salary_analytics = SalaryAnalytics()
+    return _salary_analytics
@@ -0,0 +1,68 @@
+import re
+
+from app.services.job_store import JobStore
+from app.utils import format_salary_range
+from config import active_config as Config
+
+# A "quoted phrase" (possibly -"negated") or a single whitespace-separated term
+_QUERY_PART = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+_WORD = re.compile(r"\w+")
+
+def _phrase(words: list[str]) -> str:
+    return '"' + " ".join(words) + '"'
+
+def fts_query(text: str) -> str:
+    # User input -> FTS5 expression. "quoted words" match as a phrase, a trailing * makes a
+    # prefix query (react* -> react, reactjs), uppercase OR passes through, NOT x or -x
+    # excludes x wherever it appears, and other terms must all match. Exclusions go after
+    # everything else, since FTS5's NOT needs something to subtract from; with nothing
+    # else to match the query is empty. Punctuation never reaches FTS5, so no input is a
+    # syntax error: "c++" searches for c, "node.js" for the phrase "node js".
+    parts, excluded = [], []
+    negate = False
+    for match in _QUERY_PART.finditer(text):
+        minus, phrase, term = match.groups()
+        if term == "NOT":
+            negate = True
+            continue
+        if term == "OR":
+            if parts and parts[-1] != "OR":
+                parts.append(term)
+            continue
+        if minus or (phrase is None and term.startswith("-")):
+            negate = True
+            term = term[1:] if phrase is None else term
+        words = _WORD.findall(phrase if phrase is not None else term)
+        if not words:
+            continue
+        prefix = phrase is None and term.endswith("*")
+        (excluded if negate else parts).append(_phrase(words) + ("*" if prefix else ""))
+        negate = False
+    while parts and parts[-1] == "OR":
+        parts.pop()
+    if not parts:
+        return ""
+    query = " ".join(parts)
+    if excluded:
+        query = (f"({query})" if len(parts) > 1 else query) + "".join(f" NOT {term}" for term in excluded)
+    return query
+
+def _to_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def search_response(job_store: JobStore, args, **filters) -> dict:
+    # The /api/search payload: a page of listings ranked by relevance to ?q=
+    query = args.get("q", "").strip()
+    start = max(_to_int(args.get("start"), 0), 0)
+    length = _to_int(args.get("length"), Config.SEARCH_DEFAULT_LENGTH)
+    if length < 0 or length > Config.SEARCH_MAX_LENGTH:
+        length = Config.SEARCH_MAX_LENGTH
+
+    match = fts_query(query)
+    results, total = job_store.full_text_search(match, start, length, **filters) if match else ([], 0)
+    for record in results:
+        record["salary_range"] = format_salary_range(record["salary_low"], record["salary_high"])
+    return {"query": query, "start": start, "length": length, "total": total, "results": results}
@@ -0,0 +1,36 @@
+import json
+from collections.abc import AsyncIterator, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib codec produces the same JSON, just slower
+    orjson = None
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+def loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj) -> bytes:
+    # NaN has no JSON form: orjson writes null, the fallback rejects it rather than emit invalid JSON
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def wants_ndjson(request) -> bool:
+    # Opt-in per request, with ?format=ndjson or an Accept header asking for it
+    return request.args.get("format") == "ndjson" or NDJSON_MIMETYPE in request.headers.get("Accept", "")
+
+def iter_ndjson(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    # One network write per chunk of records; a record is never split across writes
+    for records in chunks:
+        if records:
+            yield b"".join(dumps(record) + b"\n" for record in records)
+
+async def aiter_ndjson(chunks: Iterable[list[dict]]) -> AsyncIterator[bytes]:
+    # Same as iter_ndjson for async servers; each chunk is built between awaits, so a long
+    # stream doesn't hold the event loop
+    for body in iter_ndjson(chunks):
+        yield body
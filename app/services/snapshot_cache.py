@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.services.metrics import record_listings, time_stage
+from app.services.snapshot_io import SNAPSHOT_EXTENSIONS, read_snapshot, snapshot_stem
+from config import active_config as Config
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Snapshot:
+    path: str
+    version: str
+    df: pd.DataFrame
+    titles: list[str]
+    categories: list[str]
+    category_stats: list[dict]
+
+# Holds the newest snapshot for the whole process. The directory is polled at most
+# once per poll_interval and a reload swaps the Snapshot reference in a single
+# assignment, so concurrent readers never see a half-built one.
+class SnapshotCache:
+    def __init__(self, directory: str, poll_interval: float = Config.SNAPSHOT_POLL_INTERVAL):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._snapshot = None
+        self._dir_mtime = None
+        self._latest_path = None
+        self._file_signature = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> Snapshot | None:
+        if time.monotonic() - self._checked_at < self.poll_interval:
+            return self._snapshot
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.poll_interval:
+                try:
+                    self._refresh()
+                except Exception as e:
+                    logger.error(f"Error refreshing snapshot from {self.directory}: {e}")
+                self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._checked_at = float("-inf")
+
+    def _refresh(self) -> None:
+        try:
+            dir_mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        # Only list the directory when an entry was added, removed or renamed
+        if dir_mtime != self._dir_mtime or self._latest_path is None:
+            self._latest_path = self._find_latest_file()
+            self._dir_mtime = dir_mtime
+        if self._latest_path is None:
+            return
+
+        stat = os.stat(self._latest_path)
+        file_signature = (self._latest_path, stat.st_mtime_ns, stat.st_size)
+        if file_signature == self._file_signature:
+            return
+
+        self._snapshot = self._load(self._latest_path, f"{os.path.basename(self._latest_path)}:{stat.st_mtime_ns}")
+        self._file_signature = file_signature
+
+    def _find_latest_file(self) -> str | None:
+        snapshot_files = [f for f in os.listdir(self.directory) if f.endswith(SNAPSHOT_EXTENSIONS)]
+        if not snapshot_files:
+            logger.info(f"No snapshot files found in {self.directory}")
+            return None
+        latest_file = max(snapshot_files, key=lambda x: os.path.getctime(os.path.join(self.directory, x)))
+
+        # A run may write both formats; the typed Parquet file is much cheaper to load
+        parquet_file = f"{snapshot_stem(latest_file)}.parquet"
+        if parquet_file in snapshot_files:
+            latest_file = parquet_file
+        return os.path.join(self.directory, latest_file)
+
+    def _load(self, path: str, version: str) -> Snapshot:
+        logger.info(f"Loading snapshot: {path}")
+        with time_stage("snapshot_load"):
+            df = read_snapshot(path)
+        record_listings("snapshot_load", len(df), len(df))
+
+        stats = df['job_category'].value_counts().reset_index()
+        stats.columns = ['category', 'count']
+        stats = stats[stats['count'] > 0]  # categorical columns also count unused categories
+
+        return Snapshot(
+            path=path,
+            version=version,
+            df=df,
+            titles=sorted(df['job_title'].dropna().unique().tolist()),
+            categories=sorted(df['job_category'].dropna().unique().tolist()),
+            category_stats=stats.to_dict('records'),
+        )
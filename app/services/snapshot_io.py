@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from app.models.job_batch import as_job_batch
+from app.services.job_store import JOB_KEY_COLUMNS, job_keys
+from config import active_config as Config
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# pandas and pyarrow are imported where they're used, so the viewer and API clients
+# can import the snapshot helpers without paying for either at startup.
+
+# Explicit column types for snapshots, so readers never re-infer them
+SNAPSHOT_SCHEMA = {
+    "job_title": "object",
+    "company_name": "category",
+    "job_location": "category",
+    "job_description": "object",
+    "salary_low": "float64",
+    "salary_high": "float64",
+    "source": "category",
+    "application_url": "object",
+    "job_category": "category",
+    "job_category_code": "category",
+    "experience_min": "float64",
+    "experience_max": "float64",
+}
+TIMESTAMP_COLUMN = "timestamp"
+SNAPSHOT_EXTENSIONS = (".parquet", ".csv")
+
+def apply_snapshot_schema(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for column, dtype in SNAPSHOT_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        if dtype == "category":
+            df[column] = df[column].astype("string").astype("category")
+        else:
+            df[column] = df[column].astype(dtype)
+    if TIMESTAMP_COLUMN in df.columns:
+        import pandas as pd
+
+        df[TIMESTAMP_COLUMN] = pd.to_datetime(df[TIMESTAMP_COLUMN])
+    return df
+
+def arrow_schema() -> pa.Schema:
+    import pyarrow as pa
+
+    arrow_types = {
+        "object": pa.string(),
+        "float64": pa.float64(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+    }
+    fields = [pa.field(column, arrow_types[dtype]) for column, dtype in SNAPSHOT_SCHEMA.items()]
+    return pa.schema(fields + [pa.field(TIMESTAMP_COLUMN, pa.timestamp("us"))])
+
+def _is_parquet(path: str, file_format: str | None) -> bool:
+    # The format follows the extension unless given, as for ".partial" files
+    return file_format == "parquet" if file_format else path.endswith(".parquet")
+
+def write_snapshot(df: pd.DataFrame, path: str, compression: str | None = None, file_format: str | None = None) -> None:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = apply_snapshot_schema(df)
+    if _is_parquet(path, file_format):
+        df.to_parquet(path, index=False, compression=compression or Config.SNAPSHOT_COMPRESSION)
+    else:
+        df.to_csv(path, index=False, compression=compression)
+
+def read_snapshot(
+    path: str, columns: list[str] | None = None, filters: list[tuple] | None = None, file_format: str | None = None
+) -> pd.DataFrame:
+    import pandas as pd
+
+    if _is_parquet(path, file_format):
+        # Column pruning and filters are pushed down into the Parquet reader
+        return pd.read_parquet(path, columns=columns, filters=filters)
+
+    # CSV exports carry no types, so codes like "0854" need to be read as strings,
+    # and only empty cells are missing: "N/A" is a real placeholder value in listings
+    dtypes = {column: "string" for column, dtype in SNAPSHOT_SCHEMA.items() if dtype == "category"}
+    df = apply_snapshot_schema(pd.read_csv(path, usecols=columns, dtype=dtypes, keep_default_na=False, na_values=[""]))
+    for column, op, value in filters or []:
+        if op == "in":
+            df = df[df[column].isin(value)]
+        elif op == "==":
+            df = df[df[column] == value]
+        else:
+            raise ValueError(f"Unsupported snapshot filter operator: {op}")
+    return df
+
+def snapshot_columns(path: str) -> list[str]:
+    # Reads only the schema (Parquet) or header line (CSV), not the data
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return [name for name in pq.read_schema(path).names if not name.startswith("__")]
+    import pandas as pd
+
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+def snapshot_stem(filename: str) -> str:
+    for extension in SNAPSHOT_EXTENSIONS:
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+def list_snapshot_files(directory: str) -> list[str]:
+    # Every snapshot in the directory, oldest first; a run that wrote both formats
+    # is listed once, by its typed Parquet file
+    try:
+        filenames = [f for f in os.listdir(directory) if f.endswith(SNAPSHOT_EXTENSIONS)]
+    except FileNotFoundError:
+        return []
+    parquet_stems = {snapshot_stem(f) for f in filenames if f.endswith(".parquet")}
+    filenames = [f for f in filenames if f.endswith(".parquet") or snapshot_stem(f) not in parquet_stems]
+    paths = [os.path.join(directory, f) for f in filenames]
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), path))
+
+class SnapshotWriter:
+    # Appends listings to a snapshot in chunks while a collection is still running.
+    # Parquet chunks become row groups; CSV chunks are appended after a single header.
+    # Chunks go to a ".partial" file that is only renamed into place on close, so
+    # snapshot readers never pick up a half-written file; abort discards it instead.
+    # Listings passed to discard are left out, even if they were already written.
+    def __init__(self, path: str, chunk_rows: int = Config.SNAPSHOT_CHUNK_ROWS, compression: str | None = None):
+        self.path = path
+        self.partial_path = f"{path}.partial"
+        self.chunk_rows = chunk_rows
+        self.compression = compression or Config.SNAPSHOT_COMPRESSION
+        self.timestamp = datetime.now()
+        self.rows_written = 0
+        self._buffer = []
+        self._buffered_rows = 0
+        self._parquet_writer = None
+        self._discarded: set[str] = set()
+        self._rewrite = False  # a discarded listing may already be in the partial file
+
+    def write(self, jobs) -> None:
+        frame = as_job_batch(jobs).to_frame()
+        self._buffer.append(frame)
+        self._buffered_rows += len(frame)
+        if self._buffered_rows >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffered_rows:
+            return
+        df = pd.concat(self._buffer, ignore_index=True)
+        self._buffer = []
+        self._buffered_rows = 0
+        if self._discarded:
+            df = self._without_discarded(df)
+            if df.empty:
+                return
+        df[TIMESTAMP_COLUMN] = self.timestamp
+        df = apply_snapshot_schema(df)
+
+        if self.rows_written == 0 and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if self.path.endswith(".parquet"):
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.partial_path, arrow_schema(), compression=self.compression)
+            self._parquet_writer.write_table(pa.Table.from_pandas(df, schema=arrow_schema(), preserve_index=False))
+        else:
+            df.to_csv(self.partial_path, index=False, mode="w" if self.rows_written == 0 else "a", header=self.rows_written == 0)
+        self.rows_written += len(df)
+
+    def discard(self, jobs) -> None:
+        # Listings written earlier that a preferred near-duplicate has since replaced
+        batch = as_job_batch(jobs)
+        self._discarded.update(job_keys({column: batch.column(column) for column in JOB_KEY_COLUMNS}))
+        if self.rows_written:
+            self._rewrite = True
+
+    def _without_discarded(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[[key not in self._discarded for key in job_keys(df)]].reset_index(drop=True)
+
+    def close(self) -> None:
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._rewrite:
+            # Only when a replaced listing was flushed before it was replaced; the partial
+            # file is read back and written again without it
+            file_format = "parquet" if self.path.endswith(".parquet") else "csv"
+            df = self._without_discarded(read_snapshot(self.partial_path, file_format=file_format))
+            self.rows_written = len(df)
+            if df.empty:
+                os.remove(self.partial_path)
+            else:
+                compression = self.compression if file_format == "parquet" else None
+                write_snapshot(df, self.partial_path, compression, file_format=file_format)
+            self._rewrite = False
+        if self.rows_written:
+            os.replace(self.partial_path, self.path)
+            logger.info(f"Snapshot saved to {self.path} ({self.rows_written} rows)")
+
+    def abort(self) -> None:
+        # For a collection that failed: nothing of it replaces or joins the snapshots
+        self._buffer = []
+        self._buffered_rows = 0
+        self._rewrite = False
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+        if self.rows_written:
+            logger.warning(f"Snapshot {self.path} discarded ({self.rows_written} rows written)")
+            self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
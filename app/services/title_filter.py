@@ -0,0 +1,79 @@
+import logging
+import re
+from collections import Counter
+
+from app.models.job_batch import JobBatch
+from app.models.job_listing import JobListing
+from config import active_config as Config
+
+logger = logging.getLogger(__name__)
+
+def _compile_keywords(keywords: list[str]) -> re.Pattern | None:
+    if not keywords:
+        return None
+    # Longest first so "senior engineer" wins over "senior"; whitespace inside phrases is flexible
+    alternatives = sorted({keyword.strip().lower() for keyword in keywords if keyword.strip()}, key=len, reverse=True)
+    body = "|".join(r"\s+".join(re.escape(word) for word in keyword.split()) for keyword in alternatives)
+    # Word boundaries on both sides: "2" matches "Engineer 2" but not "Web2", "sr" matches "Sr." but not "Transport"
+    return re.compile(rf"(?<![^\W_])(?:{body})(?![^\W_])", re.IGNORECASE)
+
+class TitleFilter:
+    def __init__(
+        self,
+        exclude_keywords: list[str] | None = None,
+        include_keywords: list[str] | None = None,
+        category_codes: set[str] | None = None,
+    ):
+        self.exclude_pattern = _compile_keywords(exclude_keywords or [])
+        self.include_pattern = _compile_keywords(include_keywords or [])
+        self.category_codes = frozenset(category_codes) if category_codes is not None else None
+        self.hits = Counter()
+
+    @classmethod
+    def from_config(cls) -> "TitleFilter":
+        return cls(
+            exclude_keywords=Config.TITLE_EXCLUDE_KEYWORDS,
+            include_keywords=Config.TITLE_INCLUDE_KEYWORDS,
+            category_codes=Config.RELEVANT_CATEGORY_CODES,
+        )
+
+    def rejection_reason(self, title: str, category_code: str) -> str | None:
+        if self.category_codes is not None and category_code not in self.category_codes:
+            return f"category:{category_code}"
+        if self.exclude_pattern is not None:
+            match = self.exclude_pattern.search(title)
+            if match:
+                return f"exclude:{' '.join(match.group(0).lower().split())}"
+        if self.include_pattern is not None and not self.include_pattern.search(title):
+            return "include:no_match"
+        return None
+
+    def _kept_indices(self, titles, category_codes) -> list[int]:
+        kept = []
+        hits = Counter()
+        for index, (title, category_code) in enumerate(zip(titles, category_codes)):
+            reason = self.rejection_reason(title, category_code)
+            if reason is None:
+                kept.append(index)
+            else:
+                hits[reason] += 1
+        self.hits.update(hits)
+        if hits:
+            logger.debug(f"Title filter hits: {dict(hits.most_common())}")
+        return kept
+
+    def filter(self, job_listings: list[JobListing]) -> list[JobListing]:
+        kept = self._kept_indices((job.job_title for job in job_listings), (job.job_category_code for job in job_listings))
+        return [job_listings[index] for index in kept]
+
+    def filter_batch(self, batch: JobBatch) -> JobBatch:
+        kept = self._kept_indices(batch.column("job_title"), batch.column("job_category_code"))
+        return batch if len(kept) == len(batch) else batch.take(kept)
+
+_title_filter = None
+
+def get_title_filter() -> TitleFilter:
+    global _title_filter
+    if _title_filter is None:
+        _title_filter = TitleFilter.from_config()
+    return _title_filter
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from app.services.job_store import job_key
+from app.services.snapshot_io import TIMESTAMP_COLUMN, list_snapshot_files, read_snapshot, snapshot_columns
+from config import active_config as Config
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TREND_DIMENSIONS = {"title": "job_title", "category": "job_category"}
+_SNAPSHOT_COLUMNS = [
+    "job_title", "company_name", "job_location", "source", "job_category", "salary_low", "salary_high", TIMESTAMP_COLUMN,
+]
+
+# Trends are kept as aggregates that only ever grow: each new snapshot adds its
+# counts to per-day rows, so nothing already processed is read again. Listings are
+# counted once per day and once ever (for hiring velocity), whichever snapshot of
+# that day they show up in, which also makes re-processing a snapshot harmless.
+class TrendStore:
+    def __init__(self, path: str, salary_bin: int = Config.TREND_SALARY_BIN):
+        self.path = path
+        self.salary_bin = salary_bin
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS processed_snapshots (
+                path TEXT PRIMARY KEY, signature TEXT NOT NULL, rows INTEGER NOT NULL, processed_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS daily_seen (day TEXT NOT NULL, job_key TEXT NOT NULL, PRIMARY KEY (day, job_key));
+            CREATE TABLE IF NOT EXISTS first_seen (job_key TEXT PRIMARY KEY, day TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS daily_postings (
+                day TEXT NOT NULL, dimension TEXT NOT NULL, value TEXT NOT NULL, postings INTEGER NOT NULL,
+                PRIMARY KEY (dimension, value, day)
+            );
+            CREATE TABLE IF NOT EXISTS daily_salary_bins (
+                day TEXT NOT NULL, category TEXT NOT NULL, bin INTEGER NOT NULL, postings INTEGER NOT NULL,
+                PRIMARY KEY (day, category, bin)
+            );
+            CREATE TABLE IF NOT EXISTS daily_company_hires (
+                day TEXT NOT NULL, company TEXT NOT NULL, new_postings INTEGER NOT NULL,
+                PRIMARY KEY (company, day)
+            );
+            CREATE INDEX IF NOT EXISTS idx_daily_postings_day ON daily_postings (day);
+            CREATE INDEX IF NOT EXISTS idx_daily_company_hires_day ON daily_company_hires (day);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            """
+        )
+        conn.commit()
+
+    @property
+    def revision(self) -> int:
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return row["value"] if row else 0
+
+    @staticmethod
+    def _signature(path: str) -> str:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def update_from_directory(self, directory: str) -> int:
+        # Only snapshots that are new (or were rewritten) since the last update are read
+        with self._lock:
+            processed = {
+                row["path"]: row["signature"]
+                for row in self._connect().execute("SELECT path, signature FROM processed_snapshots")
+            }
+        added = 0
+        for path in list_snapshot_files(directory):
+            signature = self._signature(path)
+            if processed.get(path) == signature:
+                continue
+            try:
+                # Older snapshots may predate some columns (e.g. the timestamp)
+                available = set(snapshot_columns(path))
+                columns = [column for column in _SNAPSHOT_COLUMNS if column in available]
+                added += self.add_snapshot(read_snapshot(path, columns=columns), path, signature)
+            except Exception as e:
+                logger.error(f"Error adding snapshot {path} to trends: {e}")
+        return added
+
+    def add_snapshot(self, df: pd.DataFrame, path: str, signature: str | None = None) -> int:
+        import numpy as np
+        import pandas as pd
+
+        df = df.copy()
+        if TIMESTAMP_COLUMN in df.columns:
+            df["day"] = pd.to_datetime(df[TIMESTAMP_COLUMN]).dt.strftime("%Y-%m-%d")
+        else:
+            df["day"] = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+        for column in ("job_title", "company_name", "job_location", "source", "job_category"):
+            if column not in df.columns:
+                df[column] = "N/A"
+            df[column] = df[column].astype(object).where(df[column].notna(), "N/A").astype(str)
+        for column in ("salary_low", "salary_high"):
+            if column not in df.columns:
+                df[column] = np.nan
+        df["job_key"] = [
+            job_key({"job_title": title, "company_name": company, "job_location": location, "source": source})
+            for title, company, location, source in zip(df["job_title"], df["company_name"], df["job_location"], df["source"])
+        ]
+        df = df.drop_duplicates(["day", "job_key"])
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (day TEXT, job_key TEXT)")
+            conn.execute("DELETE FROM incoming")
+            conn.executemany("INSERT INTO incoming VALUES (?, ?)", zip(df["day"], df["job_key"]))
+            unseen_today = {
+                (row[0], row[1]) for row in conn.execute(
+                    "SELECT day, job_key FROM incoming i WHERE NOT EXISTS "
+                    "(SELECT 1 FROM daily_seen s WHERE s.day = i.day AND s.job_key = i.job_key)"
+                )
+            }
+            unseen_ever = {
+                row[0] for row in conn.execute(
+                    "SELECT DISTINCT job_key FROM incoming i WHERE NOT EXISTS (SELECT 1 FROM first_seen f WHERE f.job_key = i.job_key)"
+                )
+            }
+
+            new_today = df[[(day, key) in unseen_today for day, key in zip(df["day"], df["job_key"])]]
+            # The earliest day wins when a snapshot spans several days
+            new_ever = new_today[new_today["job_key"].isin(unseen_ever)].sort_values("day").drop_duplicates("job_key")
+
+            for dimension, column in TREND_DIMENSIONS.items():
+                counts = new_today.groupby(["day", column]).size()
+                conn.executemany(
+                    "INSERT INTO daily_postings (day, dimension, value, postings) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (dimension, value, day) DO UPDATE SET postings = postings + excluded.postings",
+                    [(day, dimension, value, int(count)) for (day, value), count in counts.items()],
+                )
+
+            salaried = new_today[new_today["salary_low"].notna() | new_today["salary_high"].notna()]
+            midpoints = salaried[["salary_low", "salary_high"]].mean(axis=1)
+            bins = np.floor(midpoints.to_numpy() / self.salary_bin).astype(np.int64)
+            counts = salaried.assign(bin=bins).groupby(["day", "job_category", "bin"]).size()
+            conn.executemany(
+                "INSERT INTO daily_salary_bins (day, category, bin, postings) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (day, category, bin) DO UPDATE SET postings = postings + excluded.postings",
+                [(day, category, int(salary_bin), int(count)) for (day, category, salary_bin), count in counts.items()],
+            )
+
+            counts = new_ever.groupby(["day", "company_name"]).size()
+            conn.executemany(
+                "INSERT INTO daily_company_hires (day, company, new_postings) VALUES (?, ?, ?) "
+                "ON CONFLICT (company, day) DO UPDATE SET new_postings = new_postings + excluded.new_postings",
+                [(day, company, int(count)) for (day, company), count in counts.items()],
+            )
+
+            conn.executemany("INSERT INTO daily_seen (day, job_key) VALUES (?, ?)", sorted(unseen_today))
+            conn.executemany("INSERT INTO first_seen (job_key, day) VALUES (?, ?)", zip(new_ever["job_key"], new_ever["day"]))
+            conn.execute(
+                "INSERT INTO processed_snapshots (path, signature, rows, processed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET signature = excluded.signature, rows = excluded.rows, processed_at = excluded.processed_at",
+                (path, signature or self._signature(path), len(df), datetime.now().isoformat(timespec="seconds")),
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('revision', 1) ON CONFLICT(key) DO UPDATE SET value = value + 1"
+            )
+            conn.commit()
+        logger.info(f"Added {len(new_today)} daily postings from {path} to trends")
+        return len(new_today)
+
+    @staticmethod
+    def _day_range(start: str | None, end: str | None) -> tuple[str, list]:
+        clauses, params = [], []
+        if start:
+            clauses.append("day >= ?")
+            params.append(start)
+        if end:
+            clauses.append("day <= ?")
+            params.append(end)
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    def postings(self, dimension: str = "category", values: list[str] | None = None, start: str | None = None, end: str | None = None) -> list[dict]:
+        if dimension not in TREND_DIMENSIONS:
+            raise ValueError(f"Unknown trend dimension: {dimension}")
+        day_clause, params = self._day_range(start, end)
+        value_clause = ""
+        if values:
+            value_clause = f" AND value IN ({', '.join('?' for _ in values)})"
+            params += list(values)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT day, value, postings FROM daily_postings WHERE dimension = ?{day_clause}{value_clause} ORDER BY day, value",
+                [dimension] + params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def salary_drift(self, category: str | None = None, start: str | None = None, end: str | None = None) -> list[dict]:
+        # Daily median of salary midpoints, read off the merged histogram (accurate to one bin)
+        day_clause, params = self._day_range(start, end)
+        if category is not None:
+            day_clause += " AND category = ?"
+            params.append(category)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT day, bin, SUM(postings) AS postings FROM daily_salary_bins WHERE 1 = 1{day_clause} "
+                "GROUP BY day, bin ORDER BY day, bin",
+                params,
+            ).fetchall()
+
+        histograms: dict[str, list[tuple[int, int]]] = {}
+        for row in rows:
+            histograms.setdefault(row["day"], []).append((row["bin"], row["postings"]))
+        drift, previous = [], None
+        for day, histogram in histograms.items():
+            total = sum(count for _, count in histogram)
+            running = 0
+            for salary_bin, count in histogram:
+                running += count
+                if running * 2 >= total:
+                    break
+            median = (salary_bin + 0.5) * self.salary_bin
+            drift.append({
+                "day": day,
+                "median_salary": median,
+                "postings": total,
+                "change": None if previous is None else median - previous,
+            })
+            previous = median
+        return drift
+
+    def hiring_velocity(self, window_days: int = 7, limit: int = Config.TOP_N_RESULTS, as_of: str | None = None) -> list[dict]:
+        # New postings per day over the last window, compared with the window before it
+        with self._lock:
+            conn = self._connect()
+            if as_of is None:
+                as_of = conn.execute("SELECT MAX(day) FROM daily_company_hires").fetchone()[0]
+            if as_of is None:
+                return []
+            end = date.fromisoformat(as_of)
+            window_start = (end - timedelta(days=window_days - 1)).isoformat()
+            previous_start = (end - timedelta(days=2 * window_days - 1)).isoformat()
+            rows = conn.execute(
+                """
+                SELECT company,
+                       SUM(CASE WHEN day >= ? THEN new_postings ELSE 0 END) AS current,
+                       SUM(CASE WHEN day < ? THEN new_postings ELSE 0 END) AS previous
+                FROM daily_company_hires
+                WHERE day >= ? AND day <= ?
+                GROUP BY company
+                HAVING current > 0
+                ORDER BY current DESC, company
+                LIMIT ?
+                """,
+                (window_start, window_start, previous_start, as_of, limit),
+            ).fetchall()
+        return [
+            {
+                "company": row["company"],
+                "new_postings": row["current"],
+                "per_day": row["current"] / window_days,
+                "previous_new_postings": row["previous"],
+                "change": row["current"] - row["previous"],
+            }
+            for row in rows
+        ]
+
+    def days(self) -> list[str]:
+        with self._lock:
+            rows = self._connect().execute("SELECT DISTINCT day FROM daily_postings ORDER BY day").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_trend_store = None
+
+def get_trend_store() -> TrendStore:
+    global _trend_store
+    if _trend_store is None:
+        _trend_store = TrendStore(Config.TREND_STORE_PATH)
+    return _trend_store
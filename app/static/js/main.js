@@ -5,6 +5,9 @@ document.addEventListener("DOMContentLoaded", function() {
     // Initialize DataTable
     function initializeDataTable() {
         table = $("#jobTable").DataTable({
+            serverSide: true,
+            processing: true,
+            searchDelay: 400,
             ajax: {
                 url: "/api/jobs",
                 dataSrc: "data",
@@ -21,7 +24,7 @@ document.addEventListener("DOMContentLoaded", function() {
                 { data: "job_title" },
                 { data: "company_name" },
                 { data: "job_location" },
-                { data: "salary_range" },
+                { data: "salary_range" },  // sorted by minimum salary on the server
                 { data: "source" }
             ],
             pageLength: 25,
@@ -1,3 +1,6 @@
+import asyncio
+from collections.abc import AsyncIterator
+
 def format_salary_range(low: float | None, high: float | None) -> str:
     def format_salary(value: float | None) -> str:
         return f"${value:,.2f}" if value is not None else "N/A"
@@ -14,4 +17,42 @@ def format_salary_range(low: float | None, high: float | None) -> str:
     elif low == high:
         return formatted_low
     else:
-        return f"{formatted_low} - {formatted_high}"
\ No newline at end of file
+        return f"{formatted_low} - {formatted_high}"
+
+async def merge_async_iterators(iterators: list[AsyncIterator], max_buffered: int = 0) -> AsyncIterator:
+    # Yields items from all iterators as soon as any of them produces one. Producers take
+    # one of max_buffered slots per item, so fast ones can't run ahead of the consumer,
+    # but their completion never waits for a slot. If an iterator raises, the others are
+    # cancelled and the error is raised to the consumer.
+    queue = asyncio.Queue()
+    slots = asyncio.Semaphore(max_buffered) if max_buffered > 0 else None
+    finished = object()
+    errors = []
+
+    async def drain(iterator):
+        try:
+            async for item in iterator:
+                if slots is not None:
+                    await slots.acquire()
+                queue.put_nowait(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            queue.put_nowait(finished)
+
+    tasks = [asyncio.create_task(drain(iterator)) for iterator in iterators]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is finished:
+                remaining -= 1
+                if errors:
+                    raise errors[0]
+                continue
+            if slots is not None:
+                slots.release()
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,276 @@
+"""Local stand-ins for the Adzuna and USAJobs search APIs, serving synthetic listings.
+
+Every listing is a pure function of its index, so any page of any query can be produced
+on demand and the same run always sees the same data. Responses follow the upstream
+payload shapes closely enough to go through the real clients unchanged:
+
+    GET /<results_per_query>/adzuna/<page>?what=...&what_or=...&where=...&results_per_page=...
+    GET /<results_per_query>/usajobs?PositionTitle=...&LocationName=...&ResultsPerPage=...&Page=...
+    GET /stats
+
+A query merging several titles (what_or) or locations (semicolon-separated LocationName)
+matches as many listings as the separate queries it replaces would have together.
+
+Run it standalone to point the app at it by hand:
+
+    python benchmarks/mock_apis.py --port 8765 --latency 0.05 --throttle-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import urllib.request
+import zlib
+from collections import Counter
+
+from aiohttp import web
+
+TITLES = [
+    "Software Engineer", "Software Developer", "Data Analyst", "Backend Developer", "Frontend Engineer",
+    "Data Engineer", "Systems Analyst", "QA Engineer", "DevOps Engineer", "IT Specialist",
+]
+SENIORITY = ["", "", "", "Junior ", "", "Senior ", "", "Lead ", "", "Principal "]  # 3 in 10 fail the title rules
+TEAMS = [
+    "Payments", "Search", "Platform", "Identity", "Billing", "Mobile", "Infrastructure", "Reporting",
+    "Growth", "Messaging", "Storage", "Compliance", "Onboarding", "Analytics", "Integrations", "Pricing",
+    "Fraud", "Logistics", "Catalog", "Support", "Scheduling", "Claims", "Benefits", "Maps", "Ads",
+    "Checkout", "Inventory", "Telemetry", "Notifications", "Accounts", "Research", "Risk", "Tooling",
+    "Marketplace", "Security", "Content", "Recommendations", "Insights", "Operations", "Web", "Data",
+]
+COMPANY_WORDS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Tyrell", "Cyberdyne",
+    "Soylent", "Aperture", "Massive", "Vandelay", "Gringotts", "Oscorp", "Pied", "Dunder", "Monarch",
+    "Nakatomi", "Virtucon", "Zorg", "Prestige", "Sirius", "Buy", "Bluth", "Gekko", "Ollivander", "Duff",
+    "Krusty", "Rekall", "Yoyodyne", "Sterling", "Cogswell", "Spacely", "Ajax", "Wernham",
+]
+COMPANY_KINDS = [
+    "Systems", "Labs", "Analytics", "Software", "Technologies", "Solutions", "Digital", "Data",
+    "Networks", "Dynamics", "Health", "Logistics", "Capital", "Media", "Robotics", "Energy",
+    "Security", "Cloud", "Works", "Partners", "Group", "Industries", "Consulting", "Research",
+    "Services", "Interactive", "Holdings", "Ventures", "Foods",
+]
+COMPANY_SUFFIXES = ["Inc", "LLC", "Corp", "Co"]
+CITIES = [
+    "Denver, CO", "Boulder, CO", "Aurora, CO", "Austin, TX", "Seattle, WA", "Portland, OR", "Chicago, IL",
+    "Boston, MA", "Atlanta, GA", "Phoenix, AZ", "Salt Lake City, UT", "Washington, DC", "Remote",
+]
+AGENCIES = [
+    "Department of Veterans Affairs", "Department of Defense", "Department of the Interior",
+    "Internal Revenue Service", "National Park Service", "Department of Energy", "Census Bureau",
+]
+CATEGORIES = [
+    ("Information Technology Management", "2210"), ("Computer Engineering", "0854"),
+    ("Mathematical Statistics", "1530"), ("Computer Science", "1550"), ("Management And Program Analysis", "0343"),
+]
+FILLER = (
+    "You will design, build and maintain services used by teams across the organization, review code, "
+    "write tests and work closely with product and operations to ship reliable software. "
+)
+
+def query_offset(title: str, location: str) -> int:
+    # Different queries see different listings; the same query always sees the same ones
+    return (zlib.crc32(f"{title}|{location}".encode("utf-8")) % 10_000) * 1_000_000
+
+def synthetic_listing(index: int, query_title: str | None = None, description_repeat: int = 2) -> dict:
+    # Plain fields of one listing; rendered into each API's payload shape below
+    # The list lengths are pairwise coprime, so every field cycles independently and no two
+    # listings share the whole title/company/location combination until about 2.3 million
+    word, kind, city, team, suffix = (
+        index % len(values) for values in (COMPANY_WORDS, COMPANY_KINDS, CITIES, TEAMS, COMPANY_SUFFIXES)
+    )
+    title = query_title or TITLES[index % len(TITLES)]
+    years = index % 9
+    experience = f"Requires {years} years of experience. " if index % 3 else ""
+    return {
+        "id": str(index),
+        "title": f"{SENIORITY[index % len(SENIORITY)]}{title}, {TEAMS[team]}",
+        "company": f"{COMPANY_WORDS[word]} {COMPANY_KINDS[kind]} {COMPANY_SUFFIXES[suffix]}",
+        "agency": AGENCIES[index % len(AGENCIES)],
+        "location": CITIES[city],
+        "description": experience + FILLER * description_repeat,
+        "salary_min": 50_000 + (index * 7919 % 100) * 1_000,
+        "salary_span": 10_000 + (index % 5) * 5_000,
+        "category": CATEGORIES[index % len(CATEGORIES)],
+    }
+
+def adzuna_job(index: int, query_title: str | None = None) -> dict:
+    job = synthetic_listing(index, query_title)
+    return {
+        "id": job["id"],
+        "title": job["title"],
+        "company": {"display_name": job["company"]},
+        "location": {"display_name": job["location"]},
+        "description": job["description"],
+        "salary_min": job["salary_min"],
+        "salary_max": job["salary_min"] + job["salary_span"],
+        "redirect_url": f"https://www.adzuna.com/details/{job['id']}",
+    }
+
+def usajobs_item(index: int, query_title: str | None = None, overlap_every: int = 10) -> dict:
+    job = synthetic_listing(index, query_title)
+    # Every overlap_every-th listing is also posted on Adzuna under the same company, which
+    # gives the near-duplicate detector real cross-source matches to merge
+    company = job["company"] if overlap_every and index % overlap_every == 0 else job["agency"]
+    name, code = job["category"]
+    return {
+        "MatchedObjectId": f"usa-{job['id']}",
+        "MatchedObjectDescriptor": {
+            "PositionTitle": job["title"],
+            "OrganizationName": company,
+            "PositionLocationDisplay": job["location"],
+            "QualificationSummary": job["description"],
+            "PositionRemuneration": [{
+                "MinimumRange": str(job["salary_min"]),
+                "MaximumRange": str(job["salary_min"] + job["salary_span"]),
+                "RateIntervalCode": "PA",
+            }],
+            "ApplyURI": [f"https://www.usajobs.gov/job/{job['id']}"],
+            "JobCategory": [{"Name": name, "Code": code}],
+        },
+    }
+
+def _page_indices(offset: int, results_per_query: int, page: int, per_page: int) -> range:
+    start = (page - 1) * per_page
+    return range(offset + start, offset + min(start + per_page, results_per_query))
+
+class MockJobAPIs:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 0.0, overlap_every: int = 10, seed: int = 1):
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.overlap_every = overlap_every
+        self.random = random.Random(seed)
+        self.stats = Counter()
+
+    async def _simulate_network(self, source: str) -> web.Response | None:
+        self.stats[f"{source}_requests"] += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            self.stats[f"{source}_throttled"] += 1
+            return web.Response(status=429, headers={"Retry-After": str(self.retry_after)})
+        return None
+
+    async def adzuna(self, request: web.Request) -> web.Response:
+        throttled = await self._simulate_network("adzuna")
+        if throttled is not None:
+            return throttled
+        results_per_query = int(request.match_info["results_per_query"])
+        page = int(request.match_info["page"])
+        per_page = int(request.query.get("results_per_page", 100))
+        what, what_or = request.query.get("what", ""), request.query.get("what_or", "")
+        titles = [f"{what} {word}".strip() for word in what_or.split()] or [what]
+        results_per_query *= len(titles)
+        offset = query_offset(f"{what}|{what_or}", request.query.get("where", ""))
+        indices = _page_indices(offset, results_per_query, page, per_page)
+        self.stats["adzuna_listings"] += len(indices)
+        body = {"count": results_per_query, "results": [adzuna_job(index, titles[index % len(titles)]) for index in indices]}
+        return web.Response(body=json.dumps(body).encode("utf-8"), content_type="application/json")
+
+    async def usajobs(self, request: web.Request) -> web.Response:
+        throttled = await self._simulate_network("usajobs")
+        if throttled is not None:
+            return throttled
+        results_per_query = int(request.match_info["results_per_query"])
+        page = int(request.query.get("Page", 1))
+        per_page = int(request.query.get("ResultsPerPage", 100))
+        title = request.query.get("PositionTitle", "")
+        location = "Remote" if request.query.get("RemoteIndicator") else request.query.get("LocationName", "")
+        results_per_query *= max(1, len(location.split(";")))
+        indices = _page_indices(query_offset(title, location), results_per_query, page, per_page)
+        self.stats["usajobs_listings"] += len(indices)
+        body = {"SearchResult": {
+            "SearchResultCountAll": results_per_query,
+            "SearchResultItems": [usajobs_item(index, title, self.overlap_every) for index in indices],
+        }}
+        return web.Response(body=json.dumps(body).encode("utf-8"), content_type="application/json")
+
+    async def stats_handler(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/{results_per_query:\\d+}/adzuna/{page:\\d+}", self.adzuna)
+        app.router.add_get("/{results_per_query:\\d+}/usajobs", self.usajobs)
+        app.router.add_get("/stats", self.stats_handler)
+        return app
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _serve(port: int, options: dict) -> None:
+    web.run_app(MockJobAPIs(**options).make_app(), host="127.0.0.1", port=port, print=None, access_log=None)
+
+class MockServerProcess:
+    # Runs the stand-ins in a child process, so serving the payloads doesn't share an
+    # event loop (or the GIL) with the client being measured
+    def __init__(self, port: int | None = None, **options):
+        self.port = port or free_port()
+        self.options = options
+        self._process = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> None:
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=_serve, args=(self.port, self.options), daemon=True
+        )
+        self._process.start()
+        asyncio.run(self._wait_until_listening(timeout))
+
+    async def _wait_until_listening(self, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + timeout
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                return
+            except OSError:
+                if loop.time() > give_up_at:
+                    raise RuntimeError(f"Mock API server did not start on port {self.port}")
+                await asyncio.sleep(0.05)
+
+    def stats(self) -> dict[str, int]:
+        with urllib.request.urlopen(f"{self.base_url}/stats") as response:
+            return json.load(response)
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After sent with each 429")
+    args = parser.parse_args()
+    print(f"Adzuna:  http://127.0.0.1:{args.port}/<results_per_query>/adzuna")
+    print(f"USAJobs: http://127.0.0.1:{args.port}/<results_per_query>/usajobs")
+    _serve(args.port, {
+        "latency": args.latency, "jitter": args.jitter,
+        "throttle_rate": args.throttle_rate, "retry_after": args.retry_after,
+    })
+
+if __name__ == "__main__":
+    main()
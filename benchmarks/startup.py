@@ -0,0 +1,95 @@
+"""Cold-start import benchmark for the entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters and reports
+the cumulative import time of each entry point (median over --runs), the slowest
+modules it pulled in, and whether it stayed within its budget.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 7 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget per entry point, in milliseconds
+IMPORT_TIME_BUDGET_MS = {
+    "app.services.api_clients": 900,
+    "app.main": 900,
+    "job_listings_viewer": 1500,
+}
+# Stacks the entry points above must not load at import time
+HEAVY_MODULES = ("pandas", "pyarrow", "matplotlib", "seaborn")
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    # "import time: self [us] | cumulative | imported package" -> cumulative microseconds
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+def measure(module: str) -> tuple[dict[str, int], list[str]]:
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    loaded_heavy = [name for name in result.stdout.strip().split(",") if name]
+    return parse_importtime(result.stderr), loaded_heavy
+
+def run(modules: list[str], runs: int, top: int) -> dict:
+    report = {}
+    for module in modules:
+        totals, samples, loaded_heavy = [], None, []
+        for _ in range(runs):
+            samples, loaded_heavy = measure(module)
+            totals.append(samples.get(module, 0) / 1000)
+        slowest = sorted(
+            ((name, us / 1000) for name, us in samples.items() if "." not in name and name != module),
+            key=lambda item: item[1], reverse=True,
+        )[:top]
+        total_ms = statistics.median(totals)
+        budget_ms = IMPORT_TIME_BUDGET_MS.get(module)
+        report[module] = {
+            "total_ms": round(total_ms, 1),
+            "budget_ms": budget_ms,
+            "within_budget": budget_ms is None or total_ms <= budget_ms,
+            "heavy_modules_loaded": loaded_heavy,
+            "slowest_top_level": [[name, round(ms, 1)] for name, ms in slowest],
+        }
+    return report
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_TIME_BUDGET_MS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="slowest top-level packages to list")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.modules, args.runs, args.top)
+    for module, result in report.items():
+        status = "ok" if result["within_budget"] and not result["heavy_modules_loaded"] else "OVER"
+        budget = f" / {result['budget_ms']} ms" if result["budget_ms"] is not None else ""
+        print(f"{module:<28} {result['total_ms']:>8.1f} ms{budget}  [{status}]")
+        if result["heavy_modules_loaded"]:
+            print(f"    loads: {', '.join(result['heavy_modules_loaded'])}")
+        for name, ms in result["slowest_top_level"]:
+            print(f"    {name:<24} {ms:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = any(not r["within_budget"] or r["heavy_modules_loaded"] for r in report.values())
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""Throughput benchmarks for the collection pipeline, the analysis and the viewer API.
+
+Stages, each run at every --sizes listing count:
+
+    collect  JobDataCollector.async_search_jobs against local mock Adzuna/USAJobs servers
+    filter   JobAPIClient.filter_jobs over a parsed batch
+    dedupe   JobDataCollector._deduplicate_jobs (MinHash near-duplicate merging)
+    analyze  analyze_data over a batch
+    viewer   the viewer's JSON endpoints against a job store holding that many listings
+
+Results are written as JSON (by default to benchmarks/results/<commit>.json) and can be
+compared against an earlier run, which exits 1 when a stage got slower than --threshold:
+
+    python benchmarks/throughput.py
+    python benchmarks/throughput.py --sizes 1k,100k --stages collect,filter --latency 0.02 --throttle-rate 0.05
+    python benchmarks/throughput.py --sizes 1k --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")  # every request has to reach the mock servers
+os.environ.setdefault("REFRESH_INTERVAL", "0")  # the viewer must not start collecting on its own
+for credential in ("ADZUNA_APP_ID", "ADZUNA_API_KEY", "USA_JOBS_API_KEY", "USA_JOBS_EMAIL"):
+    os.environ.setdefault(credential, "benchmark")  # the mock servers accept anything
+
+from mock_apis import MockServerProcess, adzuna_job, usajobs_item  # noqa: E402
+
+import config  # noqa: E402
+from app.models.job_batch import JobBatch  # noqa: E402
+from app.services.api_clients import AdzunaAPIClient, USAJobsAPIClient  # noqa: E402
+from app.services.data_collection import JobDataCollector  # noqa: E402
+from app.services.http_session import SessionPool  # noqa: E402
+from app.services.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+
+STAGES = ("collect", "filter", "dedupe", "analyze", "viewer")
+DEFAULT_SIZES = "1k,100k,1M"
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+# {draw} is filled in per request, as DataTables increments it on every redraw
+VIEWER_ENDPOINTS = {
+    "jobs_page": "/api/jobs?draw={draw}&start=0&length=25&columns[0][data]=job_title&order[0][column]=0&order[0][dir]=asc",
+    "jobs_deep_page": "/api/jobs?draw={draw}&start=5000&length=25",
+    "jobs_search": "/api/jobs?draw={draw}&start=0&length=25&search[value]=payments",
+    "job_titles": "/api/job_titles",
+    "job_categories": "/api/job_categories",
+    "category_stats": "/api/category_stats",
+}
+
+def parse_size(value: str) -> int:
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+def format_size(size: int) -> str:
+    for suffix, unit in (("M", 1_000_000), ("k", 1_000)):
+        if size >= unit and size % unit == 0:
+            return f"{size // unit}{suffix}"
+    return str(size)
+
+def best_of(repeat: int, fn, max_total: float = 10.0) -> tuple[float, object]:
+    # Fastest of up to `repeat` runs; slow stages (large sizes) stop repeating after max_total seconds
+    timings, result = [], None
+    while len(timings) < repeat and sum(timings) < max_total:
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def synthetic_batch(size: int) -> JobBatch:
+    # Half Adzuna, half USAJobs payloads, parsed by the real clients so the columns hold
+    # what a collection run would have produced (experience cap raised so none are dropped)
+    parsers = {"Adzuna": AdzunaAPIClient(), "USA Jobs": USAJobsAPIClient()}
+    batch = JobBatch()
+    for index in range(size):
+        if index % 2:
+            parsers["USA Jobs"]._append_job(batch, usajobs_item(index), max_experience=40)
+        else:
+            parsers["Adzuna"]._append_job(batch, adzuna_job(index), max_experience=40)
+    return batch
+
+def unlimited_rate_limiter(source: str, args) -> AdaptiveRateLimiter:
+    if args.real_rate_limits:
+        return AdaptiveRateLimiter.from_config(source)
+    return AdaptiveRateLimiter(
+        source, rate=1e6, burst=args.concurrency, initial_concurrency=args.concurrency, max_concurrency=args.concurrency
+    )
+
+def bench_collect(size: int, args, server: MockServerProcess) -> dict:
+    titles, locations = config.Config.DEFAULT_JOB_TITLES, config.Config.DEFAULT_LOCATIONS
+    per_page = config.Config.DEFAULT_LIMIT
+    # The listings are spread evenly over both sources and every title/location pair; the mock
+    # scales a query merging several pairs (see QueryPlanner) to match
+    results_per_query = max(1, math.ceil(size / (2 * len(titles) * len(locations))))
+    pages = math.ceil(results_per_query / per_page)
+    config.Config.MAX_PAGES_PER_QUERY = pages
+    config.Config.MAX_RESULTS_PER_QUERY = pages * per_page
+    config.Config.ADZUNA_BASE_URL = f"{server.base_url}/{results_per_query}/adzuna"
+    config.Config.USA_JOBS_BASE_URL = f"{server.base_url}/{results_per_query}/usajobs"
+    config.Config.RETRY_MAX_ATTEMPTS = max(config.Config.RETRY_MAX_ATTEMPTS, 8)
+
+    async def run() -> JobBatch:
+        session_pool = SessionPool()
+        await session_pool.start()
+        try:
+            collector = JobDataCollector(
+                AdzunaAPIClient(rate_limiter=unlimited_rate_limiter("Adzuna", args)),
+                USAJobsAPIClient(rate_limiter=unlimited_rate_limiter("USA Jobs", args)),
+                session_pool=session_pool,
+            )
+            return await collector.async_search_jobs(titles, locations)
+        finally:
+            await session_pool.close()
+
+    before = server.stats()
+    seconds, jobs = best_of(1, lambda: asyncio.run(run()))
+    after = server.stats()
+    requests = sum(after.get(key, 0) - before.get(key, 0) for key in after if key.endswith("_requests"))
+    throttled = sum(after.get(key, 0) - before.get(key, 0) for key in after if key.endswith("_throttled"))
+    served = sum(after.get(key, 0) - before.get(key, 0) for key in after if key.endswith("_listings"))
+    return {
+        "seconds": seconds,
+        "listings_per_second": served / seconds,
+        "listings_served": served,
+        "listings_kept": len(jobs),
+        "requests": requests,
+        "throttled": throttled,
+    }
+
+def bench_filter(batch: JobBatch, args) -> dict:
+    client = AdzunaAPIClient()
+    seconds, kept = best_of(args.repeat, lambda: client.filter_jobs(batch))
+    return {"seconds": seconds, "listings_per_second": len(batch) / seconds, "listings_kept": len(kept)}
+
+def bench_dedupe(batch: JobBatch, args) -> dict:
+    collector = JobDataCollector(None, None)
+    jobs = list(batch)
+    seconds, unique = best_of(args.repeat, lambda: collector._deduplicate_jobs(jobs))
+    return {"seconds": seconds, "listings_per_second": len(jobs) / seconds, "listings_kept": len(unique)}
+
+def bench_analyze(batch: JobBatch, args) -> dict:
+    from app.services.data_analysis import analyze_data
+
+    seconds, _ = best_of(args.repeat, lambda: analyze_data(batch))
+    return {"seconds": seconds, "listings_per_second": len(batch) / seconds}
+
+def bench_viewer(batch: JobBatch, args, work_dir: str) -> dict:
+    import job_listings_viewer
+    from app.services.job_store import JobStore
+
+    store = JobStore(os.path.join(work_dir, f"jobs_{len(batch)}.sqlite3"))
+    load_seconds, _ = best_of(1, lambda: store.upsert(batch))
+    job_listings_viewer.job_store = store
+
+    async def run() -> dict:
+        latencies = {}
+        async with job_listings_viewer.app.test_app() as test_app:
+            client = test_app.test_client()
+            for name, url in VIEWER_ENDPOINTS.items():
+                samples = []
+                for draw in range(1, args.requests + 1):
+                    started = time.perf_counter()
+                    response = await client.get(url.format(draw=draw))
+                    await response.get_data()
+                    samples.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"{url} returned {response.status_code}")
+                samples.sort()
+                latencies[name] = {
+                    "p50_ms": statistics.median(samples) * 1000,
+                    "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+                }
+        return latencies
+
+    try:
+        endpoints = asyncio.run(run())
+    finally:
+        store.close()
+    return {
+        "seconds": sum(endpoint["p50_ms"] for endpoint in endpoints.values()) / 1000,
+        "store_load_seconds": load_seconds,
+        "endpoints": endpoints,
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run(args) -> dict:
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    stages = [stage.strip() for stage in args.stages.split(",")]
+    results = []
+    server = None
+    if "collect" in stages:
+        server = MockServerProcess(
+            latency=args.latency, jitter=args.jitter, throttle_rate=args.throttle_rate, retry_after=args.retry_after
+        )
+        server.start()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for size in sizes:
+                batch = synthetic_batch(size) if set(stages) - {"collect"} else None
+                for stage in stages:
+                    if stage == "collect":
+                        result = bench_collect(size, args, server)
+                    elif stage == "viewer":
+                        result = bench_viewer(batch, args, work_dir)
+                    else:
+                        result = globals()[f"bench_{stage}"](batch, args)
+                    result = {"stage": stage, "size": size, **result}
+                    results.append(result)
+                    print(f"{stage:<8} {format_size(size):>5}  {result['seconds']:>9.3f} s"
+                          + (f"  {result['listings_per_second']:>12,.0f} listings/s" if "listings_per_second" in result else ""))
+    finally:
+        if server is not None:
+            server.stop()
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "options": {
+            "latency": args.latency, "jitter": args.jitter, "throttle_rate": args.throttle_rate,
+            "concurrency": args.concurrency, "real_rate_limits": args.real_rate_limits,
+            "repeat": args.repeat, "requests": args.requests,
+        },
+        "results": results,
+    }
+
+def compare(report: dict, baseline: dict, threshold: float) -> bool:
+    # Compares wall time per (stage, size); True when nothing regressed past the threshold
+    previous = {(result["stage"], result["size"]): result for result in baseline["results"]}
+    ok = True
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline.get('created_at', '?')}):")
+    for result in report["results"]:
+        before = previous.get((result["stage"], result["size"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        regressed = ratio > 1 + threshold
+        ok = ok and not regressed
+        print(f"  {result['stage']:<8} {format_size(result['size']):>5}  {before['seconds']:>9.3f} s -> "
+              f"{result['seconds']:>9.3f} s  ({ratio:5.2f}x){'  REGRESSED' if regressed else ''}")
+    return ok
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated listing counts, e.g. 1k,100k,1M")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the mock servers add to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of mock responses that are 429s")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After the mock servers send with a 429")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight per source")
+    parser.add_argument("--real-rate-limits", action="store_true", help="use Config.RATE_LIMITS instead of unlimited")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per in-memory stage; the fastest counts")
+    parser.add_argument("--requests", type=int, default=20, help="requests per viewer endpoint")
+    parser.add_argument("--output", help=f"where to write the JSON report (default: {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before --compare fails")
+    args = parser.parse_args()
+    unknown = set(args.stages.split(",")) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.ERROR, format=config.Config.LOG_FORMAT)
+    report = run(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        return 0 if compare(report, baseline, args.threshold) else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
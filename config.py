@@ -17,7 +17,7 @@ class Config:
     USA_JOBS_EMAIL = os.getenv("USA_JOBS_EMAIL")
 
     # API Base URLs
-    ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs/us/search/1"
+    ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs/us/search"  # page number is appended per request
     USA_JOBS_BASE_URL = "https://data.usajobs.gov/api/search"
 
     # Default search settings
@@ -25,6 +25,29 @@ class Config:
     DEFAULT_DISTANCE = 25  # in miles
     DEFAULT_MAX_EXPERIENCE = 5  # in years
     DEFAULT_LIMIT = 100  # number of job listings to fetch per request
+    USAJOBS_LOCATIONS_PER_QUERY = 10  # locations merged into one semicolon-separated LocationName
+
+    # Pagination budget per query (pages are fetched concurrently in waves)
+    MAX_PAGES_PER_QUERY = int(os.getenv("MAX_PAGES_PER_QUERY", 5))
+    MAX_RESULTS_PER_QUERY = int(os.getenv("MAX_RESULTS_PER_QUERY", 500))
+    PAGE_FETCH_CONCURRENCY = 3  # pages requested at once per query
+
+    # Per-source request budgets: rate is requests per second, concurrency adapts between
+    # min_concurrency and max_concurrency depending on how often the API throttles us
+    RATE_LIMITS = {
+        "Adzuna": {"rate": 2.0, "burst": 2, "initial_concurrency": 2, "max_concurrency": 4},
+        "USA Jobs": {"rate": 5.0, "burst": 5, "initial_concurrency": 4, "max_concurrency": 10},
+    }
+    # Shared HTTP connection pool for the job APIs (kept open for the lifetime of the app)
+    HTTP_CONNECTION_LIMIT = 100
+    HTTP_CONNECTION_LIMIT_PER_HOST = 10
+    HTTP_KEEPALIVE_TIMEOUT = 60  # in seconds an idle connection is kept for reuse
+    HTTP_DNS_CACHE_TTL = 300  # in seconds
+    HTTP_TIMEOUT = 120  # total seconds per request
+
+    # Retries for throttled (429/503) and dropped requests, shared by all sources
+    RETRY_MAX_ATTEMPTS = 4
+    RETRY_BASE_DELAY = 1.0  # in seconds, doubled per attempt unless the API sends Retry-After
     
     # Default job titles and locations (can be overridden by user input)
     DEFAULT_JOB_TITLES = [
@@ -34,12 +57,89 @@ class Config:
     ]
     DEFAULT_LOCATIONS = ["Denver", "Remote"]
 
+    # Near-duplicate detection (MinHash + LSH) across sources
+    NEAR_DUPLICATE_THRESHOLD = 0.8  # weighted similarity needed to merge two listings
+    MINHASH_FIELD_PERMUTATIONS = {  # signature positions per field, i.e. each field's weight
+        "job_title": 40,
+        "company_name": 36,
+        "job_location": 36,
+        "job_description": 16,  # low, since Adzuna and USAJobs describe the same job differently
+    }
+    MINHASH_BANDS = 16  # 8 rows per band
+    NEAR_DUPLICATE_DESCRIPTION_WORDS = 30  # descriptions are compared on their opening words
+
+    # Title filter rules, matched case-insensitively on whole words
+    TITLE_EXCLUDE_KEYWORDS = [
+        "senior", "sr", "lead", "2", "3", "4", "5",
+        "ii", "iii", "iv", "manager", "expert", "director", "principal"
+    ]
+    TITLE_INCLUDE_KEYWORDS = []  # when set, a title must match at least one of these
+    RELEVANT_CATEGORY_CODES = {"2210", "0854", "1530", "1550", "N/A"}
+
     # Output directory for data and visualizations
     OUTPUT_DIR = "job-listings"
 
+    # SQLite job store, the system of record the viewer and API query
+    JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(OUTPUT_DIR, "jobs.sqlite3"))
+
+    # Historical trends, aggregated incrementally from the snapshots in OUTPUT_DIR
+    TREND_STORE_PATH = os.getenv("TREND_STORE_PATH", os.path.join(OUTPUT_DIR, "trends.sqlite3"))
+    TREND_SALARY_BIN = 1000  # salary histogram bin width in dollars; medians are accurate to one bin
+    TREND_VELOCITY_WINDOW_DAYS = 7
+
+    # Salary analytics (/api/salaries); every figure is normalized to dollars per year
+    HOURLY_SALARY_CEILING = 200  # amounts below this with no stated pay period are hourly rates
+    SALARY_QUANTILES = (0.1, 0.5, 0.9)
+    SALARY_BIN_WIDTH = 10_000  # histogram bins in dollars
+    SALARY_HISTOGRAM_MAX = 300_000  # the last bin also counts everything above this
+
+    # Server-side DataTables paging for /api/jobs
+    DATATABLES_DEFAULT_LENGTH = 25
+    DATATABLES_MAX_LENGTH = 500  # largest page a client may request
+    NDJSON_CHUNK_ROWS = 1000  # rows per write when a job endpoint streams NDJSON
+
+    # Full-text search over titles, companies and descriptions (/api/search)
+    SEARCH_DEFAULT_LENGTH = 25
+    SEARCH_MAX_LENGTH = 100
+
+    # Serialized API payloads, cached per job store revision and served with ETags
+    PAYLOAD_CACHE_MAX_ENTRIES = 256  # distinct endpoint + query combinations kept per revision
+    COMPRESS_MIN_BYTES = 1024  # smaller bodies are sent uncompressed
+    GZIP_LEVEL = 9  # payloads are compressed once per revision, so spend the CPU on size
+    BROTLI_QUALITY = 9
+    # Bodies that differ per request (a /api/jobs page with its draw counter) are compressed on every response
+    FAST_GZIP_LEVEL = 1
+    FAST_BROTLI_QUALITY = 1
+
+    # Snapshot files written after each collection run
+    SNAPSHOT_FORMAT = os.getenv("SNAPSHOT_FORMAT", "parquet")  # "parquet" or "csv"
+    SNAPSHOT_COMPRESSION = "zstd"
+    EXPORT_CSV = os.getenv("EXPORT_CSV", "true").lower() == "true"  # also write a plain CSV export
+    SNAPSHOT_CHUNK_ROWS = 5000  # rows buffered before a streamed snapshot chunk is written
+
+    # Pages buffered between the API clients and the collection pipeline
+    STREAM_QUEUE_SIZE = 64
+
+    # Seconds between background refreshes of the collection the API serves (0 = only on demand)
+    REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL", 60 * 60))
+
+    # Seconds between checks of OUTPUT_DIR for a newer snapshot in the viewer
+    SNAPSHOT_POLL_INTERVAL = 2
+
+    # On-disk cache of upstream API responses (keyed on URL + params, never credentials)
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_OFFLINE = os.getenv("RESPONSE_CACHE_OFFLINE", "false").lower() == "true"  # serve only from cache
+    RESPONSE_CACHE_PATH = os.path.join(OUTPUT_DIR, ".cache", "responses.sqlite3")
+    RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    RESPONSE_CACHE_TTLS = {  # in seconds, per source
+        "Adzuna": 6 * 60 * 60,
+        "USA Jobs": 12 * 60 * 60,
+    }
+
     # Logging configuration
     LOG_LEVEL = logging.INFO
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    TIMING_SUMMARY = os.getenv("TIMING_SUMMARY", "true").lower() == "true"  # per-stage timings at the end of a CLI run
 
     # Flask configuration
     DEBUG = True  # Set to False in production
@@ -48,6 +148,8 @@ class Config:
     # Visualization settings
     CHART_STYLE = "darkgrid"
     COLOR_PALETTE = "deep"
+    CHART_WORKERS = min(4, os.cpu_count() or 1)  # processes rendering charts in parallel
+    CHART_CACHE_MANIFEST = ".charts.json"  # chart input hashes, kept in OUTPUT_DIR
 
     # Data analysis settings
     TOP_N_RESULTS = 10  # For top companies, locations, etc.
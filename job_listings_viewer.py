@@ -1,26 +1,66 @@
-import os
-from datetime import datetime
+import time
 
-import pandas as pd
-from quart import Quart, render_template, jsonify, request
+from quart import Quart, g, render_template, jsonify, request
 
-from app.utils import format_salary_range
-from app.services.data_collection import JobDataCollector
 from app.services.api_clients import AdzunaAPIClient, USAJobsAPIClient
+from app.services.datatables import datatables_echo, datatables_response, stream_records
+from app.services.job_store import get_job_store
+from app.services.metrics import observe_request, render_metrics
+from app.services.payload_cache import get_payload_cache
+from app.services.refresh_scheduler import get_refresh_scheduler
+from app.services.salary import SALARY_DIMENSIONS, get_salary_analytics
+from app.services.search import search_response
+from app.services.serialization import NDJSON_MIMETYPE, aiter_ndjson, wants_ndjson
+from app.services.snapshot_cache import SnapshotCache
+from app.services.trends import TREND_DIMENSIONS, get_trend_store
 from config import active_config as Config
 
 # Create the Quart application with the correct template folder
 app = Quart(__name__, static_folder='app/static', template_folder='app/templates')
 
-def load_latest_csv() -> pd.DataFrame | None:
-    csv_files = [f for f in os.listdir(Config.OUTPUT_DIR) if f.endswith('.csv')]
-    if not csv_files:
-        print("No CSV files found in the directory.")
-        return None
-    latest_file = max(csv_files, key=lambda x: os.path.getctime(os.path.join(Config.OUTPUT_DIR, x)))
-    file_path = os.path.join(Config.OUTPUT_DIR, latest_file)
-    print(f"Loading file: {file_path}")
-    return pd.read_csv(file_path)
+# The job store is the system of record; snapshots are only used to seed an empty store
+job_store = get_job_store()
+snapshot_cache = SnapshotCache(Config.OUTPUT_DIR)
+trend_store = get_trend_store()
+# Serialized (and compressed) payloads, reused until the job store's revision changes
+payload_cache = get_payload_cache()
+# Collection runs in the background on the scheduler's thread (with its own HTTP session
+# pool); requests only ever read its last result
+refresh_scheduler = get_refresh_scheduler()
+
+@app.before_serving
+async def start_refresh_scheduler() -> None:
+    Config.ADZUNA_CLIENT = AdzunaAPIClient()
+    Config.USA_JOBS_CLIENT = USAJobsAPIClient()
+    if Config.REFRESH_INTERVAL > 0:
+        refresh_scheduler.start()
+
+@app.after_serving
+async def stop_refresh_scheduler() -> None:
+    refresh_scheduler.stop()
+
+@app.before_serving
+async def backfill_job_store() -> None:
+    if job_store.count() > 0:
+        return
+    snapshot = snapshot_cache.get()
+    if snapshot is not None:
+        print(f"Seeding job store from {snapshot.path}")
+        job_store.upsert_frame(snapshot.df)
+
+@app.before_request
+async def start_request_timer() -> None:
+    g.request_started = time.perf_counter()
+
+@app.after_request
+async def record_request_latency(response):
+    if "request_started" in g:
+        observe_request(request.url_rule.rule if request.url_rule else None, request.method, response.status_code, g.request_started)
+    return response
+
+@app.route('/metrics')
+async def metrics():
+    return render_metrics()
 
 @app.route('/')
 async def index() -> str:
@@ -28,77 +68,88 @@ async def index() -> str:
 
 @app.route('/api/jobs')
 async def get_jobs() -> dict:
-    df = load_latest_csv()
-    if df is None:
-        print("No data loaded.")
-        return jsonify({"data": []})
-    
     # Get filters from request
     title_filters = request.args.getlist("titles[]")
+    max_experience = request.args.get("max_experience", type=float)
 
-    # Apply title filters if any
-    if title_filters:
-        df = df[df['job_title'].isin(title_filters)]
-    
-    # Limit the number of records
-    df = df.head(1000)  # Limit to 1000 records
-    
-    # Convert DataFrame to list of dicts
-    data = df.to_dict('records')
-    
-    # Ensure all values are JSON serializable and format salaries
-    for record in data:
-        # Format salaries and create salary range
-        record['salary_range'] = format_salary_range(record['salary_low'], record['salary_high'])
-        
-        # Format other float values
-        for key, value in record.items():
-            if pd.isna(value):
-                record[key] = None
-            elif isinstance(value, float) and key not in ['salary_low', 'salary_high']:
-                record[key] = round(value, 2)
-    
-    # Return in the format expected by DataTables
-    return jsonify({"data": data})
+    if wants_ndjson(request):
+        # Every matching row, one JSON object per line, streamed as it is read from the store
+        chunks = stream_records(job_store, request.args, job_title=title_filters or None, max_experience=max_experience)
+        return aiter_ndjson(chunks), 200, {"Content-Type": NDJSON_MIMETYPE}
+
+    # Paging, ordering and searching are done server-side against the store's indexes
+    return payload_cache.response(request, "jobs", job_store, lambda: datatables_response(
+        job_store, request.args, job_title=title_filters or None, max_experience=max_experience
+    ), echo=datatables_echo(request.args))
 
 @app.route('/api/job_titles')
 async def get_job_titles() -> dict:
-    df = load_latest_csv()
-    if df is None:
-        print("No data loaded.")
-        return jsonify({"titles": []})
-    
-    titles = sorted(df['job_title'].unique().tolist())
-    return jsonify({"titles": titles})
+    return payload_cache.response(request, "job_titles", job_store, lambda: {"titles": job_store.distinct("job_title")})
 
 @app.route('/api/job_categories')
 async def get_job_categories() -> dict:
-    df = load_latest_csv()
-    if df is None:
-        print("No data loaded.")
-        return jsonify({"categories": []})
-    
-    categories = sorted(df['job_category'].unique().tolist())
-    return jsonify({"categories": categories})
+    return payload_cache.response(
+        request, "job_categories", job_store, lambda: {"categories": job_store.distinct("job_category")}
+    )
 
 @app.route('/api/category_stats')
 async def get_category_stats() -> dict:
-    df = load_latest_csv()
-    if df is None:
-        print("No data loaded.")
-        return jsonify({"stats": []})
-    
-    stats = df['job_category'].value_counts().reset_index()
-    stats.columns = ['category', 'count']
-    return jsonify({"stats": stats.to_dict('records')})
+    return payload_cache.response(request, "category_stats", job_store, lambda: {"stats": [
+        {"category": category, "count": count} for category, count in job_store.value_counts("job_category")
+    ]})
+
+@app.route('/api/search')
+async def search_jobs() -> dict:
+    # Ranked full-text search over titles, companies and descriptions, e.g. ?q=kubernetes
+    filters = {"source": request.args.get("source"), "job_category": request.args.get("category")}
+    return payload_cache.response(request, "search", job_store, lambda: search_response(job_store, request.args, **filters))
+
+@app.route('/api/salaries')
+async def get_salaries() -> dict:
+    # Yearly salary p10/p50/p90 and histograms per group, recomputed only when the store changes
+    dimension = request.args.get("dimension", "category")
+    if dimension not in SALARY_DIMENSIONS:
+        return jsonify({"error": f"dimension must be one of {sorted(SALARY_DIMENSIONS)}"}), 400
+    limit = request.args.get("limit", Config.TOP_N_RESULTS, type=int)
+    min_count = request.args.get("min_count", 1, type=int)
+    return payload_cache.response(
+        request, "salaries", job_store,
+        lambda: get_salary_analytics().breakdown(dimension).to_dict(limit, min_count),
+    )
+
+@app.route('/api/trends/postings')
+async def get_posting_trends() -> dict:
+    dimension = request.args.get("dimension", "category")
+    if dimension not in TREND_DIMENSIONS:
+        return jsonify({"error": f"dimension must be one of {sorted(TREND_DIMENSIONS)}"}), 400
+    trend_store.update_from_directory(Config.OUTPUT_DIR)
+    return jsonify({"postings": trend_store.postings(
+        dimension, request.args.getlist("values[]") or None, request.args.get("start"), request.args.get("end")
+    )})
+
+@app.route('/api/trends/salary')
+async def get_salary_trends() -> dict:
+    trend_store.update_from_directory(Config.OUTPUT_DIR)
+    return jsonify({"salary_drift": trend_store.salary_drift(
+        request.args.get("category"), request.args.get("start"), request.args.get("end")
+    )})
+
+@app.route('/api/trends/velocity')
+async def get_hiring_velocity() -> dict:
+    trend_store.update_from_directory(Config.OUTPUT_DIR)
+    return jsonify({"hiring_velocity": trend_store.hiring_velocity(
+        request.args.get("window", Config.TREND_VELOCITY_WINDOW_DAYS, type=int),
+        request.args.get("limit", Config.TOP_N_RESULTS, type=int),
+    )})
 
 @app.route('/api/fetch_all_jobs')
 async def fetch_all_jobs() -> dict:
-    Config.ADZUNA_CLIENT = AdzunaAPIClient()
-    Config.USA_JOBS_CLIENT = USAJobsAPIClient()
-    collector = JobDataCollector(Config.ADZUNA_CLIENT, Config.USA_JOBS_CLIENT)
+    # Served from the scheduler's last collection run; a stale result triggers a background refresh
+    all_jobs = (await refresh_scheduler.get()).jobs
 
-    all_jobs = await collector.async_search_jobs(Config.DEFAULT_JOB_TITLES, Config.DEFAULT_LOCATIONS)
+    if wants_ndjson(request):
+        headers = {"Content-Type": NDJSON_MIMETYPE, "X-Job-Count": str(len(all_jobs))}
+        return aiter_ndjson(all_jobs.iter_records(Config.NDJSON_CHUNK_ROWS)), 200, headers
 
     adzuna_response = Config.ADZUNA_CLIENT.last_response if hasattr(Config.ADZUNA_CLIENT, 'last_response') else {}
     usa_jobs_response = Config.USA_JOBS_CLIENT.last_response if hasattr(Config.USA_JOBS_CLIENT, 'last_response') else {}
@@ -106,7 +157,8 @@ async def fetch_all_jobs() -> dict:
     return jsonify({
         "adzuna": adzuna_response,
         "usa_jobs": usa_jobs_response,
-        "job_count": len(all_jobs)
+        "job_count": len(all_jobs),
+        **refresh_scheduler.status(),
     })
 
 if __name__ == '__main__':
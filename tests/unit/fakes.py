@@ -0,0 +1,29 @@
+# Stand-ins for aiohttp's session and response in client tests
+
+class FakeResponse:
+    def __init__(self, status, body=b"{}", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, headers=None, params=None):
+        self.calls += 1
+        return self.responses.pop(0)
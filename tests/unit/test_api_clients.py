@@ -1,6 +1,9 @@
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock
-from app.services.api_clients import AdzunaAPIClient, USAJobsAPIClient, JobListing
+from app.models.job_batch import JobBatch
+from app.models.job_listing import JobListing
+from app.services.api_clients import AdzunaAPIClient, USAJobsAPIClient, ResultPage
 from config import Config
 
 class TestAdzunaAPIClient(unittest.TestCase):
@@ -85,5 +88,49 @@ class TestUSAJobsAPIClient(unittest.TestCase):
 
         self.assertEqual(len(jobs), 0)
 
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.client = AdzunaAPIClient()
+        self.requested_pages = []
+
+    def _page_fetcher(self, pages: dict[int, list[str]], total=None):
+        async def fetch_page(page):
+            self.requested_pages.append(page)
+            job_ids = pages.get(page, [])
+            batch = JobBatch()
+            for job_id in job_ids:
+                batch.append(job_id, "Company", "Denver", "Description", None, None, "Adzuna", job_id)
+            return ResultPage(batch=batch, listing_ids=job_ids, job_ids=job_ids, total=total)
+        return fetch_page
+
+    def test_fetches_pages_until_short_page(self):
+        pages = {1: ["a", "b"], 2: ["c", "d"], 3: ["e"]}
+        with patch.object(Config, "MAX_PAGES_PER_QUERY", 10), patch.object(Config, "MAX_RESULTS_PER_QUERY", 100):
+            jobs = asyncio.run(self.client._fetch_all_pages(self._page_fetcher(pages), per_page=2))
+
+        self.assertEqual([job.job_title for job in jobs], ["a", "b", "c", "d", "e"])
+
+    def test_respects_total_and_page_budget(self):
+        pages = {page: [f"{page}a", f"{page}b"] for page in range(1, 20)}
+        with patch.object(Config, "MAX_PAGES_PER_QUERY", 4), patch.object(Config, "MAX_RESULTS_PER_QUERY", 100):
+            jobs = asyncio.run(self.client._fetch_all_pages(self._page_fetcher(pages), per_page=2))
+        self.assertEqual(len(jobs), 8)
+        self.assertEqual(max(self.requested_pages), 4)
+
+        self.requested_pages.clear()
+        with patch.object(Config, "MAX_PAGES_PER_QUERY", 10), patch.object(Config, "MAX_RESULTS_PER_QUERY", 100):
+            jobs = asyncio.run(self.client._fetch_all_pages(self._page_fetcher(pages, total=5), per_page=2))
+        self.assertEqual(len(jobs), 6)
+        self.assertEqual(max(self.requested_pages), 3)
+
+    def test_stops_when_page_has_nothing_new(self):
+        pages = {1: ["a", "b"], 2: ["a", "b"], 3: ["c", "d"]}
+        with patch.object(Config, "MAX_PAGES_PER_QUERY", 3), patch.object(Config, "MAX_RESULTS_PER_QUERY", 100), \
+                patch.object(Config, "PAGE_FETCH_CONCURRENCY", 1):
+            jobs = asyncio.run(self.client._fetch_all_pages(self._page_fetcher(pages), per_page=2))
+
+        self.assertEqual([job.job_title for job in jobs], ["a", "b"])
+        self.assertNotIn(3, self.requested_pages)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
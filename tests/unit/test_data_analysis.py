@@ -1,5 +1,5 @@
 import unittest
-from app.services.data_analysis import analyze_data
+from app.services.data_analysis import analyze_data, build_analysis
 from app.models.job_listing import JobListing
 
 class TestDataAnalysis(unittest.TestCase):
@@ -20,6 +20,15 @@ class TestDataAnalysis(unittest.TestCase):
         self.assertEqual(analysis["top_locations"], {"New York": 1, "Washington": 1, "San Francisco": 1, "Chicago": 1})
         self.assertAlmostEqual(analysis["avg_salary_low"], 61250, delta=0.01)
         self.assertAlmostEqual(analysis["avg_salary_high"], 122500, delta=0.01)
+        self.assertEqual(analysis["salary_percentiles"]["p50"], 86250)
+
+    def test_shared_analysis_result(self):
+        analysis = build_analysis(self.jobs)
+
+        self.assertEqual(analysis.total_jobs, 4)
+        self.assertEqual(analysis.company_counts["Company A"], 2)
+        self.assertEqual(len(analysis.salary_data), 4)
+        self.assertEqual(analyze_data(analysis), analyze_data(self.jobs))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
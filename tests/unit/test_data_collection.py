@@ -1,9 +1,13 @@
+import asyncio
 import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
+from app.models.job_batch import JobBatch
 from app.models.job_listing import JobListing
 from app.services.data_collection import JobDataCollector
+from app.services.job_store import JobStore
 
 class TestJobDataCollector(unittest.TestCase):
     def setUp(self):
@@ -26,7 +30,75 @@ class TestJobDataCollector(unittest.TestCase):
         self.assertEqual(jobs[0].job_title, "Software Developer")
         self.assertEqual(jobs[1].job_title, "Data Analyst")
 
-    @patch('app.services.data_collection.pd.DataFrame.to_csv')
+    def test_stream_jobs_deduplicates_across_pages_and_feeds_sinks(self):
+        developer = JobListing("Software Developer", "Company A", "New York, NY", "Description", 50000, 100000, "Adzuna", "http://apply.com")
+        analyst = JobListing("Data Analyst", "Company B", "Washington, DC", "Description", 60000, 120000, "USA Jobs", "http://apply.gov")
+
+        async def pages(*page_list):
+            for page in page_list:
+                yield JobBatch.from_listings(page)
+
+        self.adzuna_client.async_iter_jobs = MagicMock(return_value=pages([developer], [developer]))
+        self.usa_jobs_client.async_iter_jobs = MagicMock(return_value=pages([analyst]))
+        sink = MagicMock()
+
+        async def collect():
+            return [page async for page in self.collector.async_stream_jobs(["Developer"], ["Remote"], [sink])]
+
+        pages_seen = asyncio.run(collect())
+
+        jobs = [job for page in pages_seen for job in page]
+        self.assertEqual(sorted(job.job_title for job in jobs), ["Data Analyst", "Software Developer"])
+        self.assertEqual(sink.write.call_count, len(pages_seen))
+        self.assertEqual(len(self.collector.duplicate_clusters), 1)
+
+    def test_stream_jobs_replaces_emitted_listing_with_usa_jobs_duplicate(self):
+        description = "We are seeking an engineer to build systems for our mission critical applications across teams"
+        adzuna_job = JobListing("Software Engineer", "Department of Defense", "Washington, DC", description, 60000, 120000, "Adzuna", "http://apply.com")
+        usa_job = JobListing("Software Engineer", "Department of Defense", "Washington, District of Columbia", description,
+                             60000, 120000, "USA Jobs", "http://apply.gov")
+
+        async def pages(*page_list):
+            for page in page_list:
+                yield JobBatch.from_listings(page)
+
+        # One source, so the Adzuna listing is certain to go out first
+        self.adzuna_client.source, self.usa_jobs_client.source = "Adzuna", "USA Jobs"
+        self.adzuna_client.async_iter_jobs = MagicMock(return_value=pages([adzuna_job], [usa_job]))
+        self.usa_jobs_client.async_iter_jobs = MagicMock(return_value=pages())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            job_store = JobStore(os.path.join(tmp_dir, "jobs.sqlite3"))
+            collector = JobDataCollector(self.adzuna_client, self.usa_jobs_client, job_store)
+            sink = MagicMock()
+
+            jobs = asyncio.run(collector.async_search_jobs(["Software Engineer"], ["Washington"], [sink]))
+
+            self.assertEqual(jobs.column("source"), ["USA Jobs"])
+            self.assertEqual(job_store.distinct("source"), ["USA Jobs"])
+            self.assertEqual(sink.write.call_count, 2)
+            self.assertEqual(sink.discard.call_args.args[0].column("source"), ["Adzuna"])
+            job_store.close()
+
+    def test_stream_jobs_raises_when_a_source_fails(self):
+        developer = JobListing("Software Developer", "Company A", "New York, NY", "Description", 50000, 100000, "Adzuna", "http://apply.com")
+
+        async def pages(*page_list):
+            for page in page_list:
+                yield JobBatch.from_listings(page)
+
+        async def failing():
+            raise RuntimeError("source crashed")
+            yield
+
+        self.adzuna_client.async_iter_jobs = MagicMock(return_value=pages(*[[developer]] * 20))
+        self.usa_jobs_client.async_iter_jobs = MagicMock(return_value=failing())
+        sink = MagicMock()
+
+        with patch("app.services.data_collection.Config.STREAM_QUEUE_SIZE", 1):
+            with self.assertRaisesRegex(RuntimeError, "source crashed"):
+                asyncio.run(self.collector.async_search_jobs(["Developer"], ["Remote"], [sink]))
+
+    @patch('pandas.DataFrame.to_csv')
     @patch('app.services.data_collection.os.makedirs')
     def test_save_to_csv(self, mock_makedirs, mock_to_csv):
         jobs = [
@@ -1,12 +1,15 @@
 import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from app.models.job_listing import JobListing
 from app.services.data_visualization import generate_visualizations
+from config import Config
 
 class TestDataVisualization(unittest.TestCase):
     def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
         self.jobs = [
             JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
             JobListing("Data Analyst", "Company B", "Washington", "Description", 60000, 120000, "USA Jobs", "http://apply.gov"),
@@ -14,33 +17,24 @@ class TestDataVisualization(unittest.TestCase):
             JobListing("Web Developer", "Company C", "Chicago", "Description", 55000, 110000, "USA Jobs", "http://apply.gov")
         ]
 
-    @patch('app.services.data_visualization.plt')
-    @patch('app.services.data_visualization.sns')
-    @patch('app.services.data_visualization.os.makedirs')
-    def test_generate_visualizations(self, mock_makedirs, mock_sns, mock_plt):
-        mock_figure = MagicMock()
-        mock_plt.figure.return_value = mock_figure
+    def tearDown(self):
+        self.tmp_dir.cleanup()
 
-        generate_visualizations(self.jobs)
+    def test_generate_visualizations(self):
+        expected = ["job_count_by_source.png", "top_companies.png", "salary_distribution.png", "top_job_categories.png"]
+        with patch.object(Config, "OUTPUT_DIR", self.tmp_dir.name), patch.object(Config, "CHART_WORKERS", 1):
+            rendered = generate_visualizations(self.jobs)
+            self.assertEqual([os.path.basename(path) for path in rendered], expected)
+            for filename in expected:
+                self.assertTrue(os.path.getsize(os.path.join(self.tmp_dir.name, filename)) > 0)
 
-        # Check if the output directory was created
-        mock_makedirs.assert_called_once_with("job-listings", exist_ok=True)
+            # Unchanged input aggregates are served from the cache
+            self.assertEqual(generate_visualizations(self.jobs), [])
 
-        # Check if the required plots were created
-        self.assertEqual(mock_plt.figure.call_count, 4)
-        self.assertEqual(mock_plt.close.call_count, 4)
-        self.assertEqual(mock_sns.countplot.call_count, 1)
-        self.assertEqual(mock_sns.barplot.call_count, 2)
-        self.assertEqual(mock_sns.histplot.call_count, 1)
-
-        # Check if the plots were saved
-        expected_calls = [
-            unittest.mock.call(os.path.join("job-listings", "job_count_by_source.png")),
-            unittest.mock.call(os.path.join("job-listings", "top_companies.png")),
-            unittest.mock.call(os.path.join("job-listings", "salary_distribution.png")),
-            unittest.mock.call(os.path.join("job-listings", "top_job_categories.png"))
-        ]
-        mock_plt.savefig.assert_has_calls(expected_calls, any_order=True)
+            # Only the charts whose aggregate changed are redrawn
+            self.jobs[0] = JobListing("Software Developer", "Company A", "New York", "Description", 52000, 100000, "Adzuna", "http://apply.com")
+            rendered = generate_visualizations(self.jobs)
+            self.assertEqual([os.path.basename(path) for path in rendered], ["salary_distribution.png"])
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+from werkzeug.datastructures import MultiDict
+
+from app.models.job_listing import JobListing
+from app.services import serialization
+from app.services.datatables import datatables_response, parse_datatables_request, stream_records
+from app.services.job_store import JobStore
+
+COLUMNS = ["job_title", "company_name", "job_location", "salary_range", "source"]
+
+def datatables_args(**extra):
+    args = MultiDict({"draw": "3", "start": "0", "length": "2", "search[value]": ""})
+    for i, name in enumerate(COLUMNS):
+        args[f"columns[{i}][data]"] = name
+        args[f"columns[{i}][searchable]"] = "true"
+        args[f"columns[{i}][search][value]"] = ""
+    for key, value in extra.items():
+        args[key] = value
+    return args
+
+class TestDataTables(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp_dir.name, "jobs.sqlite3"))
+        self.store.upsert([
+            JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
+            JobListing("Data Analyst", "Company B", "Washington", "Description", 60000, 120000, "USA Jobs", "http://apply.gov"),
+            JobListing("Software Engineer", "Company A", "San Francisco", "Description", 80000, 160000, "Adzuna", "http://apply.com"),
+            JobListing("Web Developer", "Company C", "Chicago", "Description", 55000, 110000, "USA Jobs", "http://apply.gov"),
+        ])
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_parse_request(self):
+        dt_request = parse_datatables_request(datatables_args(**{
+            "order[0][column]": "3", "order[0][dir]": "desc",
+            "order[1][column]": "0", "order[1][dir]": "asc",
+            "columns[4][search][value]": "USA",
+            "length": "-1",
+        }))
+
+        self.assertEqual(dt_request.draw, 3)
+        self.assertEqual(dt_request.order, [("salary_low", "desc"), ("job_title", "asc")])
+        self.assertEqual(dt_request.column_search, {"source": "USA"})
+        self.assertGreater(dt_request.length, 2)
+
+    def test_paging_and_ordering(self):
+        response = datatables_response(self.store, datatables_args(**{
+            "start": "1", "order[0][column]": "3", "order[0][dir]": "desc",
+        }))
+
+        self.assertEqual(response["draw"], 3)
+        self.assertEqual(response["recordsTotal"], 4)
+        self.assertEqual(response["recordsFiltered"], 4)
+        self.assertEqual([job["job_title"] for job in response["data"]], ["Data Analyst", "Web Developer"])
+        self.assertEqual(response["data"][0]["salary_range"], "$60,000.00 - $120,000.00")
+
+    def test_global_and_column_search(self):
+        response = datatables_response(self.store, datatables_args(**{
+            "search[value]": "developer", "columns[1][search][value]": "Company C",
+        }))
+        self.assertEqual(response["recordsFiltered"], 1)
+        self.assertEqual(response["data"][0]["job_title"], "Web Developer")
+
+        # Word prefixes (through the full-text index) or the start of a location or source;
+        # column searches match the start of the column, ignoring case
+        for search, expected in (("devel", 2), ("new", 1), ("usa", 2), ("eloper", 0)):
+            with self.subTest(search=search):
+                self.assertEqual(datatables_response(self.store, datatables_args(**{"search[value]": search}))["recordsFiltered"], expected)
+        response = datatables_response(self.store, datatables_args(**{"columns[2][search][value]": "san"}))
+        self.assertEqual([job["job_location"] for job in response["data"]], ["San Francisco"])
+
+        response = datatables_response(self.store, datatables_args(), job_title=["Data Analyst"])
+        self.assertEqual(response["recordsFiltered"], 1)
+        self.assertEqual(response["recordsTotal"], 4)
+
+    def test_stream_records_in_chunks(self):
+        chunks = list(stream_records(self.store, datatables_args(**{"search[value]": "developer"}), chunk_rows=1))
+        self.assertEqual([[job["job_title"] for job in chunk] for chunk in chunks], [["Software Developer"], ["Web Developer"]])
+        self.assertEqual(chunks[1][0]["salary_range"], "$55,000.00 - $110,000.00")
+
+        body = b"".join(serialization.iter_ndjson(stream_records(self.store, datatables_args(), chunk_rows=3)))
+        lines = body.splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(serialization.loads(lines[3])["company_name"], "Company C")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from app.services.experience import experience_mask, extract_experience, extract_experience_batch, meets_experience
+
+class TestExperienceExtraction(unittest.TestCase):
+    def test_extracts_ranges_and_qualifiers(self):
+        cases = {
+            "3-5 years of experience": (3, 5),
+            "At least two years of experience": (2, None),
+            "1+ year experience with Python": (1, None),
+            "Experience: minimum of 3 yrs": (3, None),
+            "One year of specialized experience": (1, None),
+            "Up to 2 years experience": (0, 2),
+            "Experience 5 to 7 years, plus 2+ years with AWS": (2, 7),
+            "5 years of relevant work experience": (5, None),
+            "Founded 10 years ago, we want 3+ years experience in Go": (3, None),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(extract_experience(text), expected)
+
+    def test_no_requirement(self):
+        self.assertEqual(extract_experience("No experience required"), (None, None))
+        self.assertEqual(extract_experience("Company founded 10 years ago"), (None, None))
+        self.assertEqual(extract_experience("Founded 10 years ago, we seek experience with Python"), (None, None))
+        self.assertEqual(extract_experience("Serving clients for over 25 years. Experience in SQL required."), (None, None))
+        self.assertEqual(extract_experience("A 4 year degree and experience with SQL"), (None, None))
+        self.assertEqual(extract_experience(None), (None, None))
+
+    def test_batch_and_mask(self):
+        minimums, maximums = extract_experience_batch(["3-5 years of experience", "Great job", "8+ years experience"])
+
+        np.testing.assert_array_equal(minimums, [3, np.nan, 8])
+        np.testing.assert_array_equal(maximums, [5, np.nan, np.nan])
+        np.testing.assert_array_equal(experience_mask(minimums, 5), [True, True, False])
+        self.assertTrue(meets_experience(None, 0))
+        self.assertFalse(meets_experience(6, 5))
+
+if __name__ == '__main__':
+    unittest.main()
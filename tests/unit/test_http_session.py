@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+
+from app.services.http_session import SessionPool
+
+class TestSessionPool(unittest.TestCase):
+    def test_started_pool_reuses_one_session(self):
+        async def run():
+            pool = SessionPool(limit_per_host=3)
+            await pool.start()
+            async with pool.session() as first, pool.session() as second:
+                self.assertIs(first, second)
+                self.assertEqual(first.connector.limit_per_host, 3)
+            self.assertFalse(first.closed)
+            await pool.close()
+            self.assertTrue(first.closed)
+            self.assertFalse(pool.started)
+
+        asyncio.run(run())
+
+    def test_falls_back_to_short_lived_session(self):
+        pool = SessionPool()
+
+        async def use_pool():
+            async with pool.session() as session:
+                pass
+            return session
+
+        # Not started yet
+        self.assertTrue(asyncio.run(use_pool()).closed)
+
+        # Started on another event loop, which a session can't be shared across
+        asyncio.run(pool.start())
+        session = asyncio.run(use_pool())
+        self.assertIsNot(session, pool._session)
+        self.assertTrue(session.closed)
+
+if __name__ == '__main__':
+    unittest.main()
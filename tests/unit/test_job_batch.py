@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from app.models.job_batch import JobBatch
+from app.models.job_listing import JobListing
+
+class TestJobBatch(unittest.TestCase):
+    def setUp(self):
+        self.jobs = [
+            JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
+            JobListing("Data Analyst", "Company B", "Washington", "Description", None, 90000, "USA Jobs", "http://apply.gov", "Statistics", "0854"),
+            JobListing("Software Engineer", "Company A", "Denver", "Description", None, None, "Adzuna", "http://apply.com", experience_min=3),
+        ]
+        self.batch = JobBatch.from_listings(self.jobs)
+
+    def test_round_trips_listings(self):
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(list(self.batch), self.jobs)
+        self.assertEqual(self.batch[-1].experience_min, 3)
+        self.assertIsNone(self.batch[2].salary_low)
+
+    def test_records_in_chunks(self):
+        chunks = list(self.batch.iter_records(chunk_rows=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(chunks[0] + chunks[1], [job.to_dict() for job in self.jobs])
+        self.assertIsNone(chunks[1][0]["salary_high"])
+        self.assertEqual(self.batch.to_records(), chunks[0] + chunks[1])
+        self.assertEqual(JobBatch().to_records(), [])
+
+    def test_append_normalizes_salary_like_job_listing(self):
+        batch = JobBatch()
+        batch.append("Dev", "Company", "Denver", "Description", 90000, 60000, "Adzuna", "url")
+        batch.append("Dev", "Company", "Denver", "Description", None, 70000, "Adzuna", "url")
+        np.testing.assert_array_equal(batch.column("salary_low"), [60000, 70000])
+        np.testing.assert_array_equal(batch.column("salary_high"), [90000, 70000])
+
+    def test_categorical_values_are_stored_once(self):
+        self.assertEqual(self.batch._categories["company_name"].categories, ["Company A", "Company B"])
+        self.assertEqual(self.batch.column("company_name"), ["Company A", "Company B", "Company A"])
+
+    def test_take_and_concat(self):
+        other = JobBatch.from_listings([self.jobs[1]])
+        combined = JobBatch.concat([self.batch.take([2]), other])
+        self.assertEqual([job.job_title for job in combined], ["Software Engineer", "Data Analyst"])
+        self.assertEqual(combined.column("job_category_code"), ["N/A", "0854"])
+
+    def test_to_frame_has_snapshot_types(self):
+        df = self.batch.take([1, 2]).to_frame()
+        self.assertEqual(df["company_name"].dtype, "category")
+        # Categories only used by rows that were dropped don't show up in counts
+        self.assertEqual(df["company_name"].value_counts().to_dict(), {"Company A": 1, "Company B": 1})
+        self.assertEqual(df["salary_low"].dtype, "float64")
+        self.assertTrue(np.isnan(df["salary_low"].iloc[1]))
+
+if __name__ == '__main__':
+    unittest.main()
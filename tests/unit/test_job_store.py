@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from app.models.job_listing import JobListing
+from app.services.job_store import JobStore
+from app.services.search import fts_query
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp_dir.name, "jobs.sqlite3"))
+        self.jobs = [
+            JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
+            JobListing("Data Analyst", "Company B", "Washington", "Description", 60000, 120000, "USA Jobs", "http://apply.gov", "Statistics", "1530"),
+            JobListing("Software Engineer", "Company A", "San Francisco", "Description", 80000, 160000, "Adzuna", "http://apply.com"),
+            JobListing("Software Engineer", "Company C", "Denver", "Description", 90000, 180000, "Adzuna", "http://apply.com",
+                       experience_min=5),
+        ]
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_upsert_is_idempotent_and_tracks_seen_dates(self):
+        self.store.upsert(self.jobs, seen_at=datetime(2024, 1, 1))
+        self.store.upsert(self.jobs[:1], seen_at=datetime(2024, 1, 5))
+
+        self.assertEqual(self.store.count(), 4)
+        self.assertEqual(self.store.revision, 2)
+        job = self.store.query(job_title="Software Developer")[0]
+        self.assertEqual(job["first_seen"], "2024-01-01T00:00:00")
+        self.assertEqual(job["last_seen"], "2024-01-05T00:00:00")
+
+    def test_filters_distinct_and_counts(self):
+        self.store.upsert(self.jobs)
+
+        self.assertEqual(self.store.count(source="Adzuna"), 3)
+        self.assertEqual(self.store.count(job_title=["Data Analyst", "Software Engineer"]), 3)
+        self.assertEqual(self.store.distinct("company_name"), ["Company A", "Company B", "Company C"])
+        self.assertEqual(self.store.value_counts("job_category"), [("N/A", 3), ("Statistics", 1)])
+        self.assertEqual(len(self.store.query(limit=2)), 2)
+        self.assertEqual(self.store.count(max_experience=3), 3)
+        with self.assertRaises(ValueError):
+            self.store.count(not_a_column="x")
+
+    def test_upsert_frame_uses_snapshot_timestamp(self):
+        df = pd.DataFrame([job.to_dict() for job in self.jobs])
+        df.loc[0, "salary_low"] = float("nan")
+        df["timestamp"] = datetime(2024, 2, 1)
+
+        self.store.upsert_frame(df)
+
+        job = self.store.query(job_title="Software Developer")[0]
+        self.assertEqual(job["first_seen"], "2024-02-01T00:00:00")
+        self.assertIsNone(job["salary_low"])
+
+    def test_full_text_search_is_ranked_and_kept_in_sync(self):
+        self.jobs[1].job_description = "Kubernetes and Terraform for data pipelines"
+        self.jobs[2].job_description = "React front end; some kubernetes exposure"
+        self.jobs[3].job_title = "Kubernetes Platform Engineer"
+        self.store.upsert(self.jobs)
+
+        results, total = self.store.full_text_search('"kubernetes"')
+        self.assertEqual(total, 3)
+        self.assertEqual(results[0]["job_title"], "Kubernetes Platform Engineer")  # title matches outweigh descriptions
+        self.assertGreater(results[0]["score"], results[-1]["score"])
+        self.assertEqual(self.store.full_text_search('"kubernetes"', source="USA Jobs")[1], 1)
+        self.assertEqual(self.store.full_text_search('"front end"')[1], 1)
+        self.assertEqual(self.store.full_text_search('"pipe"*')[1], 1)
+        self.assertEqual(len(self.store.full_text_search('"kubernetes"', start=1, length=1)[0]), 1)
+
+        # An upsert that changes a description re-indexes that listing
+        self.jobs[1].job_description = "Statistics and reporting"
+        self.store.upsert(self.jobs[1:2])
+        self.assertEqual(self.store.full_text_search('"kubernetes"')[1], 2)
+        self.assertEqual(self.store.full_text_search('"reporting"')[1], 1)
+
+        # The index is persisted with the store rather than rebuilt on open
+        self.store.close()
+        reopened = JobStore(self.store.path)
+        self.assertEqual(reopened.full_text_search('"react"')[1], 1)
+        reopened.close()
+
+    def test_scan_fallback_understands_or_and_not(self):
+        self.jobs[0].job_description = "Python and Java services"
+        self.jobs[2].job_description = "Python data tooling"
+        self.jobs[3].job_description = "Rust and Go"
+        self.store.upsert(self.jobs)
+        self.store.full_text = False  # as on an SQLite built without FTS5
+
+        def titles(text):
+            return sorted(f"{row['company_name']} {row['job_title']}" for row in self.store.full_text_search(fts_query(text), 0, 10)[0])
+
+        self.assertEqual(titles("python NOT java"), ["Company A Software Engineer"])
+        self.assertEqual(titles("-java python"), ["Company A Software Engineer"])
+        self.assertEqual(titles("rust OR java"), ["Company A Software Developer", "Company C Software Engineer"])
+        self.assertEqual(titles('"data tooling" OR statistics -rust'), ["Company A Software Engineer"])
+
+    def test_delete_removes_listings_and_their_index_entries(self):
+        self.jobs[2].job_description = "Kubernetes clusters"
+        self.store.upsert(self.jobs)
+        revision = self.store.revision
+
+        self.assertEqual(self.store.delete(self.jobs[2:3]), 1)
+        self.assertEqual(self.store.count(), 3)
+        self.assertEqual(self.store.full_text_search('"kubernetes"')[1], 0)
+        self.assertGreater(self.store.revision, revision)
+        self.assertEqual(self.store.delete(self.jobs[2:3]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
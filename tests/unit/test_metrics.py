@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from app import create_app
+from app.services import metrics
+from app.services.api_clients import USAJobsAPIClient
+from app.services.metrics import MetricsRegistry
+from app.services.rate_limiter import AdaptiveRateLimiter
+from app.services.title_filter import TitleFilter
+from config import Config
+from tests.unit.fakes import FakeResponse, FakeSession
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_renders_prometheus_text(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("source",))
+        latency = registry.histogram("latency_seconds", "Latency.", ("source",), buckets=(0.1, 1.0))
+        requests.inc(source='A "quoted" source')
+        latency.observe(0.05, source="A")
+        latency.observe(0.5, source="A")
+
+        text = registry.render()
+        self.assertIn('requests_total{source="A \\"quoted\\" source"} 1', text)
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertIn('latency_seconds_bucket{source="A",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{source="A",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{source="A",le="+Inf"} 2', text)
+        self.assertIn('latency_seconds_count{source="A"} 2', text)
+        with self.assertRaises(ValueError):
+            requests.inc(wrong="label")
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        metrics.REGISTRY.reset()
+
+    def test_fetch_and_parse_are_counted(self):
+        client = USAJobsAPIClient(
+            title_filter=TitleFilter(), rate_limiter=AdaptiveRateLimiter("USA Jobs", rate=1000, burst=10)
+        )
+        client.response_cache = None
+        session = FakeSession([FakeResponse(429, headers={"Retry-After": "0"}), FakeResponse(200, b'{"ok": true}')])
+        with patch.object(client, "_wait_before_retry", new=AsyncMock()):
+            asyncio.run(client._get_json(session, "https://example.com", {}))
+        client._parse_jobs([], 5)
+
+        self.assertEqual(metrics.FETCH_REQUESTS.value(source="USA Jobs", status=429), 1)
+        self.assertEqual(metrics.FETCH_REQUESTS.value(source="USA Jobs", status=200), 1)
+        self.assertEqual(metrics.FETCH_RETRIES.value(source="USA Jobs", reason="throttled"), 1)
+        stages = {(row["stage"], row["source"]): row for row in metrics.stage_summary()}
+        self.assertEqual(stages[("fetch", "USA Jobs")]["calls"], 2)
+        self.assertEqual(stages[("parse", "USA Jobs")]["listings_in"], 0)
+
+    def test_flask_metrics_endpoint(self):
+        with patch.object(Config, "REFRESH_INTERVAL", 0):
+            client = create_app().test_client()
+        self.assertEqual(client.get("/api/missing").status_code, 404)
+        response = client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            'job_listings_http_request_duration_seconds_count{endpoint="unmatched",method="GET",status="404"} 1',
+            response.get_data(as_text=True),
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from app.models.job_listing import JobListing
+from app.services.data_collection import JobDataCollector
+from app.services.near_duplicates import NearDuplicateDetector, normalize_location
+
+DESCRIPTION = "We are seeking an engineer to build systems for our mission critical applications across teams"
+
+class TestNearDuplicateDetector(unittest.TestCase):
+    def setUp(self):
+        self.adzuna_job = JobListing("Software Engineer", "Department of Defense", "Washington, DC", DESCRIPTION, 60000, 120000, "Adzuna", "http://apply.com")
+        self.usa_job = JobListing("Software Engineer", "Department of Defense", "Washington, District of Columbia",
+                                  "Applicants must have one year of specialized experience", 60000, 120000, "USA Jobs", "http://apply.gov")
+
+    def test_normalize_location(self):
+        self.assertEqual(normalize_location("Washington, District of Columbia"), "washington dc")
+        self.assertEqual(normalize_location("Denver, Colorado, US"), "denver co")
+
+    def test_merges_across_sources_and_prefers_usa_jobs(self):
+        clusters = NearDuplicateDetector().deduplicate([self.adzuna_job, self.usa_job])
+
+        self.assertEqual(len(clusters), 1)
+        self.assertIs(clusters[0].canonical, self.usa_job)
+        duplicate, score = clusters[0].duplicates[0]
+        self.assertIs(duplicate, self.adzuna_job)
+        self.assertGreaterEqual(score, 0.8)
+
+    def test_keeps_distinct_jobs(self):
+        jobs = [
+            self.adzuna_job,
+            JobListing("Software Engineer", "Department of Defense", "Denver, CO", DESCRIPTION, None, None, "Adzuna", "http://apply.com"),
+            JobListing("Software Engineer", "Lockheed Martin", "Washington, DC", DESCRIPTION, None, None, "Adzuna", "http://apply.com"),
+            JobListing("Data Analyst", "Department of Defense", "Washington, DC", DESCRIPTION, None, None, "Adzuna", "http://apply.com"),
+        ]
+
+        self.assertEqual(len(NearDuplicateDetector().deduplicate(jobs)), 4)
+
+    def test_collector_keeps_pointers_to_duplicates(self):
+        collector = JobDataCollector(None, None)
+        unique_jobs = collector._deduplicate_jobs([self.adzuna_job, self.usa_job, self.adzuna_job])
+
+        self.assertEqual(unique_jobs, [self.usa_job])
+        self.assertEqual(len(collector.duplicate_clusters[0].duplicates), 2)
+
+if __name__ == '__main__':
+    unittest.main()
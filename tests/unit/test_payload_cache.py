@@ -0,0 +1,126 @@
+import gzip
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from werkzeug.datastructures import Headers, MultiDict
+
+from app.models.job_listing import JobListing
+from app.services import payload_cache, serialization
+from app.services.job_store import JobStore
+from app.services.payload_cache import PayloadCache
+
+def fake_request(args=None, **headers):
+    return SimpleNamespace(args=MultiDict(args or {}), headers=Headers(
+        {name.replace("_", "-"): value for name, value in headers.items()}
+    ))
+
+class TestPayloadCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp_dir.name, "jobs.sqlite3"))
+        self.store.upsert([
+            JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
+        ])
+        self.cache = PayloadCache(min_compress_bytes=0)
+        self.builds = 0
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def build(self):
+        self.builds += 1
+        return {"titles": self.store.distinct("job_title") * 50}
+
+    def respond(self, request):
+        return self.cache.response(request, "job_titles", self.store, self.build)
+
+    def test_payload_is_built_once_per_revision_and_query(self):
+        body, status, headers = self.respond(fake_request({"_": "1"}))
+        again, _, again_headers = self.respond(fake_request({"_": "2"}))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(serialization.loads(body)["titles"][0], "Software Developer")
+        self.assertIs(again, body)
+        self.assertEqual(again_headers["ETag"], headers["ETag"])
+        self.assertEqual(self.builds, 1)
+
+        self.respond(fake_request({"start": "25"}))
+        self.assertEqual(self.builds, 2)
+
+    def test_echoed_draw_shares_one_payload(self):
+        def respond(draw, **headers):
+            args = {"draw": draw, "start": "0"}
+            return self.cache.response(fake_request(args, **headers), "jobs", self.store,
+                                       lambda: {"draw": int(draw), **self.build()}, echo={"draw": int(draw)})
+
+        body, status, headers = respond("1", Accept_Encoding="gzip")
+        again, _, again_headers = respond("2", Accept_Encoding="gzip")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(again_headers["Content-Encoding"], "gzip")
+        self.assertEqual(serialization.loads(gzip.decompress(body))["draw"], 1)
+        self.assertEqual(serialization.loads(gzip.decompress(again))["draw"], 2)
+        self.assertEqual(serialization.loads(gzip.decompress(again))["titles"][0], "Software Developer")
+        self.assertEqual(again_headers["ETag"], headers["ETag"])
+
+        body, status, _ = respond("3", If_None_Match=headers["ETag"])
+        self.assertEqual(status, 304)
+        self.assertEqual(self.builds, 1)
+
+    def test_if_none_match_gets_not_modified(self):
+        _, _, headers = self.respond(fake_request())
+        body, status, not_modified = self.respond(fake_request(If_None_Match=f'"other", {headers["ETag"]}'))
+
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+        self.assertEqual(not_modified["ETag"], headers["ETag"])
+        self.assertNotIn("Content-Type", not_modified)
+
+    def test_revision_change_invalidates(self):
+        _, _, headers = self.respond(fake_request())
+        self.store.upsert([
+            JobListing("Data Analyst", "Company B", "Washington", "Description", 60000, 120000, "USA Jobs", "http://apply.gov"),
+        ])
+        body, status, fresh = self.respond(fake_request(If_None_Match=headers["ETag"]))
+
+        self.assertEqual(status, 200)
+        self.assertNotEqual(fresh["ETag"], headers["ETag"])
+        self.assertIn("Data Analyst", serialization.loads(body)["titles"])
+        self.assertEqual(self.builds, 2)
+
+    def test_stores_at_the_same_revision_do_not_share_payloads(self):
+        other = JobStore(os.path.join(self.tmp_dir.name, "other.sqlite3"))
+        other.upsert([
+            JobListing("Data Analyst", "Company B", "Washington", "Description", 60000, 120000, "USA Jobs", "http://apply.gov"),
+        ])
+        self.assertEqual(other.revision, self.store.revision)
+
+        body, _, _ = self.respond(fake_request())
+        other_body, _, _ = self.cache.response(fake_request(), "job_titles", other, lambda: {"titles": other.distinct("job_title")})
+        other.close()
+
+        self.assertEqual(serialization.loads(body)["titles"][0], "Software Developer")
+        self.assertEqual(serialization.loads(other_body)["titles"], ["Data Analyst"])
+
+    def test_compressed_variants(self):
+        identity, _, _ = self.respond(fake_request())
+        body, _, headers = self.respond(fake_request(Accept_Encoding="gzip;q=1.0, br;q=0"))
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), identity)
+
+        if payload_cache.brotli is not None:
+            body, _, headers = self.respond(fake_request(Accept_Encoding="gzip, deflate, br"))
+            self.assertEqual(headers["Content-Encoding"], "br")
+            self.assertEqual(payload_cache.brotli.decompress(body), identity)
+
+        small = PayloadCache(min_compress_bytes=len(identity) + 1)
+        _, _, headers = small.response(fake_request(Accept_Encoding="gzip"), "job_titles", self.store, self.build)
+        self.assertNotIn("Content-Encoding", headers)
+
+if __name__ == '__main__':
+    unittest.main()
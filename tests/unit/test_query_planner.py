@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.models.job_listing import JobListing
+from app.services.job_store import JobStore
+from app.services.query_planner import QueryPlanner, normalize_terms, plan_adzuna, plan_usajobs
+
+class TestQueryPlanner(unittest.TestCase):
+    def test_normalize_terms(self):
+        self.assertEqual(normalize_terms(["Software  Engineer", "software engineer", " ", "Remote", "remote"]),
+                         ["Software Engineer", "Remote"])
+
+    def test_adzuna_merges_and_prunes_titles(self):
+        queries = plan_adzuna(
+            ["Software Developer", "Software Engineer", "Senior Software Engineer", "Data Analyst"], ["Denver", "Remote"]
+        )
+
+        self.assertEqual(len(queries), 4)
+        merged = queries[0]
+        self.assertEqual((merged['query'], merged['query_any']), ("software", ["developer", "engineer"]))
+        self.assertEqual(merged['titles'], ["Software Developer", "Software Engineer", "Senior Software Engineer"])
+        self.assertEqual(merged['merged_queries'], 3)
+        self.assertEqual((merged['location'], merged['remote'], merged['distance']), ("Denver", False, 25))
+        self.assertTrue(queries[1]['remote'])
+        self.assertIsNone(queries[1]['distance'])
+        self.assertEqual((queries[2]['query'], queries[2]['query_any']), ("Data Analyst", None))
+
+    def test_usajobs_merges_locations(self):
+        with patch("app.services.query_planner.Config.USAJOBS_LOCATIONS_PER_QUERY", 2):
+            queries = plan_usajobs(["Software Developer"], ["Denver", "Remote", "Austin", "Boston"])
+
+        self.assertEqual([(query['location'], query['remote'], query['merged_queries']) for query in queries], [
+            ("Denver;Austin", False, 2), ("Boston", False, 1), ("Remote", True, 1),
+        ])
+
+    def test_orders_by_stored_yield(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = JobStore(os.path.join(tmp_dir, "jobs.sqlite3"))
+            store.upsert([
+                JobListing(f"Data Analyst {i}", "Company B", "Washington", "Description", None, None, "USA Jobs", "http://apply.gov")
+                for i in range(3)
+            ] + [JobListing("Software Developer", "Company A", "Denver", "Description", None, None, "Adzuna", "http://apply.com")])
+
+            queries = QueryPlanner(store).plan("USA Jobs", ["Software Developer", "Data Analyst"], ["Denver", "Austin"])
+            self.assertEqual([query['query'] for query in queries], ["Data Analyst", "Software Developer"])
+            self.assertEqual(len(QueryPlanner().plan("Other", ["Software Developer"], ["Denver", "denver"])), 1)
+            store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+from app.services.api_clients import USAJobsAPIClient
+from app.services.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from app.services.title_filter import TitleFilter
+from config import Config
+from tests.unit.fakes import FakeResponse, FakeSession
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_seconds_and_dates(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(retry_at, usegmt=True)), 30, delta=2)
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def test_additive_increase_multiplicative_decrease(self):
+        limiter = AdaptiveRateLimiter("Test", rate=100, initial_concurrency=4, max_concurrency=6)
+        for _ in range(4):
+            limiter.record_success()
+        self.assertEqual(limiter.concurrency, 5)
+
+        limiter.record_throttle()
+        self.assertEqual(limiter.concurrency, 2)
+        limiter.record_throttle()
+        limiter.record_throttle()
+        self.assertEqual(limiter.concurrency, 1)
+
+    def test_caps_concurrency_and_honors_retry_after(self):
+        limiter = AdaptiveRateLimiter("Test", rate=1000, burst=10, initial_concurrency=2)
+        self.assertEqual(limiter._try_acquire(), 0)
+        self.assertEqual(limiter._try_acquire(), 0)
+        self.assertGreater(limiter._try_acquire(), 0)
+        limiter.release()
+        limiter.release()
+
+        limiter.record_throttle(retry_after=5)
+        self.assertAlmostEqual(limiter._try_acquire(), 5, delta=0.5)
+        self.assertEqual(limiter.backoff(0, retry_after=5), 5)
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter("USA Jobs", rate=1000, burst=10, initial_concurrency=4)
+        self.client = USAJobsAPIClient(title_filter=TitleFilter(), rate_limiter=self.limiter)
+        self.client.response_cache = None
+
+    def test_retries_throttled_requests_after_server_hint(self):
+        session = FakeSession([FakeResponse(429, headers={"Retry-After": "0"}), FakeResponse(200, b'{"ok": true}')])
+        with patch.object(self.client, "_wait_before_retry", new_callable=AsyncMock) as mock_wait:
+            data = asyncio.run(self.client._get_json(session, "http://example.com", {}))
+
+        self.assertEqual(data, {"ok": True})
+        self.assertEqual(session.calls, 2)
+        self.assertEqual(self.limiter.throttled, 1)
+        self.assertEqual(self.limiter.concurrency, 2)
+        mock_wait.assert_called_once_with(0)
+
+    def test_gives_up_after_max_attempts(self):
+        session = FakeSession([FakeResponse(503) for _ in range(Config.RETRY_MAX_ATTEMPTS)])
+        with patch.object(self.client, "_wait_before_retry", new_callable=AsyncMock):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(self.client._get_json(session, "http://example.com", {}))
+        self.assertEqual(session.calls, Config.RETRY_MAX_ATTEMPTS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from app.models.job_batch import JobBatch
+from app.models.job_listing import JobListing
+from app.services.refresh_scheduler import RefreshScheduler
+
+class FakeCollector:
+    def __init__(self, runs, release):
+        self.runs = runs
+        self.release = release
+
+    async def async_search_jobs(self, job_titles, locations):
+        self.runs.append(threading.current_thread().name)
+        await asyncio.get_running_loop().run_in_executor(None, self.release.wait)
+        return JobBatch.from_listings([
+            JobListing(f"Engineer {len(self.runs)}", "Acme", "Denver, CO", "Description", None, None, "Adzuna", "http://apply.com")
+        ])
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.runs = []
+        self.release = threading.Event()
+        self.scheduler = RefreshScheduler(lambda session_pool: FakeCollector(self.runs, self.release), interval=3600)
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.stop(timeout=5)
+
+    def test_serves_stale_result_while_refreshing(self):
+        self.release.set()
+        first = asyncio.run(self.scheduler.get())
+        self.assertEqual(first.jobs[0].job_title, "Engineer 1")
+        self.assertEqual(self.runs, ["job-refresh"])
+
+        # Fresh: no refresh is started
+        self.assertIs(asyncio.run(self.scheduler.get()), first)
+        self.assertEqual(len(self.runs), 1)
+
+        # Stale: the old result comes back at once and one refresh runs behind it
+        self.release.clear()
+        self.scheduler.result = first = type(first)(first.jobs, datetime.now() - timedelta(hours=2), first.duration)
+        self.assertIs(asyncio.run(self.scheduler.get()), first)
+        self.assertIs(asyncio.run(self.scheduler.get()), first)
+        self.assertTrue(self.scheduler.status()["refreshing"])
+
+        self.release.set()
+        refreshed = self.scheduler.trigger().result(timeout=5)
+        self.assertEqual(refreshed.jobs[0].job_title, "Engineer 2")
+        self.assertEqual(len(self.runs), 2)
+        self.assertFalse(self.scheduler.stale)
+
+    def test_failed_refresh_keeps_previous_result(self):
+        self.release.set()
+        first = self.scheduler.trigger().result(timeout=5)
+
+        self.scheduler.collector_factory = lambda session_pool: None  # has no async_search_jobs
+        self.assertIs(self.scheduler.trigger().result(timeout=5), first)
+        self.assertIsNotNone(self.scheduler.status()["last_error"])
+
+    def test_periodic_refresh_on_start(self):
+        self.release.set()
+        self.scheduler.start()
+        for _ in range(50):
+            if self.scheduler.result is not None:
+                break
+            threading.Event().wait(0.1)
+        self.assertEqual(self.scheduler.refreshes, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from app.services.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(
+            os.path.join(self.tmp_dir.name, "responses.sqlite3"),
+            {"Adzuna": 60, "USA Jobs": 120},
+            max_bytes=10 * 1024 * 1024,
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_key_ignores_param_order(self):
+        key_a = ResponseCache.make_key("https://example.com/search/1", {"what": "Developer", "where": "Denver"})
+        key_b = ResponseCache.make_key("https://example.com/search/1/", {"where": "Denver", "what": "Developer"})
+        self.assertEqual(key_a, key_b)
+
+    def test_round_trip_and_ttl(self):
+        key = ResponseCache.make_key("https://example.com", {"what": "Developer"})
+        self.cache.set(key, "Adzuna", {"results": [1, 2, 3]})
+        self.assertEqual(self.cache.get(key, "Adzuna"), {"results": [1, 2, 3]})
+
+        with patch("app.services.response_cache.time.time", return_value=time.time() + 90):
+            self.assertIsNone(self.cache.get(key, "Adzuna"))
+            self.assertIsNotNone(self.cache.get(key, "USA Jobs"))
+            self.cache.offline = True
+            self.assertEqual(self.cache.get(key, "Adzuna"), {"results": [1, 2, 3]})
+
+    def test_evicts_least_recently_used(self):
+        self.cache.max_bytes = 1
+        first = ResponseCache.make_key("https://example.com", {"page": 1})
+        second = ResponseCache.make_key("https://example.com", {"page": 2})
+        self.cache.set(first, "Adzuna", {"results": ["a"]})
+        self.cache.set(second, "Adzuna", {"results": ["b"]})
+
+        self.assertIsNone(self.cache.get(first, "Adzuna"))
+
+if __name__ == '__main__':
+    unittest.main()
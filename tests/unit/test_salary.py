@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.models.job_listing import JobListing
+from app.services.api_clients import USAJobsAPIClient
+from app.services.job_store import JobStore
+from app.services.salary import SalaryAnalytics, annualize_range, salary_breakdowns, salary_midpoints
+
+class TestSalary(unittest.TestCase):
+    def test_annualize(self):
+        self.assertEqual(annualize_range(50000, 60000, "PA"), (50000, 60000))
+        self.assertEqual(annualize_range(20, 30, "PH"), (20 * 2087, 30 * 2087))
+        self.assertEqual(annualize_range(4000, None, "PM"), (48000, None))
+        self.assertEqual(annualize_range(0, 0, "WC"), (None, None))
+        self.assertEqual(annualize_range(25, 35), (25 * 2087, 35 * 2087))  # no period: sized like an hourly rate
+        self.assertEqual(annualize_range(None, None), (None, None))
+        np.testing.assert_array_equal(
+            salary_midpoints([50000, 20, np.nan, np.nan], [70000, 30, 90000, np.nan]), [60000, 25 * 2087, 90000, np.nan]
+        )
+
+    def test_usajobs_rate_interval_is_normalized(self):
+        client = USAJobsAPIClient()
+        item = {"MatchedObjectDescriptor": {
+            "PositionTitle": "Software Developer", "QualificationSummary": "Python",
+            "PositionRemuneration": [{"MinimumRange": "40.5", "MaximumRange": "52.75", "RateIntervalCode": "PH"}],
+        }}
+        batch, _ = client._parse_jobs([item], 5)
+        job = batch.to_records()[0]
+        self.assertAlmostEqual(job["salary_low"], 40.5 * 2087)
+        self.assertAlmostEqual(job["salary_high"], 52.75 * 2087)
+
+    def test_grouped_breakdowns_match_numpy(self):
+        rng = np.random.default_rng(7)
+        titles = rng.choice(["Developer", "Analyst", "Engineer"], size=500)
+        low = rng.uniform(30000, 150000, size=500)
+        low[::25] = np.nan  # listings without a salary are left out
+        columns = {
+            "job_title": titles.tolist(), "job_category": [None] * 500, "job_location": ["Denver"] * 500,
+            "source": ["Adzuna"] * 500, "salary_low": low.tolist(), "salary_high": (low + 20000).tolist(),
+        }
+        breakdown = salary_breakdowns(columns, bin_width=10000, max_salary=100000)["title"]
+
+        midpoints = low + 10000
+        for i, title in enumerate(breakdown.groups):
+            values = midpoints[(titles == title) & ~np.isnan(low)]
+            self.assertEqual(breakdown.counts[i], len(values))
+            np.testing.assert_allclose(breakdown.quantiles[i], np.quantile(values, [0.1, 0.5, 0.9]))
+            self.assertAlmostEqual(breakdown.means[i], values.mean())
+            np.testing.assert_array_equal(
+                breakdown.histograms[i], np.bincount(np.minimum(values // 10000, 9).astype(int), minlength=10)
+            )
+        self.assertTrue(np.all(np.diff(breakdown.counts) <= 0))
+
+        payload = breakdown.to_dict(limit=2)
+        self.assertEqual(len(payload["groups"]), 2)
+        self.assertEqual(payload["bin_edges"][-1], 100000)
+        self.assertEqual(set(payload["groups"][0]), {"value", "count", "mean", "p10", "p50", "p90", "histogram"})
+        self.assertEqual(salary_breakdowns(columns)["category"].groups, ["N/A"])
+
+    def test_analytics_are_cached_per_store_revision(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = JobStore(os.path.join(tmp_dir, "jobs.sqlite3"))
+            analytics = SalaryAnalytics(store)
+            self.assertEqual(analytics.breakdown("source").groups, [])
+
+            store.upsert([
+                JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
+                JobListing("Data Analyst", "Company B", "Washington", "Description", None, None, "USA Jobs", "http://apply.gov"),
+            ])
+            breakdown = analytics.breakdown("source")
+            self.assertEqual(breakdown.groups, ["Adzuna"])
+            self.assertEqual(breakdown.quantiles[0].tolist(), [75000, 75000, 75000])
+            self.assertIs(analytics.breakdown("source"), breakdown)
+            with self.assertRaises(ValueError):
+                analytics.breakdown("company")
+            store.close()
+
+if __name__ == '__main__':
+    unittest.main()
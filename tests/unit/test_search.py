@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from werkzeug.datastructures import MultiDict
+
+from app.models.job_listing import JobListing
+from app.services.job_store import JobStore
+from app.services.search import fts_query, search_response
+
+class TestSearch(unittest.TestCase):
+    def test_fts_query(self):
+        self.assertEqual(fts_query("kubernetes react*"), '"kubernetes" "react"*')
+        self.assertEqual(fts_query('"machine learning" OR python'), '"machine learning" OR "python"')
+        self.assertEqual(fts_query("node.js c++"), '"node js" "c"')
+        self.assertEqual(fts_query('OR "unterminated NOT'), '"unterminated NOT"')
+        self.assertEqual(fts_query("*** OR"), "")
+        self.assertEqual(fts_query("python -java NOT php*"), '"python" NOT "java" NOT "php"*')
+        self.assertEqual(fts_query("NOT kubernetes"), "")
+        self.assertEqual(fts_query("-kubernetes react"), '"react" NOT "kubernetes"')
+        self.assertEqual(fts_query("go OR rust -crypto"), '("go" OR "rust") NOT "crypto"')
+        self.assertEqual(fts_query('engineer -"site reliability"'), '"engineer" NOT "site reliability"')
+
+    def test_search_response(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = JobStore(os.path.join(tmp_dir, "jobs.sqlite3"))
+            store.upsert([
+                JobListing("Frontend Developer", "Company A", "New York", "Builds React apps", 50000, 100000, "Adzuna", "http://apply.com"),
+                JobListing("Data Analyst", "Company B", "Washington", "SQL reporting", None, None, "USA Jobs", "http://apply.gov"),
+            ])
+
+            response = search_response(store, MultiDict({"q": "reac*", "length": "1000"}))
+            self.assertEqual(response["total"], 1)
+            self.assertEqual(response["length"], 100)
+            self.assertEqual(response["results"][0]["salary_range"], "$50,000.00 - $100,000.00")
+            self.assertEqual(search_response(store, MultiDict({"q": "react"}), source="USA Jobs")["total"], 0)
+            self.assertEqual(search_response(store, MultiDict({"q": "  "}))["results"], [])
+            store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app.services.snapshot_cache import SnapshotCache
+
+class TestSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = SnapshotCache(self.tmp_dir.name, poll_interval=60)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_snapshot(self, name, rows):
+        pd.DataFrame(rows, columns=["job_title", "job_category"]).to_csv(os.path.join(self.tmp_dir.name, name), index=False)
+
+    def test_empty_directory(self):
+        self.assertIsNone(self.cache.get())
+
+    def test_loads_once_and_precomputes(self):
+        self._write_snapshot("job_listings_1.csv", [
+            ("Software Developer", "Information Technology"),
+            ("Data Analyst", "Information Technology"),
+            ("Data Analyst", "Statistics"),
+        ])
+
+        snapshot = self.cache.get()
+        self.assertEqual(snapshot.titles, ["Data Analyst", "Software Developer"])
+        self.assertEqual(snapshot.categories, ["Information Technology", "Statistics"])
+        self.assertEqual(snapshot.category_stats[0], {"category": "Information Technology", "count": 2})
+
+        self.cache.invalidate()
+        self.assertIs(self.cache.get(), snapshot)
+
+    def test_swaps_in_new_snapshot(self):
+        self._write_snapshot("job_listings_1.csv", [("Software Developer", "Information Technology")])
+        first = self.cache.get()
+
+        self._write_snapshot("job_listings_2.csv", [("Data Analyst", "Statistics")])
+        # Still within the poll interval, so the old snapshot is served
+        self.assertIs(self.cache.get(), first)
+
+        self.cache.invalidate()
+        second = self.cache.get()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.titles, ["Data Analyst"])
+
+if __name__ == '__main__':
+    unittest.main()
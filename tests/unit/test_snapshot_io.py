@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from app.models.job_listing import JobListing
+from app.services.snapshot_io import SnapshotWriter, read_snapshot, write_snapshot
+
+class TestSnapshotIO(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.jobs = [
+            JobListing("Software Developer", "Company A", "New York", "Description", 50000, 100000, "Adzuna", "http://apply.com"),
+            JobListing("Data Analyst", "Company B", "Washington", "Description", None, None, "USA Jobs", "http://apply.gov", "Statistics", "0854"),
+        ]
+        self.df = pd.DataFrame([job.to_dict() for job in self.jobs])
+        self.df["timestamp"] = datetime.now()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parquet_round_trip_keeps_types(self):
+        path = os.path.join(self.tmp_dir.name, "job_listings.parquet")
+        write_snapshot(self.df, path)
+
+        df = read_snapshot(path)
+        self.assertEqual(df["company_name"].dtype, "category")
+        self.assertEqual(df["salary_low"].dtype, "float64")
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["timestamp"]))
+        self.assertEqual(df["job_category_code"].tolist(), ["N/A", "0854"])
+
+    def test_filters_on_read(self):
+        for extension in ("parquet", "csv"):
+            path = os.path.join(self.tmp_dir.name, f"job_listings.{extension}")
+            write_snapshot(self.df, path)
+
+            df = read_snapshot(path, columns=["job_title", "source"], filters=[("source", "==", "USA Jobs")])
+            self.assertEqual(df["job_title"].tolist(), ["Data Analyst"])
+            self.assertEqual(df["source"].dtype, "category")
+
+    def test_writer_appends_chunks(self):
+        for extension in ("parquet", "csv"):
+            path = os.path.join(self.tmp_dir.name, f"streamed.{extension}")
+            with SnapshotWriter(path, chunk_rows=1) as writer:
+                writer.write(self.jobs[:1])
+                self.assertFalse(os.path.exists(path))
+                writer.write(self.jobs[1:])
+            self.assertEqual(writer.rows_written, 2)
+
+            df = read_snapshot(path)
+            self.assertEqual(df["job_title"].tolist(), ["Software Developer", "Data Analyst"])
+            self.assertEqual(df["job_category_code"].tolist(), ["N/A", "0854"])
+            self.assertEqual(df["timestamp"].nunique(), 1)
+
+    def test_writer_leaves_out_discarded_listings(self):
+        for extension in ("parquet", "csv"):
+            for chunk_rows in (1, 10):  # already flushed, still buffered
+                path = os.path.join(self.tmp_dir.name, f"discarded_{chunk_rows}.{extension}")
+                with SnapshotWriter(path, chunk_rows=chunk_rows) as writer:
+                    writer.write(self.jobs)
+                    writer.discard(self.jobs[:1])
+                self.assertEqual(writer.rows_written, 1)
+                self.assertEqual(read_snapshot(path)["job_title"].tolist(), ["Data Analyst"])
+
+    def test_writer_discards_failed_collection(self):
+        for extension in ("parquet", "csv"):
+            path = os.path.join(self.tmp_dir.name, f"failed.{extension}")
+            with self.assertRaises(RuntimeError):
+                with SnapshotWriter(path, chunk_rows=1) as writer:
+                    writer.write(self.jobs[:1])
+                    self.assertTrue(os.path.exists(writer.partial_path))
+                    raise RuntimeError("collection failed")
+            self.assertFalse(os.path.exists(path))
+            self.assertFalse(os.path.exists(writer.partial_path))
+
+if __name__ == '__main__':
+    unittest.main()
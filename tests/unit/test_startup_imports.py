@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import app.services
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HEAVY_MODULES = ("pandas", "pyarrow", "matplotlib", "seaborn")
+
+def loaded_heavy_modules(module: str) -> list[str]:
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(",") if name]
+
+class TestStartupImports(unittest.TestCase):
+    def test_entry_points_skip_heavy_stacks(self):
+        for module in ("app.services", "app.services.api_clients", "app.main", "job_listings_viewer"):
+            with self.subTest(module=module):
+                self.assertEqual(loaded_heavy_modules(module), [])
+
+    def test_services_exports_resolve_lazily(self):
+        from app.services.data_analysis import analyze_data
+
+        self.assertIs(app.services.analyze_data, analyze_data)
+        self.assertIn("generate_visualizations", dir(app.services))
+        with self.assertRaises(AttributeError):
+            app.services.missing_name
+
+if __name__ == '__main__':
+    unittest.main()
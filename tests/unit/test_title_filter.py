@@ -0,0 +1,49 @@
+import unittest
+
+from app.models.job_listing import JobListing
+from app.services.title_filter import TitleFilter
+
+def job(title, category_code="N/A"):
+    return JobListing(title, "Company", "Denver", "Description", None, None, "Adzuna", "http://apply.com", job_category_code=category_code)
+
+class TestTitleFilter(unittest.TestCase):
+    def setUp(self):
+        self.title_filter = TitleFilter(
+            exclude_keywords=["senior", "sr", "2", "ii", "engineering manager"],
+            category_codes={"2210", "N/A"},
+        )
+
+    def test_matches_whole_words_only(self):
+        kept = self.title_filter.filter([
+            job("Web2 Developer"),
+            job("Transportation Analyst"),
+            job("Software Engineer II"),
+            job("Software Engineer III"),
+            job("Sr. Developer"),
+            job("Developer 2"),
+        ])
+
+        self.assertEqual([j.job_title for j in kept], ["Web2 Developer", "Transportation Analyst", "Software Engineer III"])
+
+    def test_counts_hits_per_rule(self):
+        self.title_filter.filter([
+            job("Senior Developer"),
+            job("SENIOR Analyst"),
+            job("Engineering  Manager"),
+            job("Developer", category_code="1102"),
+        ])
+
+        self.assertEqual(self.title_filter.hits["exclude:senior"], 2)
+        self.assertEqual(self.title_filter.hits["exclude:engineering manager"], 1)
+        self.assertEqual(self.title_filter.hits["category:1102"], 1)
+
+    def test_include_rules(self):
+        title_filter = TitleFilter(include_keywords=["developer", "data analyst"])
+
+        kept = title_filter.filter([job("Python Developer"), job("Data Analyst"), job("Nurse")])
+
+        self.assertEqual([j.job_title for j in kept], ["Python Developer", "Data Analyst"])
+        self.assertEqual(title_filter.hits["include:no_match"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
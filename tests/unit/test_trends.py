@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from app.models.job_listing import JobListing
+from app.services.data_analysis import analyze_trends
+from app.services.snapshot_io import write_snapshot
+from app.services.trends import TrendStore
+
+def listing(title, company, salary, category="Information Technology"):
+    return JobListing(title, company, "Denver, CO", "Description", salary, salary, "Adzuna", "http://apply.com", category, "2210")
+
+class TestTrendStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = TrendStore(os.path.join(self.tmp_dir.name, "trends.sqlite3"), salary_bin=1000)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def write(self, name, jobs, timestamp):
+        df = pd.DataFrame([job.to_dict() for job in jobs])
+        df["timestamp"] = timestamp
+        path = os.path.join(self.tmp_dir.name, name)
+        write_snapshot(df, path)
+        return path
+
+    def test_incremental_daily_aggregates(self):
+        self.write("job_listings_1.parquet", [
+            listing("Software Engineer", "Acme", 100000),
+            listing("Data Analyst", "Acme", 80000, "Statistics"),
+        ], datetime(2024, 5, 1, 9))
+        # A second run the same day only adds the listing it hadn't seen that day
+        self.write("job_listings_2.parquet", [
+            listing("Software Engineer", "Acme", 100000),
+            listing("Software Engineer", "Globex", 120000),
+        ], datetime(2024, 5, 1, 18))
+        self.assertEqual(self.store.update_from_directory(self.tmp_dir.name), 3)
+
+        self.write("job_listings_3.parquet", [
+            listing("Software Engineer", "Acme", 100000),
+            listing("Software Engineer", "Initech", 140000),
+            listing("Software Engineer", "Initech Two", 150000),
+        ], datetime(2024, 5, 2, 9))
+        revision = self.store.revision
+        # Only the new snapshot is read; the first two are skipped by signature
+        self.assertEqual(self.store.update_from_directory(self.tmp_dir.name), 3)
+        self.assertEqual(self.store.update_from_directory(self.tmp_dir.name), 0)
+        self.assertEqual(self.store.revision, revision + 1)
+
+        postings = self.store.postings("title", ["Software Engineer"])
+        self.assertEqual([(row["day"], row["postings"]) for row in postings], [("2024-05-01", 2), ("2024-05-02", 3)])
+
+        drift = self.store.salary_drift(category="Information Technology")
+        self.assertEqual([row["median_salary"] for row in drift], [100500, 140500])
+        self.assertEqual(drift[1]["change"], 40000)
+
+        velocity = self.store.hiring_velocity(window_days=1)
+        self.assertEqual([(row["company"], row["new_postings"]) for row in velocity], [("Initech", 1), ("Initech Two", 1)])
+        self.assertEqual(self.store.hiring_velocity(window_days=2)[0], {
+            "company": "Acme", "new_postings": 2, "per_day": 1.0, "previous_new_postings": 0, "change": 2,
+        })
+
+    def test_analyze_trends(self):
+        self.write("job_listings_1.csv", [listing("Software Engineer", "Acme", 100000)], datetime(2024, 5, 1))
+        trends = analyze_trends(self.tmp_dir.name, self.store)
+
+        self.assertEqual(trends["days"], 1)
+        self.assertEqual(trends["postings_by_category"], [{"day": "2024-05-01", "value": "Information Technology", "postings": 1}])
+        self.assertEqual(trends["hiring_velocity"][0]["company"], "Acme")
+
+if __name__ == '__main__':
+    unittest.main()